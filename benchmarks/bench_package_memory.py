@@ -0,0 +1,30 @@
+# benchmarks/bench_package_memory.py
+# Measure memory per Package instance.
+# Usage: python -m benchmarks.bench_package_memory [count]
+import sys
+import tracemalloc
+from src.models.package import Package
+
+def measure(count: int) -> float:
+    """Return bytes allocated per package for count packages"""
+    addresses = [f"{n} S State St" for n in range(100)]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    packages = [
+        Package(i, addresses[i % 100], "EOD", "Salt Lake City", "84111", "5")
+        for i in range(count)
+    ]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del packages
+    return allocated / count
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{measure(count):.0f} bytes per package ({count} packages)")
+
+
+if __name__ == "__main__":
+    main()
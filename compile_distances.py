@@ -0,0 +1,18 @@
+# compile_distances.py
+# Compile a distance CSV into the memory-mapped binary format.
+# Usage: python compile_distances.py src/data/distances.csv src/data/distances.bin
+import sys
+from src.models.distance_table import DistanceTable
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python compile_distances.py <distances.csv> <output.bin>")
+        sys.exit(1)
+
+    csv_file, output_file = sys.argv[1], sys.argv[2]
+    DistanceTable.compile(csv_file, output_file)
+    print(f"Wrote {output_file} and {output_file}{DistanceTable.INDEX_SUFFIX}")
+
+
+if __name__ == "__main__":
+    main()
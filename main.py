@@ -1,15 +1,18 @@
 # main.py
 # Student ID: 012285102
-from datetime import datetime
+import logging
+import sys
+from datetime import date, datetime, time
 from src.models.delivery_service import DeliveryService
+from src.models.time_utils import ADDRESS_CORRECTION
 
-def get_time_input() -> datetime:
-    """Get time input from user"""
+def get_time_input(day: date) -> datetime:
+    """Get time input from user (a time of day on the service date)"""
     while True:
         try:
             time_str = input("Enter time (HH:MM): ")
             hour, minute = map(int, time_str.split(":"))
-            return datetime(2024, 1, 1, hour, minute)
+            return datetime.combine(day, time(hour, minute))
         except ValueError:
             print("Invalid time format. Please enter time in HH:MM format (e.g., 13:30)")
 
@@ -30,7 +33,7 @@ def format_package_info(package, status: str, current_time: datetime) -> str:
     if package.required_truck:
         info.append(f"Note: Must be on truck {package.required_truck}")
     if package.wrong_address:
-        if current_time.time() < datetime(2024, 1, 1, 10, 20).time():
+        if current_time.time() < ADDRESS_CORRECTION:
             info.append("Note: Wrong address - will be corrected at 10:20 AM")
         else:
             info.append("Note: Address has been corrected")
@@ -40,12 +43,17 @@ def format_package_info(package, status: str, current_time: datetime) -> str:
     return "\n".join(info)
 
 def main():
+    # -v shows the per-delivery routing trace
+    verbose = "-v" in sys.argv[1:]
+    logging.basicConfig(level=logging.DEBUG if verbose else logging.INFO, format="%(message)s")
+
     # initialize delivery service
     service = DeliveryService()
-    service.load_data("src/data/distances.csv", "src/data/packages.csv")
 
-    # run delivery routes
-    service.run_delivery_routes()
+    # load data and run delivery routes (reused from the snapshot cache
+    # when the input files have not changed)
+    if not service.load_or_solve("src/data/distances.csv", "src/data/packages.csv", ".wgups_cache"):
+        return
 
     while True:
         print("\nWGUPS Package Tracking")
@@ -64,7 +72,7 @@ def main():
                     print("Invalid package ID. Please enter a number between 1 and 40.")
                     continue
                 
-                check_time = get_time_input()
+                check_time = get_time_input(service.service_date)
                 package = service.package_loader.get_package(package_id)
                 if not package:
                     print(f"Package {package_id} not found")
@@ -79,7 +87,7 @@ def main():
         
         elif choice == "2":
             # View all packages
-            check_time = get_time_input()
+            check_time = get_time_input(service.service_date)
             print(f"\nAll packages at {check_time.strftime('%I:%M %p')}:")
             
             # Group packages by truck
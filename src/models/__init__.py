@@ -0,0 +1,5 @@
+import logging
+
+# Models log routing/delivery traces under "src.models.*"; callers opt in
+# with logging.basicConfig(level=logging.DEBUG) or similar.
+logging.getLogger(__name__).addHandler(logging.NullHandler())
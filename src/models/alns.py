@@ -0,0 +1,561 @@
+import heapq
+import math
+import random
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from .assignment import assign_packages, build_units
+from .distance_table import DistanceTable
+from .fleet_simulator import FleetSimulator
+from .package import Package
+from .truck import Truck
+
+# Default wall-clock budget for a search, in seconds
+SEARCH_TIME_LIMIT = 1.0
+# Cost of one second of lateness, in miles (a minute late outweighs any detour)
+LATE_PENALTY = 1.0
+# Cost of leaving one package off every truck, in miles
+UNASSIGNED_PENALTY = 1e6
+# Most units one destroy step removes
+MAX_REMOVE = 30
+# Largest share of the units one destroy step removes
+REMOVE_FRACTION = 0.3
+# Removal order randomness for worst / related removal (higher = greedier)
+REMOVE_GREED = 3
+# Iterations between operator weight updates
+SEGMENT_LENGTH = 100
+# How fast weights follow recent scores (0 = fixed, 1 = last segment only)
+REACTION = 0.2
+# Operator scores for a new best, an improvement and an accepted move
+NEW_BEST, IMPROVED, ACCEPTED = 33, 9, 13
+# Start temperature accepts a move this much worse (share of the initial
+# cost, divided by the square root of the routes in use) half of the
+# time; it then cools linearly to zero over the budget
+START_WORSE = 0.1
+# Ignore cost changes smaller than this (float noise)
+EPSILON = 1e-9
+
+
+class Plan(NamedTuple):
+    """Solution found by AlnsSolver"""
+    routes: Dict[int, List[Package]]  # truck_id -> packages in delivery order
+    distance: float                   # miles, including returns to the hub
+    lateness: int                     # total seconds past package deadlines
+    unassigned: List[Package]         # packages no truck could take
+
+    @property
+    def feasible(self) -> bool:
+        """True if every package is on a truck and on time"""
+        return not self.lateness and not self.unassigned
+
+
+class _Route:
+    """
+    One truck's package order with its timing. Positions run from 0 (the
+    hub at the truck's start) over the packages to the hub again. As in
+    cheapest_insertion, slack[i] is how far arrive[i] can be pushed back
+    without any later package missing its deadline.
+    """
+    __slots__ = ("nodes", "stops", "release", "arrive", "slack", "distance", "lateness")
+
+
+class _Solution:
+    """Routes by truck index, the truck of each unit (-1 if unassigned) and the cost"""
+    __slots__ = ("routes", "truck_of", "cost")
+
+    def __init__(self, routes: List[_Route], truck_of: List[int]):
+        self.routes = routes
+        self.truck_of = truck_of
+        self.cost = 0.0
+
+    def copy(self) -> "_Solution":
+        # Routes are replaced, never changed, so a shallow copy is enough
+        solution = _Solution(self.routes[:], self.truck_of[:])
+        solution.cost = self.cost
+        return solution
+
+
+class AlnsSolver:
+    """
+    Adaptive large neighbourhood search over truck assignment and delivery
+    order together.
+    Each iteration copies the current solution, removes some units
+    (packages that must ride together, see build_units) with a destroy
+    operator and puts them back with a repair operator:
+    - destroy: random, worst (largest detour), related (near a random
+      unit) or a whole truck's route
+    - repair: greedy (cheapest insertion first) or regret-2 (units with
+      the most to lose from waiting first)
+    Operators are picked by roulette wheel; weights follow how often each
+    one found a new best, an improvement or an accepted solution.
+    Acceptance is simulated annealing, cooling to zero over the budget.
+    Constraints:
+    - required truck, delayed arrival and reachability by deadline limit
+      a unit's trucks (build_units)
+    - "delivered with" packages are removed and inserted as one unit
+    - free capacity (MAX_CAPACITY minus packages already loaded) is never
+      exceeded
+    - packages wait for Package.available_at (delays and address
+      corrections) before their leg starts, as in FleetSimulator, and
+      are routed to location_of (e.g. the corrected address)
+    Insertions are checked in O(1) per position from each route's arrival
+    times and forward slack, and only changed routes are re-timed. Late
+    or unplaceable units fall back to the position adding the least
+    lateness, or are left unassigned, at a penalty. With fewer drivers
+    than trucks, every solution's routes are re-timed to when each truck
+    gets a driver (FleetSimulator.departures) before it is costed, so
+    waiting for a driver counts towards lateness.
+    Everything the search needs (units, distance and time tables, truck
+    starts and capacities, and the starting assignment) is copied when
+    the solver is built, so solve() only reads solver-owned data and can
+    run on another thread while the trucks and packages change.
+    """
+
+    def __init__(self, packages: Iterable[Package], trucks: List[Truck],
+                 distance_table: DistanceTable,
+                 location_of: Optional[Callable[[Package], int]] = None,
+                 seed: Optional[int] = None, drivers: Optional[int] = None):
+        """
+        Args:
+            packages: Packages to plan (packages already loaded are skipped)
+            trucks: Trucks to plan for, ready to leave the hub at their clocks
+            distance_table: Distance lookups
+            location_of: Location a package will be delivered to (default:
+                its location_id)
+            seed: Random seed, for repeatable searches
+            drivers: Number of drivers (default: one per truck)
+        """
+        location_of = location_of or (lambda package: package.location_id)
+        trucks = list(trucks)
+        self.units = build_units(packages, trucks, distance_table, location_of)
+
+        # Nodes are packages, numbered unit by unit
+        self.packages: List[Package] = []
+        self.unit_nodes: List[List[int]] = []
+        for unit in self.units:
+            first = len(self.packages)
+            self.packages.extend(sorted(unit.packages, key=lambda p: (p.deadline_minutes, p.package_id)))
+            self.unit_nodes.append(list(range(first, len(self.packages))))
+        self.unit_of = [u for u, nodes in enumerate(self.unit_nodes) for _ in nodes]
+
+        # Dense tables over the locations in use; index 0 is the hub
+        index = {Truck.HUB_LOCATION_ID: 0}
+        self.where = [index.setdefault(location_of(p), len(index)) for p in self.packages]
+        locations = sorted(index, key=index.get)
+        self.distance = distance_table.submatrix(locations)
+        travel_by_speed: Dict[float, List[List[int]]] = {}
+        for truck in trucks:
+            if truck.SPEED not in travel_by_speed:
+                scale = 3600 / truck.SPEED
+                travel_by_speed[truck.SPEED] = [[round(d * scale) for d in row]
+                                                for row in self.distance]
+        self.travel = [travel_by_speed[truck.SPEED] for truck in trucks]
+
+        self.release = [p.available_at for p in self.packages]
+        self.deadline = [p.deadline_minutes * 60 for p in self.packages]
+        self.truck_ids = [truck.truck_id for truck in trucks]
+        self.starts = [truck.clock for truck in trucks]
+        self.drivers = drivers
+        self.capacity = [truck.MAX_CAPACITY - len(truck.packages) for truck in trucks]
+
+        # Starting truck of each unit (-1 if none) from k-medoids clustering
+        assignment = assign_packages(self.packages, trucks, distance_table, location_of)
+        truck_index = {truck.truck_id: t for t, truck in enumerate(trucks)}
+        truck_of = {package.package_id: truck_index[truck_id]
+                    for truck_id, load in assignment.loads.items() for package in load}
+        self.start_truck = [truck_of.get(self.packages[nodes[0]].package_id, -1)
+                            for nodes in self.unit_nodes]
+        self.random = random.Random(seed)
+        self.destroy_operators = [self._random_removal, self._worst_removal,
+                                  self._related_removal, self._route_removal]
+        self.repair_operators = [self._greedy_repair, self._regret_repair]
+        self.iterations = 0
+        self.moves = 0  # insertion positions evaluated
+
+    def solve(self, time_limit: Optional[float] = SEARCH_TIME_LIMIT,
+              iterations: Optional[int] = None,
+              on_improvement: Optional[Callable[[Plan], None]] = None,
+              stop: Optional[Callable[[], bool]] = None) -> Plan:
+        """
+        Search until the budget is spent and return the best plan found.
+        Args:
+            time_limit: Seconds to search (None for no limit)
+            iterations: Most destroy / repair iterations (None for no limit)
+            on_improvement: Called with each new best plan, starting with
+                the initial plan
+            stop: Polled every iteration; the search ends once it returns True
+        Returns:
+            Best plan (check Plan.feasible)
+        Raises:
+            ValueError: If the search has no time limit, iteration limit or stop
+        """
+        if time_limit is None and iterations is None and stop is None:
+            raise ValueError("Search needs a time limit, an iteration limit or a stop")
+        started = time.perf_counter()
+        current = self._initial_solution()
+        best = current
+        if on_improvement is not None:
+            on_improvement(self.plan(best))
+
+        destroy_weights = [1.0] * len(self.destroy_operators)
+        repair_weights = [1.0] * len(self.repair_operators)
+        destroy_scores = [0.0] * len(destroy_weights)
+        repair_scores = [0.0] * len(repair_weights)
+        destroy_uses = [0] * len(destroy_weights)
+        repair_uses = [0] * len(repair_weights)
+        # A destroy step changes a few routes, not the whole fleet, so the
+        # temperature is scaled down with the number of routes in use
+        routes = max(1, sum(1 for route in current.routes if route.nodes))
+        start_temperature = START_WORSE * current.cost / math.sqrt(routes) / math.log(2)
+        most_removed = max(1, min(MAX_REMOVE, math.ceil(REMOVE_FRACTION * len(self.units))))
+
+        self.iterations = 0
+        while self.units:
+            progress = 0.0
+            if time_limit is not None:
+                progress = (time.perf_counter() - started) / time_limit if time_limit > 0 else 1.0
+            if iterations is not None:
+                progress = max(progress, self.iterations / iterations if iterations > 0 else 1.0)
+            if progress >= 1 or (stop is not None and stop()):
+                break
+
+            d = self.random.choices(range(len(destroy_weights)), destroy_weights)[0]
+            r = self.random.choices(range(len(repair_weights)), repair_weights)[0]
+            candidate = current.copy()
+            removed = self.destroy_operators[d](candidate, self.random.randint(1, most_removed))
+            taken = set(removed)
+            pool = removed + [u for u, t in enumerate(candidate.truck_of) if t < 0 and u not in taken]
+            self.repair_operators[r](candidate, pool)
+            self._update_cost(candidate)
+
+            temperature = start_temperature * (1 - progress)
+            score = 0
+            if candidate.cost < best.cost - EPSILON:
+                best = current = candidate
+                score = NEW_BEST
+                if on_improvement is not None:
+                    on_improvement(self.plan(best))
+            elif candidate.cost < current.cost - EPSILON:
+                current = candidate
+                score = IMPROVED
+            elif temperature > 0 and self.random.random() < math.exp(
+                    (current.cost - candidate.cost) / temperature):
+                current = candidate
+                score = ACCEPTED
+            destroy_scores[d] += score
+            repair_scores[r] += score
+            destroy_uses[d] += 1
+            repair_uses[r] += 1
+
+            self.iterations += 1
+            if self.iterations % SEGMENT_LENGTH == 0:
+                for weights, scores, uses in ((destroy_weights, destroy_scores, destroy_uses),
+                                              (repair_weights, repair_scores, repair_uses)):
+                    for i, used in enumerate(uses):
+                        if used:
+                            weights[i] = max((1 - REACTION) * weights[i] + REACTION * scores[i] / used,
+                                             EPSILON)
+                        scores[i], uses[i] = 0.0, 0
+        return self.plan(best)
+
+    def plan(self, solution: _Solution) -> Plan:
+        """Turn a solution into packages by truck ID"""
+        routes = {
+            truck_id: [self.packages[node] for node in route.nodes]
+            for truck_id, route in zip(self.truck_ids, solution.routes) if route.nodes
+        }
+        unassigned = [self.packages[node] for u, t in enumerate(solution.truck_of) if t < 0
+                      for node in self.unit_nodes[u]]
+        return Plan(routes,
+                    sum(route.distance for route in solution.routes),
+                    sum(route.lateness for route in solution.routes),
+                    unassigned)
+
+    # Timing and insertion
+
+    def _time(self, t: int, nodes: List[int], start: Optional[int] = None) -> _Route:
+        """
+        Drive a package order on truck t and record arrival times and slack.
+        The route leaves at start (default: the truck's clock); changed
+        routes keep the start of the route they replace (arrive[0]).
+        """
+        distance, travel = self.distance, self.travel[t]
+        where, release, deadline = self.where, self.release, self.deadline
+        stops = [0] + [where[node] for node in nodes] + [0]
+        releases = [0] + [release[node] for node in nodes] + [0]
+        clock = self.starts[t] if start is None else start
+        arrive, wait = [clock], []
+        miles, late = 0.0, 0
+        for i in range(1, len(stops)):
+            here, stop = stops[i - 1], stops[i]
+            leave = clock if clock >= releases[i] else releases[i]
+            wait.append(leave - clock)
+            clock = leave + travel[here][stop]
+            arrive.append(clock)
+            miles += distance[here][stop]
+            if i <= len(nodes) and clock > deadline[nodes[i - 1]]:
+                late += clock - deadline[nodes[i - 1]]
+        wait.append(0)
+
+        slack = [0] * len(stops)
+        slack[-1] = float("inf")  # back at the hub
+        for i in range(len(stops) - 2, -1, -1):
+            limit = deadline[nodes[i - 1]] - arrive[i] if i else float("inf")
+            slack[i] = min(limit, wait[i] + slack[i + 1])
+
+        route = _Route()
+        route.nodes, route.stops, route.release = nodes, stops, releases
+        route.arrive, route.slack = arrive, slack
+        route.distance, route.lateness = miles, late
+        return route
+
+    def _cheapest_position(self, t: int, route: _Route, node: int) -> Tuple[float, int]:
+        """
+        Cheapest on-time position for a package in a route, in O(1) per
+        position: the package must make its deadline, and the delay it
+        pushes onto the next stop must fit in that stop's slack.
+        Returns:
+            (added miles, position), or (inf, -1) if no position is on time
+        """
+        distance, travel = self.distance, self.travel[t]
+        stop, release, deadline = self.where[node], self.release[node], self.deadline[node]
+        row_d, row_t = distance[stop], travel[stop]
+        stops, releases, arrive, slack = route.stops, route.release, route.arrive, route.slack
+        best, best_position = float("inf"), -1
+        for i in range(1, len(stops)):
+            before, after = stops[i - 1], stops[i]
+            added = distance[before][stop] + row_d[after] - distance[before][after]
+            if added >= best:
+                continue
+            clock = arrive[i - 1]
+            clock = (clock if clock >= release else release) + travel[before][stop]
+            if clock > deadline:
+                continue
+            pushed = (clock if clock >= releases[i] else releases[i]) + row_t[after]
+            if pushed - arrive[i] > slack[i]:
+                continue
+            best, best_position = added, i
+        self.moves += len(stops) - 1
+        return best, best_position
+
+    def _insertion(self, t: int, route: _Route, u: int) -> Optional[Tuple[float, _Route]]:
+        """Cheapest on-time insertion of unit u into truck t's route, as (added miles, new route)"""
+        nodes = self.unit_nodes[u]
+        if len(route.nodes) + len(nodes) > self.capacity[t]:
+            return None
+        total = 0.0
+        for node in nodes:
+            added, position = self._cheapest_position(t, route, node)
+            if position < 0:
+                return None
+            total += added
+            route = self._time(t, route.nodes[:position - 1] + [node] + route.nodes[position - 1:],
+                               route.arrive[0])
+        return total, route
+
+    def _least_late(self, solution: _Solution, u: int) -> None:
+        """
+        Insert a unit that fits nowhere on time where it adds the least
+        cost (lateness, then miles), re-timing every position. Leaves it
+        unassigned if no eligible truck has room.
+        """
+        best = None
+        for t in self.units[u].eligible:
+            route = solution.routes[t]
+            if len(route.nodes) + len(self.unit_nodes[u]) > self.capacity[t]:
+                continue
+            candidate = route
+            for node in self.unit_nodes[u]:
+                self.moves += len(candidate.nodes) + 1
+                candidate = min(
+                    (self._time(t, candidate.nodes[:i] + [node] + candidate.nodes[i:],
+                                candidate.arrive[0])
+                     for i in range(len(candidate.nodes) + 1)),
+                    key=self._route_cost
+                )
+            added = self._route_cost(candidate) - self._route_cost(route)
+            if best is None or added < best[0]:
+                best = (added, t, candidate)
+        if best is not None:
+            _, t, route = best
+            solution.routes[t] = route
+            solution.truck_of[u] = t
+
+    # Destroy operators: remove up to count units, return their indexes
+
+    def _random_removal(self, solution: _Solution, count: int) -> List[int]:
+        assigned = [u for u, t in enumerate(solution.truck_of) if t >= 0]
+        removed = self.random.sample(assigned, min(count, len(assigned)))
+        self._remove(solution, removed)
+        return removed
+
+    def _worst_removal(self, solution: _Solution, count: int) -> List[int]:
+        """Remove units whose stops add the longest detours"""
+        distance = self.distance
+        detour = {}
+        for route in solution.routes:
+            stops = route.stops
+            for i, node in enumerate(route.nodes, 1):
+                before, stop, after = stops[i - 1], stops[i], stops[i + 1]
+                saved = distance[before][stop] + distance[stop][after] - distance[before][after]
+                u = self.unit_of[node]
+                detour[u] = detour.get(u, 0.0) + saved
+        ranked = sorted(detour, key=detour.get, reverse=True)
+        removed = self._pick(ranked, count)
+        self._remove(solution, removed)
+        return removed
+
+    def _related_removal(self, solution: _Solution, count: int) -> List[int]:
+        """Remove a random unit and the units closest to it"""
+        assigned = [u for u, t in enumerate(solution.truck_of) if t >= 0]
+        if not assigned:
+            return []
+        seed = self.random.choice(assigned)
+        row = self.distance[self.where[self.unit_nodes[seed][0]]]
+        ranked = sorted(assigned, key=lambda u: row[self.where[self.unit_nodes[u][0]]])
+        removed = self._pick(ranked, count)
+        self._remove(solution, removed)
+        return removed
+
+    def _route_removal(self, solution: _Solution, count: int) -> List[int]:
+        """Remove every unit on one random truck (shifts load between trucks)"""
+        used = [t for t, route in enumerate(solution.routes) if route.nodes]
+        if not used:
+            return []
+        t = self.random.choice(used)
+        removed = [u for u, truck in enumerate(solution.truck_of) if truck == t]
+        self._remove(solution, removed)
+        return removed
+
+    def _pick(self, ranked: List[int], count: int) -> List[int]:
+        """Take count items, favouring the front of the ranking"""
+        ranked = ranked[:]
+        picked = []
+        while ranked and len(picked) < count:
+            picked.append(ranked.pop(int(len(ranked) * self.random.random() ** REMOVE_GREED)))
+        return picked
+
+    def _remove(self, solution: _Solution, units: List[int]) -> None:
+        """Take units off their trucks, re-timing each changed route once"""
+        removed: Dict[int, set] = {}
+        for u in units:
+            t = solution.truck_of[u]
+            if t >= 0:
+                removed.setdefault(t, set()).update(self.unit_nodes[u])
+                solution.truck_of[u] = -1
+        for t, nodes in removed.items():
+            route = solution.routes[t]
+            solution.routes[t] = self._time(t, [n for n in route.nodes if n not in nodes],
+                                            route.arrive[0])
+
+    # Repair operators: insert every unit in the pool
+
+    def _greedy_repair(self, solution: _Solution, pool: List[int]) -> None:
+        self._insert_all(solution, pool, regret=False)
+
+    def _regret_repair(self, solution: _Solution, pool: List[int]) -> None:
+        self._insert_all(solution, pool, regret=True)
+
+    def _insert_all(self, solution: _Solution, pool: List[int], regret: bool) -> None:
+        """
+        Insert units one at a time, each round taking the unit with the
+        cheapest insertion (greedy) or the largest gap between its best
+        and second-best truck (regret-2). Insertions are cached per unit
+        and truck; after each insertion only the changed truck's entries,
+        and the keys of units that had them, are recomputed.
+        """
+        pool = pool[:]
+        self.random.shuffle(pool)  # tie-break differently each time
+        options: Dict[int, Dict[int, Tuple[float, _Route]]] = {}
+        keys: Dict[int, Optional[Tuple[float, float]]] = {}
+        for u in pool:
+            options[u] = {}
+            for t in self.units[u].eligible:
+                insertion = self._insertion(t, solution.routes[t], u)
+                if insertion is not None:
+                    options[u][t] = insertion
+            keys[u] = self._repair_key(options[u], regret)
+
+        while pool:
+            best_u = min((u for u in pool if keys[u] is not None),
+                         key=keys.__getitem__, default=-1)
+            if best_u < 0:
+                break
+
+            t = min(options[best_u], key=lambda truck: options[best_u][truck][0])
+            solution.routes[t] = options[best_u][t][1]
+            solution.truck_of[best_u] = t
+            pool.remove(best_u)
+            for u in pool:
+                if t in options[u] or t in self.units[u].eligible:
+                    insertion = self._insertion(t, solution.routes[t], u)
+                    if insertion is not None:
+                        options[u][t] = insertion
+                    elif options[u].pop(t, None) is None:
+                        continue
+                    keys[u] = self._repair_key(options[u], regret)
+
+        # Whatever is left fits nowhere on time
+        for u in sorted(pool, key=lambda u: self.units[u].deadline):
+            self._least_late(solution, u)
+
+    @staticmethod
+    def _repair_key(options: Dict[int, Tuple[float, _Route]],
+                    regret: bool) -> Optional[Tuple[float, float]]:
+        """Order units for repair (lowest first); None if the unit fits nowhere on time"""
+        if not options:
+            return None
+        costs = heapq.nsmallest(2, (cost for cost, _ in options.values()))
+        if not regret:
+            return costs[0], 0.0
+        second = costs[1] if len(costs) > 1 else UNASSIGNED_PENALTY
+        return costs[0] - second, costs[0]
+
+    # Costs
+
+    def _initial_solution(self) -> _Solution:
+        """
+        Starting plan: trucks from assign_packages (start_truck), each
+        unit put at its cheapest on-time position in deadline order; units
+        that do not fit their cluster's truck are placed by greedy repair.
+        """
+        solution = _Solution([self._time(t, []) for t in range(len(self.truck_ids))],
+                             [-1] * len(self.units))
+        pool = []
+        for u in sorted(range(len(self.units)), key=lambda u: self.units[u].deadline):
+            t = self.start_truck[u]
+            insertion = None if t < 0 else self._insertion(t, solution.routes[t], u)
+            if insertion is None:
+                pool.append(u)
+                continue
+            solution.routes[t] = insertion[1]
+            solution.truck_of[u] = t
+        self._greedy_repair(solution, pool)
+        self._update_cost(solution)
+        return solution
+
+    @staticmethod
+    def _route_cost(route: _Route) -> float:
+        return route.distance + LATE_PENALTY * route.lateness
+
+    def _dispatch(self, solution: _Solution) -> None:
+        """Re-time routes to leave when their truck gets a driver"""
+        routes = solution.routes
+
+        def finish(t: int, departure: int) -> Optional[int]:
+            if not routes[t].nodes:
+                # An empty truck takes no driver and is ready at its clock
+                if routes[t].arrive[0] != self.starts[t]:
+                    routes[t] = self._time(t, [])
+                return None
+            if routes[t].arrive[0] != departure:
+                routes[t] = self._time(t, routes[t].nodes, departure)
+            return routes[t].arrive[-1]
+
+        FleetSimulator.departures(self.starts, finish, self.drivers)
+
+    def _update_cost(self, solution: _Solution) -> None:
+        if self.drivers is not None and self.drivers < len(self.starts):
+            self._dispatch(solution)
+        unassigned = sum(len(self.unit_nodes[u]) for u, t in enumerate(solution.truck_of) if t < 0)
+        solution.cost = (sum(self._route_cost(route) for route in solution.routes)
+                         + UNASSIGNED_PENALTY * unassigned)
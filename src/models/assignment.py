@@ -0,0 +1,235 @@
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from .distance_table import DistanceTable
+from .package import Package
+from .time_utils import to_seconds
+from .truck import Truck
+
+# Rounds of assign / move medoids before giving up on convergence
+ASSIGN_ITERATIONS = 10
+
+
+class Assignment(NamedTuple):
+    """Result of assign_packages"""
+    loads: Dict[int, List[Package]]  # truck_id -> packages to load
+    unassigned: List[Package]        # packages no truck could take
+
+
+class PackageUnit:
+    """Packages that must ride together (a "delivered with" group, or one package)"""
+    __slots__ = ("packages", "locations", "required_truck", "loadable_at",
+                 "deadline", "eligible", "kind")
+
+    def __init__(self, packages: List[Package], locations: List[int]):
+        self.packages = packages
+        self.locations = locations
+        required = {p.required_truck for p in packages if p.required_truck}
+        # Conflicting requirements leave no eligible truck
+        self.required_truck = required.pop() if len(required) == 1 else (-1 if required else None)
+        # Delayed packages are not at the hub until delayed_until
+        self.loadable_at = max((to_seconds(p.delayed_until) for p in packages if p.delayed_until),
+                               default=0)
+        self.deadline = min(p.deadline_minutes for p in packages) * 60
+        self.eligible: List[int] = []
+        # Units of the same kind rank trucks the same way
+        self.kind: Tuple = ()
+
+
+def assign_packages(packages: Iterable[Package], trucks: List[Truck],
+                    distance_table: DistanceTable,
+                    location_of: Optional[Callable[[Package], int]] = None,
+                    iterations: int = ASSIGN_ITERATIONS) -> Assignment:
+    """
+    Split packages between trucks by capacitated k-medoids clustering.
+    Packages are first merged into units with the trucks that can carry
+    them (see build_units). Each truck has a medoid location, seeded from
+    units only it can carry and then spread out farthest-first. Every
+    round, units are handed out most-constrained first (fewest eligible
+    trucks, earliest deadline, largest) to the eligible truck with room
+    whose medoid is nearest, and each medoid moves to the member location
+    closest to the rest of its cluster. Rounds repeat until the medoids stop moving.
+    Units with the same locations and eligible trucks share one ranking of
+    trucks by medoid distance, walked with a cursor that skips full trucks,
+    so a round costs O(kinds * trucks log trucks + units) plus
+    O(capacity^2) per truck: near-linear in packages for a fixed set of
+    delivery locations, whatever the fleet size.
+    Args:
+        packages: Packages to assign (already loaded packages are skipped)
+        trucks: Trucks to fill; packages already on them count against capacity
+        distance_table: Distance lookups
+        location_of: Location a package will be delivered to (default:
+            its location_id)
+        iterations: Most assign / update rounds
+    Returns:
+        Assignment with the packages for each truck and any left over
+    """
+    units = build_units(packages, trucks, distance_table, location_of)
+    order = sorted(units, key=lambda u: (len(u.eligible), u.deadline,
+                                         -len(u.packages), u.packages[0].package_id))
+
+    medoids = _initial_medoids(units, trucks, distance_table)
+    for _ in range(max(iterations, 1)):
+        clusters, unassigned = _assign(order, trucks, medoids, distance_table)
+        moved = [_medoid(cluster, distance_table) if cluster else medoids[index]
+                 for index, cluster in enumerate(clusters)]
+        if moved == medoids:
+            break
+        medoids = moved
+
+    loads = {
+        truck.truck_id: [package for unit in cluster for package in unit.packages]
+        for truck, cluster in zip(trucks, clusters)
+    }
+    return Assignment(loads, [package for unit in unassigned for package in unit.packages])
+
+
+def build_units(packages: Iterable[Package], trucks: List[Truck],
+                distance_table: DistanceTable,
+                location_of: Optional[Callable[[Package], int]] = None) -> List[PackageUnit]:
+    """
+    Merge packages still at the hub into units ("must be delivered with"
+    groups, joined transitively) and list the trucks that can carry each:
+    - the required truck, if any
+    - trucks that leave the hub after a delayed package arrives
+    - trucks that can reach the package from the hub by its deadline
+    Args:
+        packages: Packages to split into units (already loaded ones are skipped)
+        trucks: Candidate trucks; PackageUnit.eligible indexes this list
+        distance_table: Distance lookups
+        location_of: Location a package will be delivered to (default:
+            its location_id)
+    Returns:
+        Units with eligible trucks filled in
+    """
+    location_of = location_of or (lambda package: package.location_id)
+    units = _merge_groups(packages, location_of)
+    hub_row = distance_table.row(Truck.HUB_LOCATION_ID)
+
+    # Eligibility depends on a few unit fields, so it is worked out once
+    # per distinct profile instead of once per unit and truck
+    profiles: Dict[Tuple, List[int]] = {}
+    for unit in units:
+        profile = (unit.required_truck, unit.loadable_at, len(unit.packages), unit.deadline,
+                   min(hub_row[location] for location in unit.locations))
+        eligible = profiles.get(profile)
+        if eligible is None:
+            eligible = profiles[profile] = [
+                index for index, truck in enumerate(trucks)
+                if _can_carry(truck, unit, hub_row)
+            ]
+        unit.eligible = eligible
+        unit.kind = (tuple(sorted(set(unit.locations))), tuple(unit.eligible))
+    return units
+
+
+def _merge_groups(packages: Iterable[Package], location_of: Callable[[Package], int]) -> List[PackageUnit]:
+    """Merge grouped packages (union-find over grouped_with) into units"""
+    waiting = {p.package_id: p for p in packages if p.truck_id is None and p.status == "At Hub"}
+    parent = {package_id: package_id for package_id in waiting}
+
+    def find(package_id: int) -> int:
+        while parent[package_id] != package_id:
+            parent[package_id] = parent[parent[package_id]]
+            package_id = parent[package_id]
+        return package_id
+
+    for package in waiting.values():
+        for other in package.grouped_with:
+            if other in parent:
+                root, other_root = find(package.package_id), find(other)
+                if root != other_root:
+                    parent[max(root, other_root)] = min(root, other_root)
+
+    groups: Dict[int, List[Package]] = {}
+    for package_id, package in waiting.items():
+        groups.setdefault(find(package_id), []).append(package)
+    return [PackageUnit(group, [location_of(p) for p in group]) for group in groups.values()]
+
+
+def _can_carry(truck: Truck, unit: PackageUnit, hub_row) -> bool:
+    """Check a unit's truck, delay and deadline constraints for a truck"""
+    if unit.required_truck is not None and unit.required_truck != truck.truck_id:
+        return False
+    if truck.clock < unit.loadable_at:
+        return False
+    if len(unit.packages) > truck.MAX_CAPACITY:
+        return False
+    travel = min(hub_row[location] for location in unit.locations) * 3600 / truck.SPEED
+    return truck.clock + travel <= unit.deadline
+
+
+def _distance_to(row, unit: PackageUnit) -> float:
+    """Distance from a medoid (its distance row) to the nearest location of a unit"""
+    return min(row[location] for location in unit.locations)
+
+
+def _initial_medoids(units: List[PackageUnit], trucks: List[Truck],
+                     distance_table: DistanceTable) -> List[int]:
+    """
+    Seed medoids: a truck that is the only option for some unit starts at
+    that unit; the rest go farthest-first from the hub and each other.
+    """
+    medoids: List[Optional[int]] = [None] * len(trucks)
+    for unit in units:
+        if len(unit.eligible) == 1 and medoids[unit.eligible[0]] is None:
+            medoids[unit.eligible[0]] = unit.locations[0]
+
+    locations = sorted({location for unit in units for location in unit.locations})
+    # Distance from each location to the nearest medoid chosen so far
+    nearest = {location: float("inf") for location in locations}
+    for medoid in [Truck.HUB_LOCATION_ID] + [m for m in medoids if m is not None]:
+        _closer(nearest, distance_table.row(medoid))
+    for index, medoid in enumerate(medoids):
+        if medoid is not None:
+            continue
+        if not nearest:
+            medoids[index] = Truck.HUB_LOCATION_ID
+            continue
+        # Location farthest from everything chosen so far
+        medoids[index] = max(locations, key=nearest.__getitem__)
+        _closer(nearest, distance_table.row(medoids[index]))
+    return medoids
+
+
+def _closer(nearest: Dict[int, float], row) -> None:
+    """Lower each location's nearest-medoid distance with a new medoid's row"""
+    for location, distance in nearest.items():
+        if row[location] < distance:
+            nearest[location] = row[location]
+
+
+def _assign(order: List[PackageUnit], trucks: List[Truck], medoids: List[int],
+            distance_table: DistanceTable):
+    """Give each unit to the nearest eligible truck with room"""
+    free = [truck.MAX_CAPACITY - len(truck.packages) for truck in trucks]
+    rows = [distance_table.row(medoid) for medoid in medoids]
+    # kind -> [eligible trucks nearest first, index of the first non-full one]
+    rankings: Dict[Tuple, list] = {}
+    clusters: List[List[PackageUnit]] = [[] for _ in trucks]
+    unassigned = []
+    for unit in order:
+        ranking = rankings.get(unit.kind)
+        if ranking is None:
+            ranked = sorted(unit.eligible, key=lambda i: (_distance_to(rows[i], unit), i))
+            ranking = rankings[unit.kind] = [ranked, 0]
+        ranked, cursor = ranking
+        while cursor < len(ranked) and not free[ranked[cursor]]:
+            cursor += 1
+        ranking[1] = cursor
+
+        size = len(unit.packages)
+        best = next((i for i in islice(ranked, cursor, None) if free[i] >= size), -1)
+        if best < 0:
+            unassigned.append(unit)
+            continue
+        free[best] -= size
+        clusters[best].append(unit)
+    return clusters, unassigned
+
+
+def _medoid(cluster: List[PackageUnit], distance_table: DistanceTable) -> int:
+    """Member location with the smallest total distance to the cluster's units"""
+    locations = sorted({location for unit in cluster for location in unit.locations})
+    return min(locations, key=lambda location: sum(
+        _distance_to(distance_table.row(location), unit) for unit in cluster
+    ))
@@ -0,0 +1,140 @@
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from .package import Package
+from .package_index import PackageIndex
+
+
+class PackageSnapshot(NamedTuple):
+    """Immutable copy of a package's tracking state, taken under its lock"""
+    package_id: int
+    address: str
+    zip_code: str
+    deadline: Any
+    location_id: Optional[int]
+    status: str
+    truck_id: Optional[int]
+    departure_time: Optional[datetime]
+    delivery_time: Optional[datetime]
+
+
+class ConcurrentHashTable:
+    """
+    Thread-safe package store for live status updates.
+    Packages are spread over a fixed number of stripes by package_id; each
+    stripe has its own dict, PackageIndex and lock. Threads working on
+    packages in different stripes never contend, and there is no global
+    lock.
+
+    Every read and write of a package's state goes through the store
+    (mark_en_route, mark_delivered, update, snapshot), which holds the
+    package's stripe lock for the whole operation, so readers never see a
+    half-applied change. Secondary indexes live per stripe for the same
+    reason; index queries merge the stripes.
+    """
+    def __init__(self, stripes: int = 16):
+        # Round stripe count up to a power of two
+        self.stripe_count: int = 1 << max(stripes - 1, 1).bit_length()
+        self._mask: int = self.stripe_count - 1
+        self._locks = [threading.Lock() for _ in range(self.stripe_count)]
+        self._tables: List[Dict[int, Package]] = [{} for _ in range(self.stripe_count)]
+        self._indexes = [PackageIndex() for _ in range(self.stripe_count)]
+
+    def _stripe(self, package_id: int) -> int:
+        """Get the stripe that owns package_id"""
+        return hash(package_id) & self._mask
+
+    @property
+    def size(self) -> int:
+        """Number of packages stored (approximate while writers run)"""
+        return sum(len(table) for table in self._tables)
+
+    def insert(self, package_id: int, package: Package) -> None:
+        """
+        Insert a package, replacing any package with the same ID.
+        Args:
+            package_id: The unique ID of the package
+            package: The Package object containing all delivery data
+        """
+        stripe = self._stripe(package_id)
+        with self._locks[stripe]:
+            table, index = self._tables[stripe], self._indexes[stripe]
+            existing = table.get(package_id)
+            if existing is not None:
+                index.remove(existing)
+            table[package_id] = package
+            index.add(package)
+
+    def lookup(self, package_id: int) -> Optional[Package]:
+        """
+        Look up a package by its ID.
+        The Package is live; use snapshot() for a consistent view of its
+        state while other threads may be updating it.
+        """
+        stripe = self._stripe(package_id)
+        with self._locks[stripe]:
+            return self._tables[stripe].get(package_id)
+
+    def snapshot(self, package_id: int) -> Optional[PackageSnapshot]:
+        """
+        Get an immutable copy of a package's tracking state.
+        Returns:
+            PackageSnapshot, or None if the package is not stored
+        """
+        stripe = self._stripe(package_id)
+        with self._locks[stripe]:
+            package = self._tables[stripe].get(package_id)
+            if package is None:
+                return None
+            return PackageSnapshot(
+                package.package_id, package.address, package.zip_code,
+                package.deadline, package.location_id, package.status,
+                package.truck_id, package.departure_time, package.delivery_time
+            )
+
+    def update(self, package_id: int, change: Callable[[Package], Any]) -> Any:
+        """
+        Apply a change to a package while holding its stripe lock.
+        Args:
+            package_id: The ID of the package to change
+            change: Called with the Package; its return value is passed back
+        Raises:
+            KeyError: If the package is not stored
+        """
+        stripe = self._stripe(package_id)
+        with self._locks[stripe]:
+            package = self._tables[stripe].get(package_id)
+            if package is None:
+                raise KeyError(package_id)
+            return change(package)
+
+    def mark_en_route(self, package_id: int, departure_time: datetime, truck_id: int) -> None:
+        """Mark a package en route (see Package.mark_en_route)"""
+        self.update(package_id, lambda package: package.mark_en_route(departure_time, truck_id))
+
+    def mark_delivered(self, package_id: int, delivery_time: datetime) -> None:
+        """Mark a package delivered (see Package.mark_delivered)"""
+        self.update(package_id, lambda package: package.mark_delivered(delivery_time))
+
+    def get_all_packages(self) -> List[Package]:
+        """
+        Get all packages. Each stripe is read under its own lock, so the
+        result is consistent per stripe, not across the whole store.
+        """
+        packages = []
+        for lock, table in zip(self._locks, self._tables):
+            with lock:
+                packages.extend(table.values())
+        return packages
+
+    def get_packages_by(self, field: str, value) -> List[Package]:
+        """
+        Get packages by an indexed field (see PackageIndex.FIELDS).
+        Example:
+            table.get_packages_by("status", "Delivered")
+        """
+        packages = []
+        for lock, index in zip(self._locks, self._indexes):
+            with lock:
+                packages.extend(index.find(field, value))
+        return packages
@@ -1,9 +1,22 @@
-from datetime import datetime, time, timedelta
-from typing import List, Optional
+import logging
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional
 from .distance_table import DistanceTable
 from .package_loader import PackageLoader
+from .alns import SEARCH_TIME_LIMIT, AlnsSolver, Plan
+from .assignment import assign_packages
+from .solve_job import Improvement, SolveJob
+from .fleet_simulator import FleetSimulator
+from .held_karp import EXACT_ROUTE_LIMIT, held_karp
+from .insertion import cheapest_insertion
+from .local_search import IMPROVE_TIME_LIMIT, improve_route
+from .route_problem import RouteProblem
 from .truck import Truck
 from .package import Package
+from .snapshot import SNAPSHOT_VERSION, SnapshotCache, input_key
+from .time_utils import ADDRESS_CORRECTION_SECONDS, from_seconds, to_seconds
+
+logger = logging.getLogger(__name__)
 
 class DeliveryService:
     """
@@ -14,25 +27,73 @@ class DeliveryService:
        - Early deadlines (9 AM)
        - Morning deadlines (10:30 AM)
        - Special requirements
-    3. Assign packages to trucks based on:
+    3. Assign packages to trucks by capacitated clustering, based on:
        - Deadlines
        - Truck restrictions
        - Package groups
-    4. Optimize delivery routes using nearest neighbor
+       - Delayed arrivals
+    4. Optimize delivery routes (nearest neighbor or deadline-aware
+       insertion, improved by local search, or exact for small loads),
+       simulating all trucks on one event-driven clock
     5. Track delivery status and mileage
     """
 
-    def __init__(self):
+    # Truck start times, in seconds since midnight
+    START_TIME = 8 * 3600
+    DELAYED_START = 9 * 3600 + 5 * 60
+    # Address for packages listed with a wrong address (known at 10:20)
+    CORRECTED_ADDRESS = "410 S State St"
+    CORRECTED_ZIP = "84111"
+    # Route strategies:
+    # - nearest: nearest deliverable package at every stop
+    # - insertion: deadline-aware cheapest insertion
+    # - exact: shortest deadline-feasible order (Held-Karp) for trucks with
+    #   up to exact_route_limit stops, nearest neighbor otherwise
+    # - alns: adaptive large neighbourhood search over truck assignment and
+    #   delivery order together, for search_time_limit seconds
+    ROUTE_STRATEGIES = ("nearest", "insertion", "exact", "alns")
+
+    def __init__(self, service_date: Optional[date] = None,
+                 drivers: Optional[int] = None,
+                 route_strategy: str = "nearest",
+                 exact_route_limit: int = EXACT_ROUTE_LIMIT,
+                 improve_routes: bool = True,
+                 improve_time_limit: float = IMPROVE_TIME_LIMIT,
+                 search_time_limit: float = SEARCH_TIME_LIMIT):
         """
         Initialize delivery service with required components.
+        Args:
+            service_date: Day being simulated (default: today). Routing
+                runs on a seconds-since-midnight clock; the date is only
+                used to report times as datetimes.
+            drivers: Number of drivers (default: one per truck). With
+                fewer, a loaded truck waits at the hub for a driver.
+            route_strategy: One of ROUTE_STRATEGIES
+            exact_route_limit: Most stops a truck can have for the exact
+                strategy to solve it (larger loads use nearest neighbor)
+            improve_routes: Shorten heuristic routes with 2-opt / Or-opt
+                moves before driving them
+            improve_time_limit: Seconds of improvement per truck
+            search_time_limit: Seconds the alns strategy searches for
+        Raises:
+            ValueError: If route_strategy is unknown
         """
+        if route_strategy not in self.ROUTE_STRATEGIES:
+            raise ValueError(f"Unknown route strategy: {route_strategy}")
         # Data Management
         self.distance_table = DistanceTable()
         self.package_loader = PackageLoader()
+        self.service_date = service_date or date.today()
+        self.drivers = drivers
+        self.route_strategy = route_strategy
+        self.exact_route_limit = exact_route_limit
+        self.improve_routes = improve_routes
+        self.improve_time_limit = improve_time_limit
+        self.search_time_limit = search_time_limit
 
         # Create trucks (all start at 8:00 AM)
-        start_time = datetime(2024, 1, 1, 8, 0)
-        delayed_start = datetime(2024, 1, 1, 9, 5) 
+        start_time = from_seconds(self.START_TIME, self.service_date)
+        delayed_start = from_seconds(self.DELAYED_START, self.service_date)
 
         self.trucks = [
             Truck(1, start_time),
@@ -48,7 +109,7 @@ class DeliveryService:
         Load distance and package data from CSV files.
 
         Args:
-            distance_file: Path to distance data CSV
+            distance_file: Path to distance data CSV or compiled distance table
             package_file: Path to package data CSV
         Returns:
             True if data loaded successfully, False otherwise
@@ -59,11 +120,13 @@ class DeliveryService:
         try:
             # first load distances (needed for routing)
             print("Loading distance data...")
-            self.distance_table.load_distance_data(distance_file)
+            self.distance_table.load(distance_file)
 
             # then load packages
             print("Loading package data...")
-            self.package_loader.load_packages(package_file)
+            # (addresses are resolved to location IDs here, so a spelling
+            # that is not in the distance table fails the load)
+            self.package_loader.load_packages(package_file, self.distance_table.locations)
 
             # verify data loaded
             if not self.distance_table.addresses:
@@ -83,12 +146,60 @@ class DeliveryService:
             print(f"Error loading data: {str(e)}")
             return False
     
+    def load_or_solve(self, distance_file: str, package_file: str, cache_dir: str) -> bool:
+        """
+        Load data and run the delivery routes, reusing a cached snapshot
+        when the input files are unchanged.
+        The snapshot holds the loaded distance table, the package store
+        and the solved trucks, keyed by a hash of the input files and the
+        solver settings, so a restart with the same inputs skips parsing
+        and routing entirely. Saving a snapshot prunes the least recently
+        used ones (see SnapshotCache).
+
+        Args:
+            distance_file: Path to distance data CSV or compiled distance table
+            package_file: Path to package data CSV
+            cache_dir: Directory for snapshots
+        Returns:
+            True if data is ready (restored or loaded and solved)
+        """
+        cache = SnapshotCache(cache_dir)
+        key = self.snapshot_key(distance_file, package_file)
+
+        state = cache.load(key)
+        if state is not None:
+            (self.distance_table, self.package_loader,
+             self.trucks, self.total_mileage) = state
+            logger.info("Restored solved routes from snapshot %s", key[:12])
+            return True
+
+        if not self.load_data(distance_file, package_file):
+            return False
+        self.run_delivery_routes()
+        cache.save(key, (self.distance_table, self.package_loader,
+                         self.trucks, self.total_mileage))
+        return True
+
+    def snapshot_key(self, distance_file: str, package_file: str) -> str:
+        """Get the snapshot key for input files, the service date and solver settings"""
+        # Solver settings change the solved routes, so they are part of the
+        # key; so is the service date, which restored trucks and packages carry
+        settings = ":".join(map(str, (
+            SNAPSHOT_VERSION, self.service_date.isoformat(), self.route_strategy, self.exact_route_limit,
+            self.improve_routes, self.improve_time_limit, self.search_time_limit,
+            self.drivers,
+        )))
+        # A compiled table's location registry lives in its index sidecar
+        files = [package_file] + DistanceTable.input_files(distance_file)
+        return input_key(*files, version=settings)
+
     def get_package_status(self, package_id: int, current_time: datetime) -> str:
         """
         Get the status of a package at a specific time.
         Args:
             package_id: ID of the package to get status for
-            current_time: Current time to check status at
+            current_time: Current time to check status at (time of day
+                on the service date)
         Returns:
             Status of the package at the given time
         """
@@ -97,23 +208,40 @@ class DeliveryService:
         if not package:
             return f"Package {package_id} not found"
         
-        # check status based on time
-        if package.delivery_time and package.delivery_time <= current_time:
+        # check status based on time (compared on the simulation clock)
+        now = to_seconds(current_time)
+        if package.delivery_seconds is not None and package.delivery_seconds <= now:
             return f"Delivered at {package.delivery_time.strftime('%I:%M %p')}"
         
-        if package.departure_time and package.departure_time <= current_time:
+        if package.departure_seconds is not None and package.departure_seconds <= now:
             return f"En Route (departed {package.departure_time.strftime('%I:%M %p')})"
         
         return "At Hub"
     
 
     def assign_packages_to_trucks(self) -> None:
-        """Main method to assign packages to trucks"""
-        # 1. First short packages to priority groups   
-        groups = self.sort_packages_by_priority()
-        
-        # 2. then assign groups to trucks
-        self.assign_priority_groups(groups)
+        """
+        Main method to assign packages to trucks.
+        Packages still at the hub are clustered onto trucks by
+        assign_packages (capacity, required truck, groups, delays and
+        deadlines), so calling this again only places new packages.
+        """
+        # 1. Print the priority summary
+        self.sort_packages_by_priority()
+
+        # 2. then cluster packages onto trucks
+        assignment = assign_packages(self.package_loader.get_all_packages(), self.trucks,
+                                     self.distance_table, self._planned_location)
+        for truck in self.trucks:
+            for package in assignment.loads[truck.truck_id]:
+                truck.load_package(package)
+        for package in assignment.unassigned:
+            print(f"WARNING: Could not assign package {package.package_id}")
+
+        # Print final summary
+        print("\nFinal truck loads:")
+        for truck in self.trucks:
+            print(f"Truck {truck.truck_id}: {len(truck.packages)} packages")
 
 
     def sort_packages_by_priority(self) -> dict:
@@ -140,7 +268,7 @@ class DeliveryService:
             # step 2: check if package is part of a group
             if package.grouped_with:
                 # Use smallest ID including current package
-                group_id = min(package.grouped_with + [package.package_id])
+                group_id = min(package.package_id, *package.grouped_with)
 
                 if group_id not in groups['grouped']:
                     groups['grouped'][group_id] = []
@@ -151,9 +279,9 @@ class DeliveryService:
                 continue
 
             # step 3: check deadlines
-            if package.deadline == time(9, 0):
+            if package.deadline_minutes == 9 * 60:
                 groups['early'].append(package)
-            elif package.deadline == time(10, 30):
+            elif package.deadline_minutes == 10 * 60 + 30:
                 groups['morning'].append(package)
             else:
                 groups['eod'].append(package)
@@ -173,268 +301,281 @@ class DeliveryService:
         
         return groups
 
-    def assign_priority_groups(self, groups: dict) -> None:
-        """
-        Assign sorted groups to trucks based on priorities:
-        """
-        # Set truck 3 start time for delayed packages
-        delayed_start = datetime(2024, 1, 1, 9, 5)
-        self.trucks[2].current_time = delayed_start
-
-        # 1. Handle early deadlines first (9 AM)
-        print("\nAssigning early deadline packages:")
-        for package in groups['early']:
-            if package not in groups['delayed']:  # Skip if delayed
-                if len(self.trucks[0].packages) < self.trucks[0].MAX_CAPACITY:
-                    self.trucks[0].load_package(package)
-                    print(f"Loaded early package {package.package_id} on Truck 1")
-
-        # 2. Handle morning deadlines (10:30 AM)
-        print("\nAssigning morning deadline packages:")
-        for package in groups['morning']:
-            if package not in groups['delayed']:  # Skip if delayed
-                # Try truck 1 first
-                if len(self.trucks[0].packages) < self.trucks[0].MAX_CAPACITY:
-                    success = self.trucks[0].load_package(package)
-                    print(f"Loading package {package.package_id} on Truck 1: {'Success' if success else 'Failed'}")
-                # Try truck 2 if truck 1 is full
-                elif len(self.trucks[1].packages) < self.trucks[1].MAX_CAPACITY:
-                    success = self.trucks[1].load_package(package)
-                    print(f"Loading package {package.package_id} on Truck 2: {'Success' if success else 'Failed'}")
-
-        # 3. Handle truck 2 requirements
-        print("\nAssigning Truck 2 required packages:")
-        for package in groups['truck2']:
-            if len(self.trucks[1].packages) < self.trucks[1].MAX_CAPACITY:
-                success = self.trucks[1].load_package(package)
-                if success:
-                    print(f"Loaded package {package.package_id} on Truck 2")
-                else:
-                    print(f"Failed to load package {package.package_id}")
-
-        # 4. Handle delayed packages (must go on truck 3)
-        print("\nAssigning delayed packages:")
-        for package in groups['delayed']:
-            if len(self.trucks[2].packages) < self.trucks[2].MAX_CAPACITY:
-                success = self.trucks[2].load_package(package)
-                if success:
-                    print(f"Loaded delayed package {package.package_id} on Truck 3")
-                else:
-                    print(f"Failed to load delayed package {package.package_id}")
-
-        # 5. Handle grouped packages
-        print("\nAssigning grouped packages:")
-        for group_id, group_packages in groups['grouped'].items():
-            # Find best truck for group
-            best_truck = None
-            for truck in self.trucks:
-                # Skip if not enough space
-                if len(truck.packages) + len(group_packages) > truck.MAX_CAPACITY:
-                    continue
-                    
-                # Check if any package requires truck 2
-                requires_truck2 = any(p.required_truck == 2 for p in group_packages)
-                if requires_truck2 and truck.truck_id != 2:
-                    continue
-                    
-                # Check if any package is delayed
-                has_delayed = any(p.delayed_until for p in group_packages)
-                if has_delayed and truck.truck_id != 3:
-                    continue
-                    
-                # Found valid truck
-                best_truck = truck
-                break
-                
-            # Load group if we found a valid truck
-            if best_truck:
-                print(f"Loading group {group_id} on Truck {best_truck.truck_id}")
-                for package in group_packages:
-                    best_truck.load_package(package)
-            else:
-                print(f"ERROR: Could not find truck for group {group_id}")
-
-        # 6. Fill remaining space with EOD packages
-        print("\nAssigning EOD packages:")
-        for package in groups['eod']:
-            # Skip if already assigned
-            if any(package in truck.packages for truck in self.trucks):
-                continue
-                
-            # Try each truck
-            assigned = False
-            for truck in self.trucks:
-                # Skip if truck full
-                if len(truck.packages) >= truck.MAX_CAPACITY:
-                    continue
-                    
-                # Skip if wrong truck
-                if package.required_truck == 2 and truck.truck_id != 2:
-                    continue
-                    
-                # Skip if delayed package on wrong truck
-                if package.delayed_until and truck.truck_id != 3:
-                    continue
-                    
-                # Load package
-                success = truck.load_package(package)
-                if success:
-                    print(f"Loaded EOD package {package.package_id} on Truck {truck.truck_id}")
-                    assigned = True
-                    break
-                    
-            if not assigned:
-                print(f"WARNING: Could not assign EOD package {package.package_id}")
-
-        # Print final summary
-        print("\nFinal truck loads:")
-        for truck in self.trucks:
-            print(f"Truck {truck.truck_id}: {len(truck.packages)} packages")
-
     def run_delivery_routes(self) -> None:
         """
-        Run all truck delivery routes using nearest neighbor algorithm.
+        Run all truck delivery routes using the route strategy.
         Process:
-        1. First assign packages to trucks based on constraints
-        2. Run optimized routes for each truck
+        1. First assign packages to trucks based on constraints, with
+           trucks that wait for a driver leaving when one is free (the
+           alns strategy searches assignment and order together instead)
+        2. Simulate all trucks together on one clock (FleetSimulator)
         3. Track total mileage (must stay under 140 miles)
         """
-        # First assign packages
+        if self.route_strategy == "alns":
+            self.run_plan(self.optimize_plan(self.search_time_limit))
+            return
+
+        # First assign packages, to trucks leaving when they get a driver
+        self._wait_for_drivers()
         self.assign_packages_to_trucks()
 
-        # run routes for each truck
-        print("\nStarting deliveries:")
-        for truck in self.trucks:
-            if len(truck.packages) > 0:
-                print(f"\nRunning route for Truck {truck.truck_id}:")
-                print(f"Starting packages {len(truck.packages)}")
+        # run every truck's route on the shared clock
+        logger.info("Starting deliveries")
+        simulator = self._simulator(self.trucks)
+        simulator.run()
 
-                # run this trucks route
-                self.run_truck_route(truck)
+        # add up mileage
+        self.total_mileage += sum(truck.mileage for truck in self.trucks)
+        logger.info("Deliveries complete, total mileage: %.1f miles", self.total_mileage)
+        self._log_late_deliveries()
+
+    def run_plan(self, plan: Plan) -> None:
+        """
+        Load a plan onto the trucks and drive it on the shared clock.
+        Args:
+            plan: Plan from optimize_plan or solve
+        """
+        self.load_plan(plan)
+        logger.info("Starting deliveries")
+        self._simulator(self.trucks, plan.routes).run()
+        self.total_mileage += sum(truck.mileage for truck in self.trucks)
+        logger.info("Deliveries complete, total mileage: %.1f miles", self.total_mileage)
+        self._log_late_deliveries()
+
+    def solve(self, time_limit: Optional[float] = SEARCH_TIME_LIMIT,
+              on_improvement: Optional[Callable[[Improvement], None]] = None,
+              seed: Optional[int] = None) -> SolveJob:
+        """
+        Start an anytime search in a background thread.
+        A first plan is ready as soon as the starting assignment is built
+        (milliseconds on the daily data), and every better plan after it
+        is passed to on_improvement. Trucks and packages are not changed;
+        hand the plan to run_plan to drive it.
 
-                # add to total mileage
-                self.total_mileage += truck.mileage
+        Args:
+            time_limit: Seconds to search (None to run until cancelled)
+            on_improvement: Called on the search thread with each new best
+                plan (mileage, lateness and package IDs by truck)
+            seed: Random seed, for repeatable searches
+        Returns:
+            Running SolveJob (cancel(), best(), result())
 
-        print(f"\nDeliveries complete!")
-        print(f"Total mileage: {self.total_mileage:.1f} miles")
+        example:
+            job = service.solve(time_limit=30, on_improvement=print)
+            plan = job.best(timeout=1).plan  # usable plan right away
+            job.cancel()
+            service.run_plan(job.result())
+        """
+        solver = AlnsSolver(self.package_loader.get_all_packages(), self.trucks,
+                            self.distance_table, self._planned_location, seed, self.drivers)
+        return SolveJob(solver, time_limit, on_improvement).start()
+
+    def optimize_plan(self, time_limit: Optional[float] = SEARCH_TIME_LIMIT,
+                      on_improvement: Optional[Callable[[Plan], None]] = None,
+                      stop: Optional[Callable[[], bool]] = None,
+                      seed: Optional[int] = None) -> Plan:
+        """
+        Search for the shortest on-time plan for the packages at the hub.
+        Trucks and packages are not changed; see load_plan.
+        Args:
+            time_limit: Seconds to search
+            on_improvement: Called with each new best plan
+            stop: Polled during the search; it ends once this returns True
+            seed: Random seed, for repeatable searches
+        Returns:
+            Best plan found (check Plan.feasible)
+        """
+        solver = AlnsSolver(self.package_loader.get_all_packages(), self.trucks,
+                            self.distance_table, self._planned_location, seed, self.drivers)
+        plan = solver.solve(time_limit, on_improvement=on_improvement, stop=stop)
+        logger.info("Search ran %d iterations: %.1f miles, %d s late",
+                    solver.iterations, plan.distance, plan.lateness)
+        return plan
+
+    def load_plan(self, plan: Plan) -> None:
+        """Load each truck with its packages from a plan"""
+        for truck in self.trucks:
+            for package in plan.routes.get(truck.truck_id, ()):
+                truck.load_package(package)
+        for package in plan.unassigned:
+            print(f"WARNING: Could not assign package {package.package_id}")
 
     def run_truck_route(self, truck: Truck) -> None:
         """
         Optimize package delivery using nearest neighbor algorithm:
         1. Start at hub location
-        2. Find nearest undelivered package
+        2. Find nearest deliverable package (waiting for the next release
+           time if none is deliverable yet)
         3. Calculate travel time based on 18mph speed
         4. Update package status and truck mileage
         5. Repeat until all packages delivered
-        6. Return to hub        
+        6. Return to hub
         """
-        print(f"\nStarting route for Truck {truck.truck_id}")
-        print(f"Start time: {truck.current_time.strftime('%I:%M %p')}")
+        self._simulator([truck]).run()
 
-        # Keep track of delivery attempts
-        max_attempts = 100  
-        attempts = 0
+    def plan_routes(self, trucks: List[Truck]) -> Dict[int, List[Package]]:
+        """
+        Plan each truck's delivery order with the route strategy.
+        Heuristic routes (nearest neighbor, insertion, and exact-strategy
+        trucks that are too large or infeasible) are then shortened by
+        local search when improve_routes is set. The alns strategy plans
+        whole fleets in optimize_plan; here it plans like nearest.
+        Returns:
+            Planned package order by truck ID (trucks left to online
+            nearest neighbor are missing)
+        """
+        routes = {}
+        if self.route_strategy == "nearest" and not self.improve_routes:
+            return routes
 
-        while len([p for p in truck.packages if p.status != "Delivered"]) > 0:
-            attempts += 1
-            if attempts > max_attempts:
-                print(f"WARNING: Max attempts reached for truck {truck.truck_id}")
-                break
-            
-            # Find next deliverable package
-            next_package = None
-            shortest_distance = float('inf')
-            
-            for package in truck.packages:
-                if package.status != "Delivered":
-                    # Skip if before truck start time
-                    if truck.truck_id == 3 and truck.current_time < datetime(2024, 1, 1, 9, 5):
-                        continue
-                        
-                    # Skip if package is delayed
-                    if package.delayed_until and truck.current_time.time() < package.delayed_until:
-                        continue
-                        
-                    # Skip wrong address packages before 10:20
-                    if package.wrong_address and truck.current_time < datetime(2024, 1, 1, 10, 20):
-                        continue
-                        
-                    # Update wrong address at 10:20
-                    if package.wrong_address and truck.current_time >= datetime(2024, 1, 1, 10, 20):
-                        package.update_address("410 S State St", truck.current_time)
-                        package.update_zip("84111", truck.current_time)
-                    
-                    try:
-                        distance = self.distance_table.get_distance(
-                            truck.current_address,
-                            package.address
-                        )
-                        
-                        if distance < shortest_distance:
-                            next_package = package
-                            shortest_distance = distance
-                    except Exception as e:
-                        print(f"Error getting distance: {str(e)}")
-                        continue
-            
-            # If no package can be delivered now, wait 5 minutes
-            if not next_package:
-                truck.current_time += timedelta(minutes=5)
+        for truck in trucks:
+            problem = RouteProblem.for_truck(truck, self.distance_table, self._planned_location)
+            if not problem.size:
                 continue
-                
-            # Deliver the package
-            travel_time = shortest_distance / truck.SPEED
-            delivery_time = truck.current_time + timedelta(hours=travel_time)
-            
-            truck.mileage += shortest_distance
-            truck.current_address = next_package.address
-            truck.current_time = delivery_time
-            next_package.mark_delivered(delivery_time)
-            
-            print(f"Delivered package {next_package.package_id}")
-            print(f"At: {delivery_time.strftime('%I:%M %p')}")
-            print(f"Location: {next_package.address}")
-
-        # Return to hub
-        if truck.current_address != "Western Governors University":
-            try:
-                distance = self.distance_table.get_distance(
-                    truck.current_address,
-                    "Western Governors University"
-                )
-                truck.mileage += distance
-                travel_time = distance / truck.SPEED
-                truck.current_time += timedelta(hours=travel_time)
-                truck.current_address = "Western Governors University"
-            except Exception as e:
-                print(f"Error returning to hub: {str(e)}")
-
-        print(f"\nTruck {truck.truck_id} route complete:")
-        print(f"End time: {truck.current_time.strftime('%I:%M %p')}")
-        print(f"Total mileage: {truck.mileage:.1f}")
+            order = self._plan_order(problem, truck.truck_id)
+            if order is None:
+                continue
+            routes[truck.truck_id] = problem.packages_in(order)
+            logger.debug("Planned Truck %s: %.1f miles", truck.truck_id,
+                         problem.evaluate(order).distance)
+        return routes
+
+    def _plan_order(self, problem: RouteProblem, truck_id: int,
+                    warn: bool = True) -> Optional[List[int]]:
+        """
+        Plan one truck's stop order with the route strategy.
+        Args:
+            problem: The truck's route problem (at least one stop)
+            truck_id: Truck being planned, for log messages
+            warn: Log when the exact strategy finds no on-time order
+        Returns:
+            Stop order, or None to leave the truck to online nearest neighbor
+        """
+        order = None
+        if self.route_strategy == "exact" and problem.size <= self.exact_route_limit:
+            order = held_karp(problem)
+            if order is None and warn:
+                logger.warning("No deadline-feasible route for Truck %s, "
+                               "using nearest neighbor", truck_id)
+
+        if order is None:
+            if self.route_strategy == "insertion":
+                order = cheapest_insertion(problem)
+            elif self.improve_routes:
+                order = problem.nearest_neighbor_order()
+            else:
+                return None
+            if self.improve_routes:
+                order = improve_route(problem, order, self.improve_time_limit)
+        return order
+
+    def _wait_for_drivers(self) -> None:
+        """
+        Move trucks that will wait at the hub for a driver to the time one
+        is free, so assignment and route planning see when they really
+        leave. The loads assign_packages would give, and the routes the
+        route strategy would drive, are worked out without loading any
+        truck; FleetSimulator.departures then times the drivers. This
+        repeats until no truck moves (clocks only move later).
+        """
+        if self.drivers is None or self.drivers >= len(self.trucks):
+            return
+        packages = self.package_loader.get_all_packages()
+        for _ in range(len(self.trucks)):
+            assignment = assign_packages(packages, self.trucks, self.distance_table,
+                                         self._planned_location)
+            problems = []
+            for truck in self.trucks:
+                load = {p.package_id: p for p in truck.packages if p.status != "Delivered"}
+                load.update((p.package_id, p) for p in assignment.loads[truck.truck_id])
+                problem = RouteProblem(load.values(), self.distance_table, truck.clock,
+                                       truck.SPEED, truck.HUB_LOCATION_ID, self._planned_location)
+                order = None
+                if problem.size:
+                    order = (self._plan_order(problem, truck.truck_id, warn=False)
+                             or problem.nearest_neighbor_order())
+                problems.append((problem, order))
+
+            def finish(t: int, departure: int) -> Optional[int]:
+                problem, order = problems[t]
+                if order is None:
+                    return None
+                problem.start = departure
+                return problem.evaluate(order).finish
+
+            ready = [truck.clock for truck in self.trucks]
+            departures = FleetSimulator.departures(ready, finish, self.drivers)
+            if departures == ready:
+                return
+            for truck, departure in zip(self.trucks, departures):
+                if departure != truck.clock:
+                    logger.info("Truck %s waits for a driver until %s", truck.truck_id,
+                                from_seconds(departure, truck.day).strftime('%I:%M %p'))
+                    truck.clock = departure
+
+    def _log_late_deliveries(self) -> None:
+        """Warn about every package on the trucks delivered after its deadline"""
+        packages = {p.package_id: p for truck in self.trucks for p in truck.packages}
+        for package in packages.values():
+            if (package.delivery_seconds is not None
+                    and package.delivery_seconds > package.deadline_minutes * 60):
+                logger.warning("Package %s delivered at %s, after its %s deadline",
+                               package.package_id,
+                               package.delivery_time.strftime('%I:%M %p'),
+                               package.deadline.strftime('%I:%M %p'))
+
+    def _planned_location(self, package: Package) -> int:
+        """Location a package will be delivered to, after any address correction"""
+        if package.wrong_address and package.corrected_address is None:
+            return self.distance_table.locations.resolve(self.CORRECTED_ADDRESS)
+        return Truck._location_of(package, self.distance_table)
+
+    def _simulator(self, trucks: List[Truck],
+                   routes: Optional[Dict[int, List[Package]]] = None) -> FleetSimulator:
+        """
+        Create a fleet simulation with the 10:20 address correction scheduled.
+        Routes default to plan_routes.
+        """
+        if routes is None:
+            routes = self.plan_routes(trucks)
+        simulator = FleetSimulator(trucks, self.distance_table, self.drivers, routes)
+        packages = [p for truck in trucks for p in truck.packages if p.wrong_address]
+        if packages:
+            simulator.schedule(
+                ADDRESS_CORRECTION_SECONDS,
+                lambda clock: self.apply_address_corrections(packages, clock)
+            )
+        return simulator
+
+    def apply_address_corrections(self, packages: List[Package], clock: int) -> None:
+        """
+        Switch wrong-address packages to their corrected address.
+        Args:
+            packages: Packages flagged with a wrong address
+            clock: Simulation clock (seconds since midnight)
+        """
+        current_time = from_seconds(clock, self.service_date)
+        location_id = self.distance_table.locations.resolve(self.CORRECTED_ADDRESS)
+        for package in packages:
+            package.update_address(self.CORRECTED_ADDRESS, current_time, location_id)
+            package.update_zip(self.CORRECTED_ZIP, current_time)
+            logger.debug("Corrected address of package %s", package.package_id)
 
     def find_nearest_package(self, truck: Truck) -> Optional[Package]:
         """
         Find nearest undelivered package on truck.
         Returns None if no packages left to deliver.
         """
-        nearest_package = None
-        shortest_distance = float('inf')
-
-        # check each package on truck
-        for package in truck.packages:
-            if package.status != "Delivered":
-                # get disteance to this package
-                distance = self.distance_table.get_distance(
-                    truck.current_address,
-                    package.address
-                )
-
-                # if this is closer than current nearest
-                if distance < shortest_distance:
-                    # check if we can deliver it now
-                    if package.can_be_loaded(truck.current_time, truck.truck_id):
-                        nearest_package = package
-                        shortest_distance = distance
-    
-        return nearest_package
\ No newline at end of file
+        # only packages we can deliver now are candidates
+        candidates = [
+            package for package in truck.packages
+            if package.status != "Delivered"
+            and package.can_be_loaded(truck.clock, truck.truck_id)
+        ]
+
+        # one batch lookup for all candidate distances
+        position, _ = self.distance_table.nearest(
+            truck.location_id,
+            [package.location_id for package in candidates]
+        )
+        return candidates[position] if position >= 0 else None
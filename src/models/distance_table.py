@@ -1,5 +1,14 @@
 import csv
-from typing import List
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+from .location_registry import LocationRegistry
+from .time_utils import SECONDS_PER_HOUR
 
 class DistanceTable:
     """
@@ -9,13 +18,64 @@ class DistanceTable:
     - Column 1: Address and zip (not used)
     - Column 2: Distance to WGU
     - Column 3+: Distances to other locations
+
+    Distances are parsed once at load time into a packed lower-triangular
+    array of n(n+1)/2 floats, mirrored so that d(a, b) == d(b, a), and
+    every address is mapped to an integer location ID that indexes it.
+
+    Compiled format (see compile / load_compiled):
+    - <file>: 8-byte magic, uint32 location count, 4 bytes padding, then
+      the packed triangle as little-endian float64
+    - <file>.idx: JSON location registry (labels and address aliases)
+    Loading a compiled file memory-maps it instead of parsing anything.
     """
 
+    COMPILED_MAGIC = b"WGUDIST1"
+    COMPILED_HEADER = struct.Struct("<8sI4x")  # padded to keep floats aligned
+    INDEX_SUFFIX = ".idx"
+    # Most dense rows kept by row(); older ones are rebuilt on demand
+    ROW_CACHE_SIZE = 16
+
     def __init__(self):
         # Store addresses from header row (skipping first two columns)
         self.addresses: List[str] = []
-        # Store raw CSV rows for direct distance lookups
-        self.raw_rows: List[List[str]] = []
+        # Address spelling -> location ID (= matrix index)
+        self.locations = LocationRegistry()
+        # Packed lower triangle: d(i, j) for j <= i is at i*(i+1)/2 + j
+        # (a memoryview over an mmap when loaded from a compiled file)
+        self.matrix: array = array("d")
+        self.size: int = 0
+        # Full rows unpacked from the triangle, built on first use and
+        # kept in least recently used order
+        self._rows: "OrderedDict[int, array]" = OrderedDict()
+        # Speed (mph) -> packed travel times in seconds, built on first use
+        self._travel: Dict[float, array] = {}
+
+    def __getstate__(self) -> dict:
+        """Pickle support: copy a memory-mapped matrix, drop cached rows"""
+        state = self.__dict__.copy()
+        state["matrix"] = array("d", self.matrix)
+        state["_rows"] = OrderedDict()
+        state["_travel"] = {}
+        return state
+
+    def load(self, filename: str) -> None:
+        """
+        Load distance data from either a compiled table or a CSV file,
+        detected from the file's leading bytes.
+        Args:
+            filename: Path to compiled table or distance data CSV
+        """
+        try:
+            with open(filename, "rb") as file:
+                compiled = file.read(len(self.COMPILED_MAGIC)) == self.COMPILED_MAGIC
+        except OSError:
+            compiled = False
+
+        if compiled:
+            self.load_compiled(filename)
+        else:
+            self.load_distance_data(filename)
 
     def load_distance_data(self, filename: str) -> None:
         """
@@ -26,72 +86,244 @@ class DistanceTable:
         try:
             with open(filename, "r") as file:
                 csv_reader = csv.reader(file)
-                
+
                 # Skip first 8 rows (headers)
                 for _ in range(8):
                     next(csv_reader)
-                
+
                 # Get addresses from header row (skip first two columns)
                 header = next(csv_reader)
                 self.addresses = [addr.strip() for addr in header[2:] if addr.strip()]
-                
-                # Skip empty row and HUB row
-                next(csv_reader)
-                next(csv_reader)
-                
-                # Store each valid row (must have at least name and one distance)
-                self.raw_rows = []
-                for row in csv_reader:
-                    if len(row) >= 3:  # Name, zip, and at least one distance
-                        self.raw_rows.append(row)
+
+                # Each valid row is one location (must have name, address and
+                # at least one distance); the HUB row comes first
+                rows = [row for row in csv_reader if len(row) >= 3 and row[0].strip()]
+
+            self._build_matrix(rows)
 
         except FileNotFoundError:
             print(f"Error: File {filename} not found")
         except Exception as e:
             print(f"Error loading distances: {str(e)}")
 
+    def _build_matrix(self, rows: List[List[str]]) -> None:
+        """
+        Build the address index and the packed symmetric distance matrix
+        from CSV rows. The CSV only fills the lower triangle; a cell that is
+        empty there is taken from its mirror in the upper triangle.
+        Args:
+            rows: One CSV row per location, in column order
+        """
+        size = len(rows)
+        matrix = array("d", bytes(8 * (size * (size + 1) // 2)))
+        locations = LocationRegistry()
+
+        for i, row in enumerate(rows):
+            # Register the location name, the street address under it, and
+            # the address in column 1 (sometimes spelled differently)
+            lines = row[0].split("\n")
+            locations.add(lines[0].strip(), *lines[1:2], row[1].split("\n")[0])
+
+            for j, cell in enumerate(row[2:2 + size]):
+                cell = cell.strip()
+                if not cell:
+                    continue
+                if j <= i:
+                    matrix[i * (i + 1) // 2 + j] = float(cell)
+                elif not matrix[j * (j + 1) // 2 + i]:
+                    matrix[j * (j + 1) // 2 + i] = float(cell)
+
+        self.locations = locations
+        self.matrix = matrix
+        self.size = size
+        self._rows = OrderedDict()
+        self._travel = {}
+
+    def save_compiled(self, filename: str) -> None:
+        """
+        Write the loaded table in compiled binary form.
+        Args:
+            filename: Path of the matrix file; the index goes next to it
+        """
+        matrix = array("d", self.matrix)
+        if sys.byteorder != "little":
+            matrix.byteswap()
+
+        with open(filename, "wb") as file:
+            file.write(self.COMPILED_HEADER.pack(self.COMPILED_MAGIC, self.size))
+            matrix.tofile(file)
+
+        index = self.locations.to_dict()
+        index["addresses"] = self.addresses
+        with open(filename + self.INDEX_SUFFIX, "w") as file:
+            json.dump(index, file)
+
+    @classmethod
+    def input_files(cls, filename: str) -> List[str]:
+        """
+        Get the files a table loaded from filename is built from: the
+        file itself, plus the index of a compiled table.
+        """
+        index = filename + cls.INDEX_SUFFIX
+        return [filename, index] if os.path.exists(index) else [filename]
+
+    @classmethod
+    def compile(cls, csv_filename: str, filename: str) -> None:
+        """
+        Compile a distance CSV into the binary matrix format.
+        Args:
+            csv_filename: Path to distance data CSV
+            filename: Path of the compiled matrix file to write
+        """
+        table = cls()
+        table.load_distance_data(csv_filename)
+        table.save_compiled(filename)
+
+    def load_compiled(self, filename: str) -> None:
+        """
+        Load a compiled distance table by memory-mapping it. The matrix is
+        read straight from the mapped pages (no copy), so startup cost does
+        not grow with the number of locations and concurrent processes
+        share the same pages.
+        Args:
+            filename: Path of the compiled matrix file
+        """
+        try:
+            with open(filename + self.INDEX_SUFFIX, "r") as file:
+                index = json.load(file)
+
+            with open(filename, "rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            magic, size = self.COMPILED_HEADER.unpack_from(mapped)
+            if magic != self.COMPILED_MAGIC:
+                raise ValueError(f"{filename} is not a compiled distance table")
+
+            matrix = memoryview(mapped)[self.COMPILED_HEADER.size:].cast("d")
+            if len(matrix) != size * (size + 1) // 2:
+                raise ValueError(f"{filename} is truncated")
+            if sys.byteorder != "little":
+                # Mapped pages are little-endian; fall back to a swapped copy
+                matrix = array("d", matrix)
+                matrix.byteswap()
+
+            self.addresses = index.pop("addresses")
+            self.locations = LocationRegistry.from_dict(index)
+            self.matrix = matrix
+            self.size = size
+            self._rows = OrderedDict()
+            self._travel = {}
+
+        except FileNotFoundError as e:
+            print(f"Error: File {e.filename} not found")
+        except Exception as e:
+            print(f"Error loading compiled distances: {str(e)}")
+
+    def index_of(self, address: str) -> Optional[int]:
+        """
+        Get the location ID (matrix index) for an address.
+        Args:
+            address: Location name or street address
+        Returns:
+            Location ID, or None if the address is unknown
+        """
+        return self.locations.get_id(address)
+
+    def get_distance_by_index(self, index1: int, index2: int) -> float:
+        """Get distance between two matrix indexes"""
+        if index1 < index2:
+            index1, index2 = index2, index1
+        return self.matrix[index1 * (index1 + 1) // 2 + index2]
+
+    def travel_times(self, speed: float) -> array:
+        """
+        Get travel times between all locations at a speed.
+        Same packed layout as matrix, in whole seconds (rounded), so the
+        simulation clock advances by integer lookups. Built once per speed.
+        Args:
+            speed: Travel speed in miles per hour
+        """
+        travel = self._travel.get(speed)
+        if travel is None:
+            scale = SECONDS_PER_HOUR / speed
+            travel = self._travel[speed] = array("l", (round(d * scale) for d in self.matrix))
+        return travel
+
+    def get_travel_time_by_index(self, index1: int, index2: int, speed: float) -> int:
+        """Get travel time in seconds between two matrix indexes at speed mph"""
+        if index1 < index2:
+            index1, index2 = index2, index1
+        return self.travel_times(speed)[index1 * (index1 + 1) // 2 + index2]
 
     def get_distance(self, address1: str, address2: str) -> float:
         """Get distance between two addresses"""
-        try:
-            print(f"\nLooking up distance from {address1} to {address2}")
-            
-            # Find the row containing address1
-            source_row = None
-            for row in self.raw_rows:
-                if address1 in row[0]:
-                    source_row = row
-                    print(f"Found source row: {row}")
-                    break
-                    
-            # If we didn't find the source address
-            if not source_row:
-                # Check if it's WGU,it won't be in raw_rows
-                if "Western Governors University" in address1:
-                    # Find destination row and get its WGU distance
-                    for row in self.raw_rows:
-                        if address2 in row[0]:
-                            distance = float(row[2])  # Distance TO WGU
-                            print(f"Found WGU distance: {distance}")
-                            return distance
-                return 0.0
-                
-            # If going TO WGU, use column 2
-            if "Western Governors University" in address2:
-                distance = float(source_row[2])
-                print(f"Distance to WGU: {distance}")
-                return distance
-                
-            # For other addresses, find column index
-            for i, addr in enumerate(self.addresses):
-                if address2 in addr:
-                    # Add 2 because we skipped first two columns
-                    distance = float(source_row[i + 2])
-                    print(f"Regular distance: {distance}")
-                    return distance
-                    
+        index1 = self.index_of(address1)
+        index2 = self.index_of(address2)
+        if index1 is None or index2 is None:
             return 0.0
-                
-        except Exception as e:
-            print(f"Error getting distance: {str(e)}")
-            return 0.0
\ No newline at end of file
+        return self.get_distance_by_index(index1, index2)
+
+    def row(self, origin: int) -> array:
+        """
+        Get all distances from one location as a dense row.
+        The part left of the diagonal is a contiguous slice of the packed
+        triangle; the rest is gathered from the column. The ROW_CACHE_SIZE
+        most recently used rows are cached, so memory stays bounded however
+        many origins are asked for.
+        Args:
+            origin: Location ID
+        Returns:
+            array of distances indexed by destination location ID
+        """
+        row = self._rows.get(origin)
+        if row is not None:
+            self._rows.move_to_end(origin)
+            return row
+        start = origin * (origin + 1) // 2
+        row = array("d", self.matrix[start:start + origin + 1])
+        row.extend(self.matrix[j * (j + 1) // 2 + origin]
+                   for j in range(origin + 1, self.size))
+        self._rows[origin] = row
+        if len(self._rows) > self.ROW_CACHE_SIZE:
+            self._rows.popitem(last=False)
+        return row
+
+    def submatrix(self, locations: Sequence[int]) -> List[List[float]]:
+        """
+        Get the distances between a set of locations as a dense matrix,
+        read straight from the packed triangle (no full rows are built).
+        Args:
+            locations: Location IDs; they index both dimensions, in order
+        Returns:
+            matrix[a][b] = distance from locations[a] to locations[b]
+        """
+        distance = self.get_distance_by_index
+        return [[distance(origin, destination) for destination in locations]
+                for origin in locations]
+
+    def distances_from(self, origin: int, destinations: Sequence[int]) -> array:
+        """
+        Get distances from one location to many in a single call.
+        Args:
+            origin: Location ID to measure from
+            destinations: Location IDs to measure to
+        Returns:
+            array of distances, in the same order as destinations
+        """
+        return array("d", map(self.row(origin).__getitem__, destinations))
+
+    def nearest(self, origin: int, destinations: Sequence[int]) -> Tuple[int, float]:
+        """
+        Find the closest of several locations.
+        Args:
+            origin: Location ID to measure from
+            destinations: Location IDs to choose from
+        Returns:
+            (position in destinations, distance), or (-1, inf) if empty.
+            Ties go to the earliest position.
+        """
+        if not destinations:
+            return -1, float("inf")
+        distances = self.distances_from(origin, destinations)
+        shortest = min(distances)
+        return distances.index(shortest), shortest
@@ -0,0 +1,227 @@
+import heapq
+import itertools
+import logging
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+from .distance_table import DistanceTable
+from .package import Package
+from .release_queue import ReleaseQueue
+from .time_utils import from_seconds
+from .truck import Truck
+
+logger = logging.getLogger(__name__)
+
+
+class FleetSimulator:
+    """
+    Discrete-event simulation of a fleet of trucks on one shared clock.
+    Every truck is driven by events on a single heap, ordered by time:
+    - READY: truck is loaded and wants to leave the hub (needs a driver)
+    - ARRIVE: truck reaches a stop; the package is delivered and the next
+      stop is chosen (the next package of the truck's planned route, or
+      else the nearest deliverable package)
+    - WAKE: a waiting truck's next package is released
+    - RETURN: truck is back at the hub; its driver is free again
+    - scheduled callbacks (schedule()), e.g. the 10:20 address correction,
+      which run before truck events at the same time
+    Each truck's undelivered packages are kept in a ReleaseQueue, so a
+    truck with nothing deliverable jumps straight to the next
+    Package.available_at, and the cost of a run grows with the number of
+    events, not with idle time. With fewer drivers than trucks,
+    a loaded truck waits at the hub until another truck returns; waiting
+    trucks get drivers in the order they became ready (see departures).
+    """
+
+    # Event kinds; at equal times lower kinds run first
+    CALLBACK, RETURN, READY, ARRIVE, WAKE = range(5)
+
+    def __init__(self, trucks: Iterable[Truck], distance_table: DistanceTable,
+                 drivers: Optional[int] = None,
+                 routes: Optional[Dict[int, List[Package]]] = None):
+        """
+        Args:
+            trucks: Loaded trucks, each starting at its own clock
+            distance_table: Distance and travel time lookups
+            drivers: Number of drivers (default: one per truck)
+            routes: Planned delivery order by truck ID; trucks without a
+                plan use nearest neighbor
+        """
+        self.trucks: List[Truck] = list(trucks)
+        self.distance_table = distance_table
+        self.drivers = len(self.trucks) if drivers is None else drivers
+        self.clock = 0
+        self.event_count = 0
+        # (time, kind, sequence, payload); sequence keeps ties in FIFO order
+        self._events: List[Tuple[int, int, int, object]] = []
+        self._sequence = itertools.count()
+        self._free_drivers = self.drivers
+        self._waiting: Deque[Truck] = deque()
+        # truck_id -> undelivered packages of a truck that has left
+        self._queues: Dict[int, ReleaseQueue] = {}
+        # truck_id -> planned packages not yet delivered
+        self._routes: Dict[int, Deque[Package]] = {
+            truck_id: deque(route) for truck_id, route in (routes or {}).items()
+        }
+
+    def schedule(self, when: int, callback: Callable[[int], None]) -> None:
+        """
+        Run callback(clock) at a time on the shared clock.
+        Args:
+            when: Seconds since midnight
+            callback: Called with the clock value when the event fires
+        """
+        self._push(when, self.CALLBACK, callback)
+
+    @staticmethod
+    def departures(ready: Sequence[int], finish: Callable[[int, int], Optional[int]],
+                   drivers: Optional[int] = None) -> List[int]:
+        """
+        Work out when each truck leaves the hub, dispatching drivers as
+        run() does: trucks take a driver in order of ready time (ties in
+        list order), each as soon as one is free, and a driver is free
+        again when the truck is back. Planners use this to time routes of
+        trucks that wait for a driver.
+        Args:
+            ready: Clock value each truck is loaded and ready to leave
+            finish: finish(index, departure) -> clock value the truck is
+                back at the hub if it leaves then, or None if it has
+                nothing to deliver (it takes no driver)
+            drivers: Number of drivers (default: one per truck)
+        Returns:
+            Departure of each truck (its ready time if it never leaves)
+        """
+        # Clock values at which each driver is free
+        free = [0] * (len(ready) if drivers is None else drivers)
+        departures = list(ready)
+        for t in sorted(range(len(ready)), key=lambda t: (ready[t], t)):
+            if not free:
+                break
+            departure = max(ready[t], free[0])
+            back = finish(t, departure)
+            if back is None:
+                continue
+            departures[t] = departure
+            heapq.heapreplace(free, back)
+        return departures
+
+    def _push(self, when: int, kind: int, payload: object) -> None:
+        heapq.heappush(self._events, (when, kind, next(self._sequence), payload))
+
+    def run(self) -> None:
+        """Run every truck's route until all events are processed"""
+        for truck in self.trucks:
+            if truck.packages:
+                self._push(truck.clock, self.READY, truck)
+
+        debug = logger.isEnabledFor(logging.DEBUG)
+        while self._events:
+            when, kind, _, payload = heapq.heappop(self._events)
+            self.clock = when
+            self.event_count += 1
+
+            if kind == self.CALLBACK:
+                payload(when)
+            elif kind == self.READY:
+                if self._free_drivers == 0:
+                    self._waiting.append(payload)
+                    continue
+                self._free_drivers -= 1
+                self._depart(payload, when)
+            elif kind == self.ARRIVE:
+                truck, package, distance = payload
+                truck.mileage += distance
+                truck.current_address = package.address
+                truck.location_id = package.location_id
+                truck.clock = when
+                package.mark_delivered(when, truck.day)
+                self._queues[truck.truck_id].discard(package)
+                if debug:
+                    logger.debug("Truck %s delivered package %s at %s to %s",
+                                 truck.truck_id, package.package_id,
+                                 from_seconds(when, truck.day).strftime('%I:%M %p'),
+                                 package.address)
+                self._next_stop(truck, when)
+            elif kind == self.WAKE:
+                self._next_stop(payload, when)
+            else:
+                truck, distance = payload
+                truck.mileage += distance
+                truck.current_address = truck.HUB_ADDRESS
+                truck.location_id = truck.HUB_LOCATION_ID
+                truck.status = truck.STATUS_AT_HUB
+                truck.clock = when
+                if debug:
+                    logger.debug("Truck %s back at hub at %s, mileage %.1f",
+                                 truck.truck_id,
+                                 from_seconds(when, truck.day).strftime('%I:%M %p'),
+                                 truck.mileage)
+                # The driver takes the truck that has waited longest,
+                # before any truck that only becomes ready now
+                if self._waiting:
+                    self._depart(self._waiting.popleft(), when)
+                else:
+                    self._free_drivers += 1
+
+        logger.debug("Simulation finished after %s events", self.event_count)
+
+    def _depart(self, truck: Truck, now: int) -> None:
+        """Send a truck out with a driver"""
+        truck.clock = now
+        truck.status = truck.STATUS_EN_ROUTE
+        # (by ID: a package loaded twice is still one delivery)
+        remaining = list({
+            p.package_id: p for p in truck.packages if p.status != "Delivered"
+        }.values())
+        for package in remaining:
+            package.mark_en_route(now, truck.truck_id, truck.day)
+        self._queues[truck.truck_id] = ReleaseQueue(remaining)
+        self._next_stop(truck, now)
+
+    def _next_stop(self, truck: Truck, now: int) -> None:
+        """Schedule a truck's next arrival, wake-up or return to the hub"""
+        queue = self._queues[truck.truck_id]
+        if not queue:
+            self._return(truck, now)
+            return
+
+        route = self._routes.get(truck.truck_id)
+        while route and route[0].status == "Delivered":
+            route.popleft()
+        if route:
+            package = route[0]
+            if package.available_at > now:
+                # Wait where we are until the planned package is released
+                self._push(package.available_at, self.WAKE, truck)
+            else:
+                self._drive(truck, package, now)
+            return
+
+        queue.advance(now)
+        if not queue.available:
+            # Nothing deliverable yet: wait for the next release
+            self._push(queue.next_release(), self.WAKE, truck)
+            return
+
+        candidates = list(queue.available.values())
+
+        table = self.distance_table
+        position, distance = table.nearest(
+            truck.location_id,
+            [Truck._location_of(package, table) for package in candidates]
+        )
+        self._drive(truck, candidates[position], now)
+
+    def _drive(self, truck: Truck, package: Package, now: int) -> None:
+        """Schedule a truck's arrival at a package's location"""
+        table = self.distance_table
+        location_id = Truck._location_of(package, table)
+        distance = table.get_distance_by_index(truck.location_id, location_id)
+        travel = table.get_travel_time_by_index(truck.location_id, location_id, truck.SPEED)
+        self._push(now + travel, self.ARRIVE, (truck, package, distance))
+
+    def _return(self, truck: Truck, now: int) -> None:
+        """Schedule a truck's return to the hub"""
+        table = self.distance_table
+        distance = table.get_distance_by_index(truck.location_id, truck.HUB_LOCATION_ID)
+        travel = table.get_travel_time_by_index(truck.location_id, truck.HUB_LOCATION_ID, truck.SPEED)
+        self._push(now + travel, self.RETURN, (truck, distance))
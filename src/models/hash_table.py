@@ -1,16 +1,23 @@
 from typing import Optional, List, Tuple
 from .package import Package
+from .package_index import PackageIndex
 
 class HashTable:
     """
     A hash table implementation for storing and retrieving packages.
     Uses chaining for collision resolution.
+    Doubles its capacity whenever size / capacity would exceed
+    max_load_factor, so chains stay short and insert/lookup are
+    amortized O(1) as the manifest grows.
     """
-    def __init__(self, capacity: int = 40):
+    def __init__(self, capacity: int = 40, max_load_factor: float = 0.75):
         # Initializes empty table with given capacity
         self.capacity: int = capacity
         self.size: int = 0
+        self.max_load_factor: float = max_load_factor
         self.table: List[List[Tuple[int, Package]]] = [[] for _ in range(capacity)]
+        # Secondary indexes by status, deadline, truck, zip and location
+        self.index = PackageIndex()
 
     def _hash(self, key: int) -> int:
         """
@@ -42,12 +49,29 @@ class HashTable:
             if key == package_id:
                 # Update existing package
                 self.table[slot][i] = (package_id, package)
+                self.index.remove(existing_package)
+                self.index.add(package)
                 return
         
         # Add new package with all components
         self.table[slot].append((package_id, package))
+        self.index.add(package)
         self.size += 1
 
+        if self.size > self.capacity * self.max_load_factor:
+            self._resize(self.capacity * 2)
+
+    def _resize(self, new_capacity: int) -> None:
+        """
+        Rehash every entry into a table with new_capacity slots.
+        """
+        old_table = self.table
+        self.capacity = new_capacity
+        self.table = [[] for _ in range(new_capacity)]
+        for bucket in old_table:
+            for entry in bucket:
+                self.table[entry[0] % new_capacity].append(entry)
+
     def lookup(self, package_id: int) -> Optional[Package]:
         """
         Look up a package by its ID.
@@ -84,3 +108,102 @@ class HashTable:
             for key, package in bucket:
                 packages.append(package)
         return packages
+
+    def get_packages_by(self, field: str, value) -> List[Package]:
+        """
+        Get packages by an indexed field (see PackageIndex.FIELDS).
+        Example:
+            table.get_packages_by("truck_id", 2)
+        """
+        return self.index.find(field, value)
+
+
+class OpenAddressingHashTable:
+    """
+    A hash table for packages using open addressing with linear probing.
+    Keys and values live in two flat parallel lists instead of a list of
+    chains of tuples, so there is no per-entry container overhead.
+    Capacity is a power of two (slot = key & mask) and doubles when
+    size / capacity would exceed max_load_factor.
+    Same interface as HashTable.
+    """
+    def __init__(self, capacity: int = 64, max_load_factor: float = 0.66):
+        # Round capacity up to a power of two
+        self.capacity: int = 1 << max(capacity - 1, 1).bit_length()
+        self.size: int = 0
+        self.max_load_factor: float = max_load_factor
+        self.keys: List[Optional[int]] = [None] * self.capacity
+        self.values: List[Optional[Package]] = [None] * self.capacity
+        # Secondary indexes by status, deadline, truck, zip and location
+        self.index = PackageIndex()
+
+    def _find_slot(self, package_id: int) -> int:
+        """
+        Get the slot holding package_id, or the empty slot where it belongs.
+        """
+        mask = self.capacity - 1
+        keys = self.keys
+        slot = hash(package_id) & mask
+        while keys[slot] is not None and keys[slot] != package_id:
+            slot = (slot + 1) & mask
+        return slot
+
+    def insert(self, package_id: int, package: Package) -> None:
+        """
+        Insert a package into the hash table using package_id as the key.
+        Replaces the package if package_id is already present.
+        Args:
+            package_id: The unique ID of the package
+            package: The Package object containing all delivery data
+        """
+        slot = self._find_slot(package_id)
+        if self.keys[slot] is None:
+            self.keys[slot] = package_id
+            self.size += 1
+        else:
+            self.index.remove(self.values[slot])
+        self.values[slot] = package
+        self.index.add(package)
+
+        if self.size > self.capacity * self.max_load_factor:
+            self._resize(self.capacity * 2)
+
+    def _resize(self, new_capacity: int) -> None:
+        """
+        Reinsert every entry into arrays with new_capacity slots.
+        """
+        old_keys, old_values = self.keys, self.values
+        self.capacity = new_capacity
+        self.keys = [None] * new_capacity
+        self.values = [None] * new_capacity
+        for key, package in zip(old_keys, old_values):
+            if key is not None:
+                slot = self._find_slot(key)
+                self.keys[slot] = key
+                self.values[slot] = package
+
+    def lookup(self, package_id: int) -> Optional[Package]:
+        """
+        Look up a package by its ID.
+        Args:
+            package_id: The ID of the package to find
+        Returns:
+            The Package, or None if not found
+        """
+        return self.values[self._find_slot(package_id)]
+
+    def get_all_packages(self) -> List[Package]:
+        """
+        Get all packages in the hash table.
+        Returns:
+            List of all Package objects in the hash table
+        """
+        return [package for package in self.values if package is not None]
+
+    def get_packages_by(self, field: str, value) -> List[Package]:
+        """
+        Get packages by an indexed field (see PackageIndex.FIELDS).
+        Example:
+            table.get_packages_by("truck_id", 2)
+        """
+        return self.index.find(field, value)
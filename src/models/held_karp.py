@@ -0,0 +1,172 @@
+from typing import List, Optional
+from .local_search import improve_route
+from .route_problem import RouteProblem
+
+# Largest number of stops solved exactly by default: a full truck
+# (a Truck's MAX_CAPACITY). The DP does O(2^n * n^2) work in pure Python, but
+# pruning keeps it to about 0.15 s at 15 stops and 0.3 s at 16.
+EXACT_ROUTE_LIMIT = 16
+
+
+def held_karp(problem: RouteProblem) -> Optional[List[int]]:
+    """
+    Shortest stop order that meets every deadline (Held-Karp bitmask DP).
+    State (visited set, last stop) keeps the shortest distance to reach
+    it, with the earliest clock as a tie-break. Extensions that would
+    arrive after the next stop's deadline are pruned, as are states from
+    which some unvisited stop can no longer be reached in time. Without
+    release-time waits this is exact; with waits, a slightly longer but
+    earlier partial route can be dropped, so it is exact over the routes
+    the DP keeps. States that cannot beat a heuristic route (nearest
+    neighbor plus local search) are pruned too.
+    Args:
+        problem: Route problem for one truck
+    Returns:
+        Stop order (1..size), or None if no order meets every deadline
+    """
+    n = problem.size
+    if n == 0:
+        return []
+
+    inf = float("inf")
+    full = 1 << n
+    # Flat tables indexed by mask * n + last; bit k is stop k + 1
+    dist = [inf] * (full * n)
+    clock = [0] * (full * n)
+    parent = [-1] * (full * n)
+
+    distance, travel = problem.distance, problem.travel
+    release = problem.release[1:]
+    deadline = problem.deadline[1:]
+    distance_from = [row[1:] for row in distance]
+    travel_from = [row[1:] for row in travel]
+    bits = [1 << k for k in range(n)]
+
+    # Latest clock at a stop from which each other stop can still make its
+    # deadline. Uses shortest-path travel times: the table does not obey
+    # the triangle inequality, so a detour can be faster than the direct leg.
+    fastest = [row[:] for row in travel]
+    for via in range(n + 1):
+        for i in range(n + 1):
+            through = fastest[i][via]
+            row = fastest[i]
+            for j in range(n + 1):
+                if through + fastest[via][j] < row[j]:
+                    row[j] = through + fastest[via][j]
+    latest = [[deadline[k] - fastest[j][k + 1] for k in range(n)] for j in range(n + 1)]
+    longest = max(max(row) for row in fastest)
+
+    for k in range(n):
+        arrive = max(problem.start, release[k]) + travel_from[0][k]
+        if arrive <= deadline[k]:
+            dist[bits[k] * n + k] = distance_from[0][k]
+            clock[bits[k] * n + k] = arrive
+
+    # Offset from a state to its extension by stop k: mask * n + last moves
+    # to (mask | bit k) * n + k
+    step = [bits[k] * n + k for k in range(n)]
+    # Slowest leg out of each stop, for the fast path below
+    slowest = [max(row) for row in travel_from]
+
+    # Set bits of a mask come from two lookup tables, one per half of the
+    # mask, instead of testing every bit of every mask
+    low = n // 2
+    low_mask = (1 << low) - 1
+    low_stops = _subsets(range(low))
+    high_stops = _subsets(range(low, n))
+    # Tightest deadline and latest release over each half's subsets
+    low_deadline = [min([deadline[k] for k in ks], default=inf) for ks in low_stops]
+    high_deadline = [min([deadline[k] for k in ks], default=inf) for ks in high_stops]
+    low_release = [max([release[k] for k in ks], default=0) for ks in low_stops]
+    high_release = [max([release[k] for k in ks], default=0) for ks in high_stops]
+
+    # Branch and bound: a heuristic route that meets every deadline caps
+    # the distance. The rest of a route from a state is a path from its
+    # stop through every unvisited stop to the hub; each unvisited stop
+    # has two of its legs, the ends one each, and each leg touches two
+    # locations, so the path is at least half the sum of those locations'
+    # shortest legs. States that cannot beat the cap are dropped.
+    heuristic = improve_route(problem, problem.nearest_neighbor_order(), time_limit=None)
+    cost = problem.evaluate(heuristic)
+    cap = cost.distance + 1e-9 if not cost.lateness else inf
+    shortest = [sorted(d for i, d in enumerate(row) if i != j)[:2] for j, row in enumerate(distance)]
+    end_leg = [legs[0] / 2 for legs in shortest]
+    both_legs = [sum(legs) / 2 for legs in shortest]
+    low_legs = [sum(both_legs[k + 1] for k in ks) for ks in low_stops]
+    high_legs = [sum(both_legs[k + 1] for k in ks) for ks in high_stops]
+    cap -= end_leg[0]
+
+    for mask in range(1, full - 1):
+        base = mask * n
+        rest = ~mask
+        low_rest, high_rest = rest & low_mask, (rest & (full - 1)) >> low
+        unvisited = low_stops[low_rest] + high_stops[high_rest]
+        # A state whose clock is past every unvisited release, and that can
+        # reach any unvisited stop by the tightest deadline, extends with
+        # no per-stop time checks
+        tightest = min(low_deadline[low_rest], high_deadline[high_rest])
+        released = max(low_release[low_rest], high_release[high_rest])
+        room = cap - low_legs[low_rest] - high_legs[high_rest]
+        for j in low_stops[mask & low_mask] + high_stops[mask >> low]:
+            index = base + j
+            d = dist[index]
+            if d + end_leg[j + 1] > room:
+                continue
+            t = clock[index]
+            row_d, row_t = distance_from[j + 1], travel_from[j + 1]
+
+            # Prune: every unvisited stop must still be reachable in time
+            if t > tightest - longest:
+                row_latest = latest[j + 1]
+                if any(t > row_latest[k] for k in unvisited):
+                    continue
+
+            if t >= released and t + slowest[j + 1] <= tightest:
+                for k in unvisited:
+                    nd = d + row_d[k]
+                    target = base + step[k]
+                    old = dist[target]
+                    if nd < old or (nd == old and t + row_t[k] < clock[target]):
+                        dist[target] = nd
+                        clock[target] = t + row_t[k]
+                        parent[target] = j
+                continue
+
+            for k in unvisited:
+                r = release[k]
+                arrive = (t if t > r else r) + row_t[k]
+                if arrive > deadline[k]:
+                    continue
+                nd = d + row_d[k]
+                target = base + step[k]
+                if nd < dist[target] or (nd == dist[target] and arrive < clock[target]):
+                    dist[target] = nd
+                    clock[target] = arrive
+                    parent[target] = j
+
+    # Close the tour back at the hub
+    base = (full - 1) * n
+    best, last = inf, -1
+    for j in range(n):
+        total = dist[base + j] + distance[j + 1][0]
+        if total < best:
+            best, last = total, j
+    if last < 0:
+        # Every route was pruned: none beats the heuristic one
+        return None if cost.lateness else heuristic
+
+    order = []
+    mask = full - 1
+    while last >= 0:
+        order.append(last + 1)
+        last, mask = parent[mask * n + last], mask & ~bits[last]
+    order.reverse()
+    return order
+
+
+def _subsets(stops: range) -> List[List[int]]:
+    """Stops in each subset of a range of stops, indexed by bitmask (bit 0 = first)"""
+    subsets = [[]]
+    for stop in stops:
+        subsets += [subset + [stop] for subset in subsets]
+    return subsets
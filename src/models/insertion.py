@@ -0,0 +1,100 @@
+from typing import List, Optional, Set, Tuple
+from .route_problem import RouteProblem
+
+
+class _Schedule:
+    """
+    Arrival times and forward slack along a route (hub, stops..., hub).
+    Timing follows RouteProblem.evaluate: the truck waits where it is
+    until the next stop is released, then drives. For position i:
+    - arrive[i]: clock on arrival
+    - wait[i]: time spent at i waiting for the next stop's release
+    - slack[i]: how far arrive[i] can be pushed back without any stop
+      from i on missing its deadline. A push of d at i reaches i + 1 as
+      max(0, d - wait[i]), so slack[i] = min(deadline - arrive[i],
+      wait[i] + slack[i + 1]).
+    """
+
+    def __init__(self, problem: RouteProblem, route: List[int]):
+        travel, release, deadline = problem.travel, problem.release, problem.deadline
+        arrive = [problem.start]
+        wait = []
+        for here, stop in zip(route, route[1:]):
+            leave = max(arrive[-1], release[stop])
+            wait.append(leave - arrive[-1])
+            arrive.append(leave + travel[here][stop])
+        wait.append(0)
+
+        slack = [0] * len(route)
+        slack[-1] = float("inf")  # back at the hub
+        for i in range(len(route) - 2, -1, -1):
+            slack[i] = min(deadline[route[i]] - arrive[i], wait[i] + slack[i + 1])
+        self.arrive = arrive
+        self.slack = slack
+
+
+def cheapest_insertion(problem: RouteProblem) -> List[int]:
+    """
+    Build a stop order by cheapest feasible insertion.
+    Starting from an empty route, repeatedly insert the (stop, position)
+    pair that adds the fewest miles without making any stop late. Each
+    candidate's feasibility is checked in O(1) from the route's forward
+    slack: the new stop must make its own deadline, and the delay it
+    pushes onto the next stop must fit in that stop's slack. Slack is
+    recomputed (O(n)) only after each insertion. Stops that cannot be
+    inserted on time anywhere are placed where they add the least
+    lateness.
+    Args:
+        problem: Route problem for one truck
+    Returns:
+        Stop order (1..size)
+    """
+    distance, travel = problem.distance, problem.travel
+    release, deadline = problem.release, problem.deadline
+    route = [0, 0]
+    schedule = _Schedule(problem, route)
+    unrouted = set(range(1, problem.size + 1))
+
+    while unrouted:
+        best: Optional[Tuple[float, int, int]] = None
+        for stop in sorted(unrouted):
+            row_d, row_t = distance[stop], travel[stop]
+            for i in range(len(route) - 1):
+                here, after = route[i], route[i + 1]
+                added = distance[here][stop] + row_d[after] - distance[here][after]
+                if best is not None and added >= best[0]:
+                    continue
+                arrive = max(schedule.arrive[i], release[stop]) + travel[here][stop]
+                if arrive > deadline[stop]:
+                    continue
+                next_arrive = max(arrive, release[after]) + row_t[after]
+                if next_arrive - schedule.arrive[i + 1] > schedule.slack[i + 1]:
+                    continue
+                best = (added, stop, i + 1)
+
+        if best is None:
+            stop, position = _least_late(problem, route, unrouted)
+        else:
+            _, stop, position = best
+        route.insert(position, stop)
+        unrouted.discard(stop)
+        schedule = _Schedule(problem, route)
+
+    return route[1:-1]
+
+
+def _least_late(problem: RouteProblem, route: List[int], unrouted: Set[int]) -> Tuple[int, int]:
+    """
+    Pick the stop with the earliest deadline and the position where it
+    adds the least lateness (then fewest miles). Used when no stop fits
+    on time.
+    """
+    stop = min(unrouted, key=lambda s: (problem.deadline[s], s))
+    best = None
+    for position in range(1, len(route)):
+        candidate = route[:position] + [stop] + route[position:]
+        cost = problem.evaluate(candidate[1:-1])
+        key = (cost.lateness, cost.distance)
+        if best is None or key < best[0]:
+            best = (key, position)
+    return stop, best[1]
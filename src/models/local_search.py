@@ -0,0 +1,124 @@
+import time
+from typing import List, Optional, Sequence
+from .route_problem import RouteProblem
+
+# Default wall-clock budget for improving one route, in seconds
+IMPROVE_TIME_LIMIT = 0.1
+# Longest run of stops Or-opt moves as one segment
+OR_OPT_SEGMENT = 3
+# Ignore distance gains smaller than this (float noise)
+EPSILON = 1e-9
+
+
+def improve_route(problem: RouteProblem, order: Sequence[int],
+                  time_limit: Optional[float] = IMPROVE_TIME_LIMIT) -> List[int]:
+    """
+    Shorten a stop order with 2-opt and Or-opt moves.
+    Each move's distance change is computed in O(1) from the four to six
+    edges it touches (the distance table is symmetric, so reversing a
+    segment does not change its inside). Routes are compared by lateness
+    first, then distance: a shorter move is timed with
+    RouteProblem.evaluate and kept only if it adds no lateness, so
+    deadlines and release waits that the starting order meets stay met.
+    While the route is late, every move is timed and any move that cuts
+    lateness is kept, even if it is longer. Runs until no move improves
+    (a local optimum) or the time limit is reached.
+    Args:
+        problem: Route problem the order belongs to
+        order: Starting stop order (e.g. nearest neighbor)
+        time_limit: Seconds to spend at most (None for no limit)
+    Returns:
+        Improved stop order
+    """
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    tour = [0] + list(order) + [0]
+    lateness = problem.evaluate(tour[1:-1]).lateness
+
+    improved = True
+    while improved:
+        improved = False
+        for move in (_two_opt, _or_opt):
+            candidate = move(problem, tour, lateness, deadline)
+            if candidate is not None:
+                tour, lateness = candidate
+                improved = True
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+    return tour[1:-1]
+
+
+def _accept(problem: RouteProblem, tour: List[int], lateness: int, shorter: bool):
+    """Time a candidate tour; return (tour, lateness) if it is better"""
+    cost = problem.evaluate(tour[1:-1])
+    if cost.lateness < lateness or (shorter and cost.lateness == lateness):
+        return tour, cost.lateness
+    return None
+
+
+def _two_opt(problem: RouteProblem, tour: List[int], lateness: int,
+             deadline: Optional[float]):
+    """
+    First improving 2-opt move: replace edges (a, b) and (c, d) with
+    (a, c) and (b, d), reversing the stops from b to c.
+    """
+    distance = problem.distance
+    last = len(tour) - 1
+    for i in range(last - 2):
+        a, b = tour[i], tour[i + 1]
+        row_a, row_b = distance[a], distance[b]
+        removed_ab = row_a[b]
+        for j in range(i + 2, last):
+            c, d = tour[j], tour[j + 1]
+            shorter = row_a[c] + row_b[d] - removed_ab - distance[c][d] < -EPSILON
+            if shorter or lateness:
+                candidate = tour[:i + 1] + tour[j:i:-1] + tour[j + 1:]
+                accepted = _accept(problem, candidate, lateness, shorter)
+                if accepted is not None:
+                    return accepted
+        if deadline is not None and time.perf_counter() > deadline:
+            return None
+    return None
+
+
+def _or_opt(problem: RouteProblem, tour: List[int], lateness: int,
+            deadline: Optional[float]):
+    """
+    First improving Or-opt move: take a run of 1 to OR_OPT_SEGMENT stops
+    out of the route and put it back between two other stops, in either
+    direction.
+    """
+    distance = problem.distance
+    last = len(tour) - 1
+    for length in range(1, OR_OPT_SEGMENT + 1):
+        for i in range(1, last - length + 1):
+            j = i + length - 1  # segment is tour[i..j]
+            prev, first, end, after = tour[i - 1], tour[i], tour[j], tour[j + 1]
+            # Gain from closing the gap the segment leaves
+            gain = distance[prev][first] + distance[end][after] - distance[prev][after]
+            if gain <= EPSILON and not lateness:
+                continue
+            segment = tour[i:j + 1]
+            rest = tour[:i] + tour[j + 1:]
+            for k in range(len(rest) - 1):
+                u, v = rest[k], rest[k + 1]
+                if k == i - 1:
+                    continue  # same place it came from
+                row_u, row_v = distance[u], distance[v]
+                base = row_u[v]
+                forward = row_u[first] + distance[end][v] - base
+                backward = row_u[end] + row_v[first] - base
+                shorter = forward - gain < -EPSILON
+                if shorter or lateness:
+                    candidate = rest[:k + 1] + segment + rest[k + 1:]
+                    accepted = _accept(problem, candidate, lateness, shorter)
+                    if accepted is not None:
+                        return accepted
+                shorter = backward - gain < -EPSILON
+                if length > 1 and (shorter or lateness):
+                    candidate = rest[:k + 1] + segment[::-1] + rest[k + 1:]
+                    accepted = _accept(problem, candidate, lateness, shorter)
+                    if accepted is not None:
+                        return accepted
+            if deadline is not None and time.perf_counter() > deadline:
+                return None
+    return None
@@ -0,0 +1,79 @@
+import re
+from typing import Any, Dict, List, Optional
+
+
+class LocationRegistry:
+    """
+    Maps address spellings to canonical integer location IDs.
+    Every alias is normalized once when it is registered, so lookups are a
+    single dict hit. Normalization:
+    - Lowercase, punctuation removed (except '#'), whitespace collapsed
+    - Direction and street words abbreviated ("South" -> "s", "Station" -> "sta")
+    """
+
+    _ABBREVIATIONS = {
+        "north": "n", "south": "s", "east": "e", "west": "w",
+        "street": "st", "avenue": "ave", "boulevard": "blvd",
+        "road": "rd", "station": "sta",
+    }
+    _PUNCTUATION = re.compile(r"[^\w\s#]")
+
+    def __init__(self):
+        # Display label for each location ID
+        self.labels: List[str] = []
+        # Normalized alias -> location ID
+        self._ids: Dict[str, int] = {}
+
+    @classmethod
+    def normalize(cls, address: str) -> str:
+        """Convert an address to its canonical lookup key"""
+        words = cls._PUNCTUATION.sub(" ", address.lower()).split()
+        return " ".join(cls._ABBREVIATIONS.get(word, word) for word in words)
+
+    def add(self, label: str, *aliases: str) -> int:
+        """
+        Register a new location.
+        Args:
+            label: Display name of the location
+            aliases: Other spellings (e.g. street address) for the same location
+        Returns:
+            The new location ID
+        """
+        location_id = len(self.labels)
+        self.labels.append(label)
+        for alias in (label,) + aliases:
+            key = self.normalize(alias)
+            # First registration wins if two locations share an alias
+            if key and key not in self._ids:
+                self._ids[key] = location_id
+        return location_id
+
+    def get_id(self, address: str) -> Optional[int]:
+        """Get the location ID for an address, or None if unknown"""
+        return self._ids.get(self.normalize(address))
+
+    def resolve(self, address: str) -> int:
+        """
+        Get the location ID for an address.
+        Raises:
+            ValueError: If the address does not match any registered location
+        """
+        location_id = self.get_id(address)
+        if location_id is None:
+            raise ValueError(f"Unknown address: {address!r}")
+        return location_id
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a JSON-serializable copy of the registry"""
+        return {"labels": list(self.labels), "aliases": dict(self._ids)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LocationRegistry":
+        """Rebuild a registry saved with to_dict (keys are already normalized)"""
+        registry = cls()
+        registry.labels = list(data["labels"])
+        registry._ids = {key: int(location_id) for key, location_id in data["aliases"].items()}
+        return registry
+
+    def __len__(self) -> int:
+        return len(self.labels)
@@ -1,8 +1,22 @@
-from datetime import datetime, time
-from typing import List, Optional
+from datetime import date, datetime, time
+from typing import Optional, Sequence, Union
+from .time_utils import (ADDRESS_CORRECTION_SECONDS, from_seconds, parse_deadline,
+                         to_minutes, to_seconds)
 
 
 class Package:
+    # Fixed attribute set: no per-instance __dict__, which matters when
+    # holding millions of packages
+    __slots__ = (
+        "package_id", "address", "original_address", "corrected_address",
+        "_deadline", "deadline_minutes", "city", "zip_code", "original_zip", "corrected_zip",
+        "weight", "location_id",
+        "status", "delivery_seconds", "departure_seconds", "service_date",
+        "special_notes", "truck_id",
+        "_delayed_until", "_required_truck", "grouped_with", "_wrong_address",
+        "available_at", "indexes",
+    )
+
     def __init__(self, package_id: int, address: str, deadline: str,
                  city: str, zip_code: str, weight: str):
         # Core package data
@@ -10,81 +24,223 @@ class Package:
         self.address = address
         self.original_address = address
         self.corrected_address = None
-        self.deadline = self._parse_deadline(deadline) 
+        # (the deadline setter keeps deadline_minutes, the same deadline
+        # as minutes since midnight, in step for cheap comparisons)
+        self._deadline = self._parse_deadline(deadline)
+        self.deadline_minutes = to_minutes(self._deadline)
         self.city = city
         self.zip_code = zip_code
         self.original_zip = zip_code  
         self.corrected_zip = None         
         self.weight = weight
+        # Canonical location ID (distance table index), set at load time
+        self.location_id: Optional[int] = None
 
         # Status and Tracking
         self.status = "At Hub"
-        self.delivery_time = None
-        self.departure_time = None
+        # Simulation clock values (seconds since midnight on service_date);
+        # delivery_time / departure_time give them as datetimes
+        self.delivery_seconds: Optional[int] = None
+        self.departure_seconds: Optional[int] = None
+        self.service_date: Optional[date] = None
         self.special_notes = None
         self.truck_id = None
         
         # special handling attributes
-        self.delayed_until = None
-        self.required_truck = None
-        self.grouped_with: List[int] = []
-        self.wrong_address = False
+        # (delayed_until and wrong_address keep available_at up to date;
+        # they and required_truck report changes to subscribed indexes)
+        self._delayed_until: Optional[time] = None
+        self._wrong_address = False
+        # Earliest clock value (seconds since midnight) the package can
+        # leave the hub: delayed arrival or the 10:20 address correction
+        self.available_at = 0
+        self._required_truck: Optional[int] = None
+        # (shared empty tuple until the package is actually grouped)
+        self.grouped_with: Sequence[int] = ()
+
+        # Secondary indexes (PackageIndex) to notify when fields change
+        self.indexes: tuple = ()
+
+    def _reindex(self, field: str, old_value) -> None:
+        """Tell every index this package is in that a field changed"""
+        for index in self.indexes:
+            index.update(self, field, old_value)
+
+    @property
+    def deadline(self) -> time:
+        """Delivery deadline (time of day)"""
+        return self._deadline
+
+    @deadline.setter
+    def deadline(self, value: time) -> None:
+        old_deadline = self._deadline
+        self._deadline = value
+        self.deadline_minutes = to_minutes(value)
+        if self.indexes and value != old_deadline:
+            self._reindex("deadline", old_deadline)
+
+    @property
+    def required_truck(self) -> Optional[int]:
+        """Truck the package must be loaded on, if any"""
+        return self._required_truck
+
+    @required_truck.setter
+    def required_truck(self, value: Optional[int]) -> None:
+        old_truck = self._required_truck
+        self._required_truck = value
+        if self.indexes and value != old_truck:
+            self._reindex("required_truck", old_truck)
+
+    @property
+    def delayed_until(self) -> Optional[time]:
+        """Time the package arrives at the hub, if delayed"""
+        return self._delayed_until
+
+    @delayed_until.setter
+    def delayed_until(self, value: Optional[time]) -> None:
+        self._delayed_until = value
+        self._update_available_at()
+
+    @property
+    def wrong_address(self) -> bool:
+        """True if the listed address is wrong until the 10:20 correction"""
+        return self._wrong_address
 
-    def mark_en_route(self, departure_time: datetime, truck_id: int) -> None:
+    @wrong_address.setter
+    def wrong_address(self, value: bool) -> None:
+        self._wrong_address = value
+        self._update_available_at()
+
+    def _update_available_at(self) -> None:
+        """Recompute available_at and tell subscribed indexes if it changed"""
+        available_at = 0
+        if self._delayed_until:
+            available_at = to_seconds(self._delayed_until)
+        if self._wrong_address:
+            available_at = max(available_at, ADDRESS_CORRECTION_SECONDS)
+        old_available_at = self.available_at
+        self.available_at = available_at
+        if self.indexes and available_at != old_available_at:
+            self._reindex("available_at", old_available_at)
+
+    @property
+    def delivery_time(self) -> Optional[datetime]:
+        """Delivery time as a datetime (None until delivered)"""
+        if self.delivery_seconds is None:
+            return None
+        return from_seconds(self.delivery_seconds, self.service_date)
+
+    @property
+    def departure_time(self) -> Optional[datetime]:
+        """Departure time as a datetime (None until loaded)"""
+        if self.departure_seconds is None:
+            return None
+        return from_seconds(self.departure_seconds, self.service_date)
+
+    def _clock(self, when: Union[int, datetime], day: Optional[date]) -> int:
+        """Get a clock value in seconds, remembering the service date"""
+        if isinstance(when, datetime):
+            self.service_date = when.date()
+            return to_seconds(when)
+        if day is not None:
+            self.service_date = day
+        return when
+
+    def mark_en_route(self, departure_time: Union[int, datetime], truck_id: int,
+                      day: Optional[date] = None) -> None:
+        """
+        Args:
+            departure_time: datetime, or seconds since midnight on day
+            truck_id: Truck the package is loaded on
+            day: Service date for a seconds value
+        """
+        old_status, old_truck = self.status, self.truck_id
         self.status = "En Route"
-        self.departure_time = departure_time
+        self.departure_seconds = self._clock(departure_time, day)
         self.truck_id = truck_id
+        if self.indexes:
+            self._reindex("status", old_status)
+            self._reindex("truck_id", old_truck)
 
-    def mark_delivered(self, delivery_time: datetime) -> None:
+    def mark_delivered(self, delivery_time: Union[int, datetime],
+                       day: Optional[date] = None) -> None:
+        """
+        Args:
+            delivery_time: datetime, or seconds since midnight on day
+            day: Service date for a seconds value
+        """
+        old_status = self.status
         self.status = "Delivered"
-        self.delivery_time = delivery_time
+        self.delivery_seconds = self._clock(delivery_time, day)
+        if self.indexes:
+            self._reindex("status", old_status)
 
-    def update_address(self, new_address: str, current_time: datetime) -> None:
-        """Store the corrected address but only use it after 10:20 AM"""
+    def update_address(self, new_address: str, current_time: Union[int, datetime],
+                       location_id: Optional[int] = None) -> None:
+        """
+        Store the corrected address but only use it after 10:20 AM.
+        Args:
+            new_address: Corrected address
+            current_time: Time the correction is made (datetime, or
+                seconds since midnight)
+            location_id: Location ID of new_address; required once the
+                package has a location ID (interned at load time)
+        Raises:
+            ValueError: If an interned package gets no location ID, which
+                would otherwise leave it at its old location or none
+        """
+        if location_id is None and self.location_id is not None:
+            raise ValueError(
+                f"Package {self.package_id} has a location ID; "
+                f"pass the location ID of {new_address!r}"
+            )
         self.corrected_address = new_address
-        if current_time.time() >= time(10, 20):
+        if to_seconds(current_time) >= ADDRESS_CORRECTION_SECONDS:
+            old_location = self.location_id
             self.address = new_address
+            self.location_id = location_id
             self.special_notes = f"Address updated at {current_time}"
+            if self.indexes:
+                self._reindex("location_id", old_location)
 
-    def update_zip(self, new_zip: str, current_time: datetime) -> None:
+    def update_zip(self, new_zip: str, current_time: Union[int, datetime]) -> None:
         """Store the corrected zip but only use it after 10:20 AM"""
         self.corrected_zip = new_zip
-        if current_time.time() >= time(10, 20):
+        if to_seconds(current_time) >= ADDRESS_CORRECTION_SECONDS:
+            old_zip = self.zip_code
             self.zip_code = new_zip
+            if self.indexes:
+                self._reindex("zip_code", old_zip)
 
-    def get_current_address(self, current_time: datetime) -> str:
+    def get_current_address(self, current_time: Union[int, datetime]) -> str:
         """Get the appropriate address based on the current time"""
         if self.wrong_address:
-            if current_time.time() >= time(10, 20) and self.corrected_address:
+            if to_seconds(current_time) >= ADDRESS_CORRECTION_SECONDS and self.corrected_address:
                 return self.corrected_address
             return self.original_address
         return self.address
     
-    def get_current_zip(self, current_time: datetime) -> str:
+    def get_current_zip(self, current_time: Union[int, datetime]) -> str:
         """Get the appropriate zip code based on the current time"""
         if self.wrong_address:
-            if current_time.time() >= time(10, 20) and self.corrected_zip:
+            if to_seconds(current_time) >= ADDRESS_CORRECTION_SECONDS and self.corrected_zip:
                 return self.corrected_zip
             return self.original_zip
         return self.zip_code
 
     def _parse_deadline(self, deadline: str) -> time:
-        """Convert deadline string to time object"""
-        if deadline == "EOD":
-            return time(17, 0) 
-        try:
-            return datetime.strptime(deadline, "%I:%M %p").time()
-        except ValueError:
-            return time(17, 0) 
-        
-    def can_be_loaded(self, current_time: datetime, truck_id: int) -> bool:
-        """Check if package can be loaded on truck"""
-        # Check if delayed
-        if self.delayed_until and current_time.time() < self.delayed_until:
-            return False
-            
-        # Check if wrong address not fixed
-        if self.wrong_address and current_time.time() < time(10, 20):
+        """Convert deadline string to time object (cached per string)"""
+        return parse_deadline(deadline)
+
+
+    def can_be_loaded(self, current_time: Union[int, time, datetime], truck_id: int) -> bool:
+        """
+        Check if package can be loaded on truck.
+        current_time may be a datetime, a time or a clock value (seconds
+        since midnight, e.g. Truck.clock).
+        """
+        # Check if delayed or wrong address not fixed yet
+        if to_seconds(current_time) < self.available_at:
             return False
             
         # Check truck restriction
@@ -0,0 +1,103 @@
+from array import array
+from datetime import time
+from typing import Any, Dict, List
+from .package import Package
+from .time_utils import to_seconds
+
+
+class PackageColumns:
+    """
+    Columnar copy of the package fields used for filtering.
+    One compact int array per field, one row per package:
+    - package_id
+    - location_id (-1 if not resolved)
+    - deadline (seconds since midnight)
+    - release (seconds since midnight the package can leave the hub:
+      delayed arrival or address correction, 0 if none)
+    - required_truck (0 if any truck)
+    - status (STATUS_CODES)
+    - truck_id (0 if not loaded)
+
+    Filters zip over the int columns they need, so each row costs a couple
+    of small-int comparisons instead of a method call on a Package that
+    builds and compares datetime.time values. The store subscribes to each
+    package like a PackageIndex, so status, truck, location, release,
+    required truck and deadline changes made through Package methods and
+    properties are mirrored here.
+    """
+
+    STATUS_CODES = {"At Hub": 0, "En Route": 1, "Delivered": 2}
+
+    def __init__(self):
+        self.package_id = array("i")
+        self.location_id = array("i")
+        self.deadline = array("i")
+        self.release = array("i")
+        self.required_truck = array("i")
+        self.status = array("b")
+        self.truck_id = array("i")
+        # Row -> Package, and package_id -> row
+        self.packages: List[Package] = []
+        self._rows: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.packages)
+
+    def add(self, package: Package) -> None:
+        """Append a row for a package and subscribe to its changes"""
+        self._rows[package.package_id] = len(self.packages)
+        self.packages.append(package)
+        self.package_id.append(package.package_id)
+        self.location_id.append(-1 if package.location_id is None else package.location_id)
+        self.deadline.append(package.deadline_minutes * 60)
+        self.release.append(package.available_at)
+        self.required_truck.append(package.required_truck or 0)
+        self.status.append(self.STATUS_CODES[package.status])
+        self.truck_id.append(package.truck_id or 0)
+        package.indexes += (self,)
+
+    def detach(self) -> None:
+        """Unsubscribe from every package (the store stops updating)"""
+        for package in self.packages:
+            package.indexes = tuple(index for index in package.indexes if index is not self)
+
+    def update(self, package: Package, field: str, old_value: Any) -> None:
+        """Mirror a field change reported by a package"""
+        row = self._rows[package.package_id]
+        if field == "status":
+            self.status[row] = self.STATUS_CODES[package.status]
+        elif field == "truck_id":
+            self.truck_id[row] = package.truck_id or 0
+        elif field == "location_id":
+            self.location_id[row] = -1 if package.location_id is None else package.location_id
+        elif field == "available_at":
+            self.release[row] = package.available_at
+        elif field == "required_truck":
+            self.required_truck[row] = package.required_truck or 0
+        elif field == "deadline":
+            self.deadline[row] = package.deadline_minutes * 60
+
+    def available(self, current_time: time, truck_id: int) -> List[Package]:
+        """
+        Get packages that can be loaded on a truck at a time
+        (same rules as Package.can_be_loaded).
+        Args:
+            current_time: time, datetime or seconds since midnight
+            truck_id: Truck that would load the packages
+        """
+        now = to_seconds(current_time)
+        return [
+            package for package, release, required
+            in zip(self.packages, self.release, self.required_truck)
+            if release <= now and (required == 0 or required == truck_id)
+        ]
+
+    def due_by(self, deadline: time) -> List[Package]:
+        """Get packages with a deadline at or before the given time"""
+        limit = to_seconds(deadline)
+        return [package for package, due in zip(self.packages, self.deadline) if due <= limit]
+
+    def with_status(self, status: str) -> List[Package]:
+        """Get packages with the given status"""
+        code = self.STATUS_CODES[status]
+        return [package for package, value in zip(self.packages, self.status) if value == code]
@@ -0,0 +1,80 @@
+from typing import Any, Dict, List
+from .package import Package
+
+
+class PackageIndex:
+    """
+    Secondary indexes over a package store.
+    Keeps, for each indexed field, a map of value -> packages with that
+    value, so a query costs O(result size) instead of a scan of every
+    package. Packages report their own changes: mark_en_route,
+    mark_delivered, update_address, update_zip and the deadline,
+    required_truck, delayed_until and wrong_address setters call update()
+    on every index the package has been added to.
+
+    Indexed fields:
+    - status (At Hub, En Route, Delivered)
+    - deadline (datetime.time)
+    - truck_id
+    - zip_code
+    - location_id
+    """
+
+    FIELDS = ("status", "deadline", "truck_id", "zip_code", "location_id")
+
+    def __init__(self):
+        # field -> value -> {package_id: package} (dict as an ordered set)
+        self._buckets: Dict[str, Dict[Any, Dict[int, Package]]] = {
+            field: {} for field in self.FIELDS
+        }
+
+    def add(self, package: Package) -> None:
+        """Index a package and subscribe to its changes"""
+        for field in self.FIELDS:
+            self._buckets[field].setdefault(getattr(package, field), {})[package.package_id] = package
+        package.indexes += (self,)
+
+    def remove(self, package: Package) -> None:
+        """Drop a package from every index and unsubscribe"""
+        for field in self.FIELDS:
+            self._discard(field, getattr(package, field), package.package_id)
+        package.indexes = tuple(index for index in package.indexes if index is not self)
+
+    def update(self, package: Package, field: str, old_value: Any) -> None:
+        """
+        Move a package to the bucket for its current value of field.
+        Args:
+            package: The package that changed
+            field: Name of the changed attribute
+            old_value: Value of the attribute before the change
+        """
+        if field not in self._buckets:
+            return
+        self._discard(field, old_value, package.package_id)
+        self._buckets[field].setdefault(getattr(package, field), {})[package.package_id] = package
+
+    def _discard(self, field: str, value: Any, package_id: int) -> None:
+        """Remove one package from a bucket, dropping the bucket if empty"""
+        buckets = self._buckets[field]
+        bucket = buckets.get(value)
+        if bucket is not None:
+            bucket.pop(package_id, None)
+            if not bucket:
+                del buckets[value]
+
+    def find(self, field: str, value: Any) -> List[Package]:
+        """
+        Get all packages whose field equals value.
+        Example:
+            index.find("status", "En Route")
+            index.find("deadline", time(10, 30))
+        """
+        return list(self._buckets[field].get(value, {}).values())
+
+    def count(self, field: str, value: Any) -> int:
+        """Get the number of packages whose field equals value"""
+        return len(self._buckets[field].get(value, ()))
+
+    def values(self, field: str) -> List[Any]:
+        """Get the distinct values currently present for field"""
+        return list(self._buckets[field])
@@ -1,53 +1,198 @@
 import csv
 from datetime import time
-from typing import Dict
+from typing import Dict, Iterator, List, Optional
+from .location_registry import LocationRegistry
 from .package import Package 
+from .package_index import PackageIndex
+from .package_columns import PackageColumns
+from .special_notes import DEFAULT_NOTE_RULES, NoteRules
+
+# Text encoding of package manifests, for both the sequential and the
+# parallel loader
+MANIFEST_ENCODING = "utf-8"
+
+# Header keyword -> field; the first header cell containing the keyword
+# (case-insensitive) gives that field's column
+HEADER_FIELDS = {
+    "package_id": "id",
+    "address": "address",
+    "city": "city",
+    "zip_code": "zip",
+    "deadline": "deadline",
+    "weight": "weight",
+    "notes": "notes",
+}
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def header_columns(row: List[str]) -> Optional[Dict[str, int]]:
+    """
+    Map fields to columns if row is the manifest header row, i.e. it has
+    both an ID and an Address column.
+    Returns:
+        Field name -> column index, or None if row is not the header
+    """
+    cells = [" ".join(cell.lower().split()) for cell in row]
+    columns = {}
+    for field, keyword in HEADER_FIELDS.items():
+        for i, cell in enumerate(cells):
+            if keyword in cell:
+                columns[field] = i
+                break
+    if "package_id" in columns and "address" in columns:
+        return columns
+    return None
+
+
+def find_header(csv_reader) -> Dict[str, int]:
+    """
+    Advance a CSV reader past the manifest header row.
+    Anything above the header (titles, blank rows) is skipped.
+    Args:
+        csv_reader: csv.reader positioned at the start of the manifest
+    Returns:
+        Field name -> column index
+    Raises:
+        ValueError: If no header row is found
+    """
+    for row in csv_reader:
+        columns = header_columns(row)
+        if columns is not None:
+            return columns
+    raise ValueError("No package header row found")
+
+
+def package_from_row(row: List[str], columns: Dict[str, int],
+                     locations: Optional[LocationRegistry] = None,
+                     rules: NoteRules = DEFAULT_NOTE_RULES) -> Optional[Package]:
+    """
+    Create a Package from a manifest data row.
+    Args:
+        row: CSV row after the header
+        columns: Field name -> column index (from header_columns)
+        locations: If given, the address is resolved to its location ID
+        rules: Special-notes rules to apply
+    Returns:
+        The Package, or None for blank and trailing rows
+    Raises:
+        ValueError: If the address is not in the location registry
+    """
+    id_col, address_col = columns["package_id"], columns["address"]
+    if len(row) <= address_col or not row[id_col].strip().isdigit():
+        return None
+
+    # Create basic package
+    package = Package(
+        package_id=int(row[id_col]),
+        address=row[address_col],
+        deadline=_cell(row, columns.get("deadline")) or "EOD",
+        city=_cell(row, columns.get("city")),
+        zip_code=_cell(row, columns.get("zip_code")),
+        weight=_cell(row, columns.get("weight"))
+    )
+    if locations is not None:
+        package.location_id = locations.resolve(package.address)
+    rules.apply(package, _cell(row, columns.get("notes")))
+    return package
+
+
+def iter_package_batches(filename: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                         locations: Optional[LocationRegistry] = None,
+                         rules: NoteRules = DEFAULT_NOTE_RULES) -> Iterator[List[Package]]:
+    """
+    Stream packages from a manifest CSV in batches.
+    Rows are read lazily, so memory is bounded by chunk_size no matter how
+    large the manifest is.
+    Args:
+        filename: Path to package data CSV
+        chunk_size: Maximum packages per batch
+        locations: If given, each address is resolved to its location ID
+        rules: Special-notes rules to apply
+    Yields:
+        Lists of up to chunk_size packages, in file order
+    Raises:
+        ValueError: If there is no header row, or an address is not in
+            the location registry
+    """
+    with open(filename, "r", newline="", encoding=MANIFEST_ENCODING) as file:
+        csv_reader = csv.reader(file)
+        columns = find_header(csv_reader)
+
+        batch: List[Package] = []
+        for row in csv_reader:
+            package = package_from_row(row, columns, locations, rules)
+            if package is None:
+                continue
+
+            batch.append(package)
+            if len(batch) >= chunk_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+
+def _cell(row: List[str], column: Optional[int]) -> str:
+    """Get a cell, or "" if the column is missing from the header or row"""
+    if column is None or column >= len(row):
+        return ""
+    return row[column]
+
 
 class PackageLoader:
     def __init__(self):
         # Hash table for O(1) lookups
         self.packages: Dict[int, Package] = {}
+        # Secondary indexes by status, deadline, truck, zip and location
+        self.index = PackageIndex()
+        # Optional columnar copy for vectorized filters (see enable_columns)
+        self.columns: Optional[PackageColumns] = None
     
-    def load_packages(self, filename: str) -> None:
-        """Load and parse package data"""
-        with open(filename, "r") as file:
-            csv_reader = csv.reader(file)
-            
-            # Skip headers
-            for _ in range(8):
-                next(csv_reader)
-            
-            # Process each package
-            for row in csv_reader:
-                if len(row) < 8:
-                    continue
-                
-                # Create basic package
-                package = Package(
-                    package_id=int(row[0]),
-                    address=row[1],
-                    deadline=row[5],
-                    city=row[2],
-                    zip_code=row[4],
-                    weight=row[6]
-                )
-                
-                # Handle special notes
-                notes = row[7]
-                if "Delayed" in notes:
-                    package.delayed_until = time(9, 5)
-                if "Can only be on truck 2" in notes:
-                    package.required_truck = 2
-                if "Must be delivered with" in notes:
-                    # Extract ALL numbers from note
-                    import re
-                    numbers = re.findall(r'\d+', notes)
-                    package.grouped_with = [int(num) for num in numbers]
-                if "Wrong address" in notes:
-                    package.wrong_address = True
-                
-                # Store in hash table
-                self.packages[package.package_id] = package
+    def load_packages(self, filename: str,
+                      locations: Optional[LocationRegistry] = None,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      rules: NoteRules = DEFAULT_NOTE_RULES) -> None:
+        """
+        Load and parse package data
+        Args:
+            filename: Path to package data CSV
+            locations: If given, each address is resolved to its location ID
+            chunk_size: Rows parsed per batch (see iter_package_batches)
+            rules: Special-notes rules to apply
+        Raises:
+            ValueError: If there is no header row, or an address is not in
+                the location registry
+        """
+        for batch in iter_package_batches(filename, chunk_size, locations, rules):
+            for package in batch:
+                self.add_package(package)
+
+    def add_package(self, package: Package) -> None:
+        """Store a package, replacing any package with the same ID"""
+        existing = self.packages.get(package.package_id)
+        if existing is not None:
+            self.index.remove(existing)
+        self.packages[package.package_id] = package
+        self.index.add(package)
+        if self.columns is not None:
+            if existing is not None:
+                # Rows are append-only, so rebuild on replacement
+                self.enable_columns()
+            else:
+                self.columns.add(package)
+
+    def enable_columns(self) -> PackageColumns:
+        """
+        Build the columnar store from the loaded packages and keep it in
+        sync from now on. get_available_packages then filters on it.
+        """
+        if self.columns is not None:
+            self.columns.detach()
+        self.columns = PackageColumns()
+        for package in self.packages.values():
+            self.columns.add(package)
+        return self.columns
 
     def get_package(self, package_id: int) -> Package:
         """Get package by ID"""
@@ -57,8 +202,18 @@ class PackageLoader:
         """Get all packages"""
         return list(self.packages.values())
         
+    def get_packages_by(self, field: str, value) -> list[Package]:
+        """
+        Get packages by an indexed field (see PackageIndex.FIELDS).
+        Example:
+            loader.get_packages_by("status", "En Route")
+        """
+        return self.index.find(field, value)
+
     def get_available_packages(self, current_time: time, truck_id: int) -> list[Package]:
         """Get packages that can be loaded on truck"""
+        if self.columns is not None:
+            return self.columns.available(current_time, truck_id)
         return [
             package for package in self.packages.values()
             if package.can_be_loaded(current_time, truck_id)
@@ -0,0 +1,124 @@
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from .hash_table import HashTable
+from .location_registry import LocationRegistry
+from .package import Package
+from .package_loader import MANIFEST_ENCODING, header_columns, package_from_row
+from .special_notes import DEFAULT_NOTE_RULES, NoteRules
+
+# Files smaller than this per worker are parsed in-process
+MIN_RANGE_BYTES = 1 << 20
+
+
+def find_data_start(filename: str) -> Tuple[int, Dict[str, int]]:
+    """
+    Find where the data rows of a manifest begin.
+    Reads physical lines until a complete CSV record (balanced quotes) is
+    the header row; titles above it may span several lines.
+    Returns:
+        (byte offset of the first data row, field name -> column index)
+    Raises:
+        ValueError: If no header row is found
+    """
+    with open(filename, "rb") as file:
+        record = b""
+        for line in iter(file.readline, b""):
+            record += line
+            if record.count(b'"') % 2:
+                continue  # quoted field continues on the next line
+            row = next(csv.reader(record.decode(MANIFEST_ENCODING).splitlines(keepends=True)), [])
+            record = b""
+            columns = header_columns(row)
+            if columns is not None:
+                return file.tell(), columns
+    raise ValueError("No package header row found")
+
+
+def split_ranges(start: int, end: int, parts: int) -> List[Tuple[int, int]]:
+    """Split [start, end) into up to parts contiguous byte ranges"""
+    parts = max(1, min(parts, end - start))
+    step = -(-(end - start) // parts)
+    return [(offset, min(offset + step, end)) for offset in range(start, end, step)]
+
+
+def parse_range(filename: str, start: int, end: int, data_start: int,
+                columns: Dict[str, int],
+                locations: Optional[LocationRegistry] = None,
+                rules: NoteRules = DEFAULT_NOTE_RULES) -> List[Package]:
+    """
+    Parse the data rows that begin inside [start, end).
+    A row that straddles start belongs to the previous range, so every
+    row is parsed exactly once. Data rows must be single-line records.
+    Runs in a worker process.
+    """
+    with open(filename, "rb") as file:
+        if start > data_start:
+            # Finish the line that began in the previous range
+            file.seek(start - 1)
+            file.readline()
+        else:
+            file.seek(start)
+
+        lines = []
+        while file.tell() < end:
+            line = file.readline()
+            if not line:
+                break
+            lines.append(line.decode(MANIFEST_ENCODING))
+
+    packages = []
+    for row in csv.reader(lines):
+        package = package_from_row(row, columns, locations, rules)
+        if package is not None:
+            packages.append(package)
+    return packages
+
+
+def load_packages_parallel(filename: str, hash_table: HashTable,
+                           workers: Optional[int] = None,
+                           locations: Optional[LocationRegistry] = None,
+                           min_range_bytes: int = MIN_RANGE_BYTES,
+                           rules: NoteRules = DEFAULT_NOTE_RULES) -> int:
+    """
+    Bulk-load a large manifest by parsing byte ranges in worker processes.
+    The data section is split into one range per worker; each worker
+    parses its rows (ints, deadlines, notes, address resolution) and the
+    results are merged into the hash table in file order.
+    Args:
+        filename: Path to package data CSV
+        hash_table: Store to insert the packages into
+        workers: Number of processes (default: CPU count)
+        locations: If given, each address is resolved to its location ID
+        min_range_bytes: Smallest range worth a process; small files are
+            parsed in-process
+        rules: Special-notes rules to apply (must be picklable)
+    Returns:
+        Number of packages loaded
+    Raises:
+        ValueError: If there is no header row, or an address is not in
+            the location registry
+    """
+    data_start, columns = find_data_start(filename)
+    data_end = os.path.getsize(filename)
+    workers = workers or os.cpu_count() or 1
+    parts = min(workers, max(1, (data_end - data_start) // max(min_range_bytes, 1)))
+    ranges = split_ranges(data_start, data_end, parts)
+
+    if len(ranges) <= 1:
+        results = [parse_range(filename, data_start, data_end, data_start, columns, locations, rules)]
+    else:
+        with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(parse_range, filename, start, end, data_start, columns, locations, rules)
+                for start, end in ranges
+            ]
+            results = [future.result() for future in futures]
+
+    count = 0
+    for packages in results:
+        for package in packages:
+            hash_table.insert(package.package_id, package)
+        count += len(packages)
+    return count
@@ -0,0 +1,63 @@
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from .package import Package
+
+
+class ReleaseQueue:
+    """
+    Packages split into released (deliverable now) and pending.
+    Pending packages sit in a min-heap keyed by Package.available_at;
+    advance(clock) pops everything whose time has come into the released
+    set. Each package is checked once when it is released (O(log n))
+    instead of on every routing step.
+    """
+
+    def __init__(self, packages: Iterable[Package] = ()):
+        # package_id -> package, in release order (dict as an ordered set)
+        self.available: Dict[int, Package] = {}
+        # (available_at, insertion order, package)
+        self._pending: List[Tuple[int, int, Package]] = []
+        # IDs of pending packages discarded before release (lazy deletion)
+        self._discarded: Set[int] = set()
+        self._count = 0
+        for package in packages:
+            self.push(package)
+
+    def __len__(self) -> int:
+        return len(self.available) + len(self._pending) - len(self._discarded)
+
+    def push(self, package: Package) -> None:
+        """Add a package; it is released once the clock reaches available_at"""
+        heapq.heappush(self._pending, (package.available_at, self._count, package))
+        self._count += 1
+
+    def advance(self, clock: int) -> List[Package]:
+        """
+        Release every package available at or before clock.
+        Args:
+            clock: Seconds since midnight
+        Returns:
+            Packages released by this call
+        """
+        released = []
+        pending = self._pending
+        while pending and pending[0][0] <= clock:
+            package = heapq.heappop(pending)[2]
+            if package.package_id in self._discarded:
+                self._discarded.discard(package.package_id)
+                continue
+            self.available[package.package_id] = package
+            released.append(package)
+        return released
+
+    def next_release(self) -> Optional[int]:
+        """Get the next time a pending package is released (None if none)"""
+        pending = self._pending
+        while pending and pending[0][2].package_id in self._discarded:
+            self._discarded.discard(heapq.heappop(pending)[2].package_id)
+        return pending[0][0] if pending else None
+
+    def discard(self, package: Package) -> None:
+        """Remove a queued package (e.g. once it is delivered), released or not"""
+        if self.available.pop(package.package_id, None) is None:
+            self._discarded.add(package.package_id)
@@ -0,0 +1,123 @@
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+from .distance_table import DistanceTable
+from .package import Package
+
+if TYPE_CHECKING:
+    from .truck import Truck
+
+
+class RouteCost(NamedTuple):
+    """Result of driving a stop order"""
+    distance: float  # miles, including the return to the hub
+    lateness: int    # total seconds past stop deadlines
+    finish: int      # clock value back at the hub
+
+
+class RouteProblem:
+    """
+    One truck's delivery tour as a small routing problem over stops.
+    Stop 0 is the hub. Packages for the same location share a stop, which
+    takes the latest release (Package.available_at) and earliest deadline
+    of its packages. Distances and travel times are copied into dense
+    stop x stop tables, so solvers index lists instead of the packed
+    triangle. Timing follows FleetSimulator: a truck waits where it is
+    until a stop is released, then drives to it.
+    """
+
+    def __init__(self, packages: Iterable[Package], distance_table: DistanceTable,
+                 start: int, speed: float, hub: int = 0,
+                 location_of: Optional[Callable[[Package], int]] = None):
+        """
+        Args:
+            packages: Packages to deliver (location IDs resolved)
+            distance_table: Distance and travel time lookups
+            start: Clock value the truck leaves the hub (seconds)
+            speed: Truck speed in mph
+            hub: Location ID of the hub
+            location_of: Location a package will be delivered to (default:
+                its location_id), e.g. to plan with a corrected address
+        """
+        self.start = start
+        location_of = location_of or (lambda package: package.location_id)
+        self.locations: List[int] = [hub]
+        self.packages: List[List[Package]] = [[]]
+        stops: Dict[int, int] = {hub: 0}
+        for package in packages:
+            location = location_of(package)
+            stop = stops.get(location)
+            if stop is None:
+                stop = stops[location] = len(self.locations)
+                self.locations.append(location)
+                self.packages.append([])
+            self.packages[stop].append(package)
+
+        self.release: List[int] = [0] + [
+            max(p.available_at for p in stop) for stop in self.packages[1:]
+        ]
+        self.deadline: List[int] = [float("inf")] + [
+            min(p.deadline_minutes for p in stop) * 60 for stop in self.packages[1:]
+        ]
+
+        self.distance: List[List[float]] = distance_table.submatrix(self.locations)
+        scale = 3600 / speed
+        self.travel: List[List[int]] = [
+            [round(d * scale) for d in row] for row in self.distance
+        ]
+
+    @classmethod
+    def for_truck(cls, truck: "Truck", distance_table: DistanceTable,
+                  location_of: Optional[Callable[[Package], int]] = None) -> "RouteProblem":
+        """Build the problem for a truck's undelivered packages, leaving at its clock"""
+        packages = {p.package_id: p for p in truck.packages if p.status != "Delivered"}
+        return cls(packages.values(), distance_table, truck.clock, truck.SPEED,
+                   truck.HUB_LOCATION_ID, location_of)
+
+    @property
+    def size(self) -> int:
+        """Number of stops, excluding the hub"""
+        return len(self.locations) - 1
+
+    def evaluate(self, order: Sequence[int]) -> RouteCost:
+        """
+        Drive the stops in order, starting and ending at the hub.
+        Args:
+            order: Stop numbers (1..size), each once
+        """
+        distance, travel = self.distance, self.travel
+        release, deadline = self.release, self.deadline
+        clock, miles, late, here = self.start, 0.0, 0, 0
+        for stop in order:
+            if clock < release[stop]:
+                clock = release[stop]
+            clock += travel[here][stop]
+            miles += distance[here][stop]
+            if clock > deadline[stop]:
+                late += clock - deadline[stop]
+            here = stop
+        return RouteCost(miles + distance[here][0], late, clock + travel[here][0])
+
+    def nearest_neighbor_order(self) -> List[int]:
+        """
+        Greedy stop order: always drive to the nearest released stop,
+        waiting for the next release when none is (as FleetSimulator does).
+        """
+        distance, travel, release = self.distance, self.travel, self.release
+        unvisited = list(range(1, len(self.locations)))
+        order = []
+        clock, here = self.start, 0
+        while unvisited:
+            ready = [stop for stop in unvisited if release[stop] <= clock]
+            if not ready:
+                clock = min(release[stop] for stop in unvisited)
+                continue
+            row = distance[here]
+            stop = min(ready, key=row.__getitem__)
+            clock += travel[here][stop]
+            unvisited.remove(stop)
+            order.append(stop)
+            here = stop
+        return order
+
+    def packages_in(self, order: Sequence[int]) -> List[Package]:
+        """Get the packages in delivery order for a stop order"""
+        return [package for stop in order for package in self.packages[stop]]
@@ -0,0 +1,97 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of pickled models changes, so old snapshots miss
+SNAPSHOT_VERSION = "6"
+
+
+def input_key(*filenames: str, version: str = SNAPSHOT_VERSION) -> str:
+    """
+    Hash the contents of input files into a snapshot key.
+    Any change to any input (or to version) gives a different key.
+    Args:
+        filenames: Paths of the input files, in a fixed order
+        version: Snapshot format version
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256(version.encode())
+    for filename in filenames:
+        digest.update(b"\0")
+        with open(filename, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class SnapshotCache:
+    """
+    Directory of binary (pickle) snapshots keyed by input content hash.
+    Snapshots are written atomically (temp file + rename), so a crash
+    never leaves a half-written snapshot behind. Only load snapshots from a
+    directory you trust: unpickling runs code from the file.
+    Keys change with the inputs and the service date, so saving prunes the
+    directory to the keep most recently used snapshots.
+    """
+
+    SUFFIX = ".snapshot"
+    # Default number of snapshots kept per directory
+    KEEP = 8
+
+    def __init__(self, directory: str, keep: int = KEEP):
+        self.directory = directory
+        self.keep = keep
+
+    def path(self, key: str) -> str:
+        """Get the snapshot file path for a key"""
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def load(self, key: str) -> Optional[Any]:
+        """
+        Load the snapshot for a key.
+        Returns:
+            The saved state, or None if there is no usable snapshot
+        """
+        try:
+            with open(self.path(key), "rb") as file:
+                state = pickle.load(file)
+            # A hit counts as a use, so pruning keeps it
+            os.utime(self.path(key))
+            return state
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable snapshot %s: %s", self.path(key), e)
+            return None
+
+    def save(self, key: str, state: Any) -> None:
+        """Save state as the snapshot for a key"""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self.prune()
+
+    def prune(self) -> None:
+        """Delete all but the keep most recently used snapshots"""
+        paths = [
+            os.path.join(self.directory, name) for name in os.listdir(self.directory)
+            if name.endswith(self.SUFFIX)
+        ]
+        paths.sort(key=os.path.getmtime, reverse=True)
+        for path in paths[max(self.keep, 1):]:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass  # already pruned by another process
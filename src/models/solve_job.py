@@ -0,0 +1,137 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+from .alns import AlnsSolver, Plan
+
+logger = logging.getLogger(__name__)
+
+
+class Improvement(NamedTuple):
+    """A new best plan, as streamed by SolveJob"""
+    elapsed: float                      # seconds since the job started
+    mileage: float                      # miles, including returns to the hub
+    lateness: int                       # total seconds past package deadlines
+    routes: Dict[int, Tuple[int, ...]]  # truck_id -> package IDs in delivery order
+    unassigned: Tuple[int, ...]         # package IDs no truck could take
+    plan: Plan                          # full plan, for DeliveryService.run_plan
+
+    @property
+    def feasible(self) -> bool:
+        """True if every package is on a truck and on time"""
+        return self.plan.feasible
+
+
+class SolveJob:
+    """
+    Handle to a search running in a background thread.
+    The solver copies what it needs from the packages and trucks when it
+    is built, before the thread starts. The search thread then reads only
+    solver-owned data (plans hold references to the Package objects, and
+    only their fixed package_id is read), so the caller can keep using the
+    service, and apply a plan, while it runs. Each new best
+    plan is kept as best() and passed to on_improvement, which is called
+    on the search thread. cancel() ends the search after its current
+    iteration; result() waits for the end and returns the best plan.
+    An exception raised by the search or the callback ends the job and
+    is raised again by result().
+    """
+
+    def __init__(self, solver: AlnsSolver, time_limit: Optional[float],
+                 on_improvement: Optional[Callable[[Improvement], None]] = None):
+        """
+        Args:
+            solver: Solver to run
+            time_limit: Seconds to search (None to run until cancelled)
+            on_improvement: Called with every new best plan
+        """
+        self._solver = solver
+        self._time_limit = time_limit
+        self._on_improvement = on_improvement
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+        self._improved = threading.Condition()
+        self._best: Optional[Improvement] = None
+        self._plan: Optional[Plan] = None
+        self._error: Optional[Exception] = None
+        self._started = 0.0
+        self._thread = threading.Thread(target=self._run, name="solve-job", daemon=True)
+
+    def start(self) -> "SolveJob":
+        """Start the search thread"""
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        """Ask the search to stop; the best plan so far stays available"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def done(self) -> bool:
+        """True once the search has finished (time up, cancelled or failed)"""
+        return self._finished.is_set()
+
+    def best(self, timeout: Optional[float] = 0) -> Optional[Improvement]:
+        """
+        Get the best plan found so far.
+        Args:
+            timeout: Seconds to wait for a first plan (0 for none, None
+                for as long as it takes)
+        Returns:
+            Latest improvement, or None if there is none yet
+        """
+        with self._improved:
+            self._improved.wait_for(lambda: self._best is not None or self.done(), timeout)
+            return self._best
+
+    def result(self, timeout: Optional[float] = None) -> Plan:
+        """
+        Wait for the search to finish and return the best plan.
+        Args:
+            timeout: Seconds to wait (None for as long as it takes)
+        Returns:
+            Best plan found
+        Raises:
+            TimeoutError: If the search is still running after timeout
+            Exception: Whatever ended the search, if it failed
+        """
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            raise TimeoutError("Search is still running")
+        if self._error is not None:
+            raise self._error
+        return self._plan
+
+    def _run(self) -> None:
+        try:
+            self._plan = self._solver.solve(self._time_limit,
+                                            on_improvement=self._publish,
+                                            stop=self._cancelled.is_set)
+            logger.info("Search finished after %d iterations", self._solver.iterations)
+        except Exception as error:
+            logger.exception("Search failed")
+            self._error = error
+        finally:
+            with self._improved:
+                self._finished.set()
+                self._improved.notify_all()
+
+    def _publish(self, plan: Plan) -> None:
+        """Record a new best plan and pass it to the callback"""
+        improvement = Improvement(
+            time.perf_counter() - self._started,
+            plan.distance,
+            plan.lateness,
+            {truck_id: tuple(p.package_id for p in route) for truck_id, route in plan.routes.items()},
+            tuple(p.package_id for p in plan.unassigned),
+            plan,
+        )
+        with self._improved:
+            self._best = improvement
+            self._improved.notify_all()
+        if self._on_improvement is not None:
+            self._on_improvement(improvement)
@@ -0,0 +1,123 @@
+import logging
+import re
+from datetime import datetime, time
+from functools import lru_cache
+from typing import Any, Callable, Iterable, List, Match, Tuple
+from .package import Package
+
+logger = logging.getLogger(__name__)
+
+# One attribute assignment produced by a rule, e.g. ("required_truck", 2)
+Assignment = Tuple[str, Any]
+# Most distinct note strings remembered by NoteRules.parse
+PARSE_CACHE_SIZE = 1024
+# Arrival assumed for a "Delayed" note that gives no time (the flight
+# delay in the WGUPS manifest)
+DEFAULT_DELAY = time(9, 5)
+
+
+class NoteRule:
+    """
+    A special-notes rule: a regex and a function turning its match into
+    Package attribute assignments. Patterns are compiled once, case-
+    insensitive. Extract functions should be module-level so rules can be
+    sent to worker processes (see parallel_loader).
+    """
+    def __init__(self, name: str, pattern: str,
+                 extract: Callable[[Match], Iterable[Assignment]]):
+        self.name = name
+        self.pattern = re.compile(pattern, re.IGNORECASE)
+        self.extract = extract
+
+
+class NoteRules:
+    """
+    Ordered set of NoteRules with a cache of parsed notes.
+    Most rows repeat one of a handful of note strings, so each recent one
+    is run through the rules once; every later row with the same note is
+    a cache lookup plus the assignments, however many rules there are.
+    The cache keeps the cache_size most recently used notes, so notes
+    that are all different ("delivered with" lists) cannot grow it without
+    bound. It is not pickled: worker processes start with an empty one.
+    """
+    def __init__(self, rules: Iterable[NoteRule] = (), cache_size: int = PARSE_CACHE_SIZE):
+        self.rules: List[NoteRule] = list(rules)
+        self.cache_size = cache_size
+        self._new_cache()
+
+    def _new_cache(self) -> None:
+        self._parsed = lru_cache(maxsize=self.cache_size)(self._parse)
+
+    def __getstate__(self) -> dict:
+        """Pickle support: leave the parse cache behind"""
+        state = self.__dict__.copy()
+        del state["_parsed"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._new_cache()
+
+    def add(self, rule: NoteRule) -> None:
+        """Add a rule (applied after existing rules)"""
+        self.rules.append(rule)
+        self._parsed.cache_clear()
+
+    def parse(self, notes: str) -> Tuple[Assignment, ...]:
+        """
+        Get the attribute assignments for a note string.
+        Later rules win if two rules set the same attribute.
+        """
+        return self._parsed(notes)
+
+    def _parse(self, notes: str) -> Tuple[Assignment, ...]:
+        """Run a note string through every rule (uncached)"""
+        assignments = []
+        if notes:
+            for rule in self.rules:
+                match = rule.pattern.search(notes)
+                if match:
+                    assignments.extend(rule.extract(match))
+        return tuple(assignments)
+
+    def apply(self, package: Package, notes: str) -> None:
+        """Set special handling attributes on a package from its notes"""
+        for attribute, value in self.parse(notes):
+            setattr(package, attribute, value)
+
+
+def _delayed(match: Match) -> List[Assignment]:
+    if match.group("time") is None:
+        logger.warning("No arrival time in note %r; assuming %s",
+                       match.string, DEFAULT_DELAY.strftime("%I:%M %p"))
+        return [("delayed_until", DEFAULT_DELAY)]
+    clock = match.group("time").upper().replace(".", "").replace(" ", "")
+    return [("delayed_until", datetime.strptime(clock, "%I:%M%p").time())]
+
+
+def _required_truck(match: Match) -> List[Assignment]:
+    return [("required_truck", int(match.group("truck")))]
+
+
+def _grouped_with(match: Match) -> List[Assignment]:
+    return [("grouped_with", tuple(int(n) for n in re.findall(r"\d+", match.group("ids"))))]
+
+
+def _wrong_address(match: Match) -> List[Assignment]:
+    return [("wrong_address", True)]
+
+
+DEFAULT_RULES = (
+    # "Delayed on flight---will not arrive to depot until 9:05 am"
+    # (a note without a time gets DEFAULT_DELAY)
+    NoteRule("delayed", r"delayed\b(?:.*?\buntil\s+(?P<time>\d{1,2}:\d{2}\s*[ap]\.?m))?", _delayed),
+    # "Can only be on truck 2"
+    NoteRule("required_truck", r"only be on truck\s+(?P<truck>\d+)", _required_truck),
+    # "Must be delivered with 15, 19"
+    NoteRule("grouped_with", r"delivered with\s+(?P<ids>\d+(?:\s*(?:,|and)\s*\d+)*)", _grouped_with),
+    # "Wrong address listed"
+    NoteRule("wrong_address", r"wrong address", _wrong_address),
+)
+
+# Rules used by the loaders unless they are given their own
+DEFAULT_NOTE_RULES = NoteRules(DEFAULT_RULES)
@@ -0,0 +1,56 @@
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Optional, Union
+
+# Deadline used for "EOD" and anything that does not parse
+END_OF_DAY = time(17, 0)
+# Corrected addresses are known from 10:20 AM
+ADDRESS_CORRECTION = time(10, 20)
+ADDRESS_CORRECTION_SECONDS = (10 * 60 + 20) * 60
+SECONDS_PER_HOUR = 3600
+
+
+@lru_cache(maxsize=None)
+def parse_deadline(deadline: str) -> time:
+    """
+    Convert a deadline string ("EOD", "10:30 AM") to a time.
+    A manifest has only a few distinct deadline strings, so each one is
+    parsed once; every later package with the same string gets the same
+    (immutable) time object back.
+    """
+    if deadline == "EOD":
+        return END_OF_DAY
+    try:
+        return datetime.strptime(deadline, "%I:%M %p").time()
+    except ValueError:
+        return END_OF_DAY
+
+
+def to_minutes(value: Union[int, time, datetime]) -> int:
+    """
+    Minutes since midnight for a time, datetime or clock value (an int,
+    in seconds since midnight like everywhere else). Seconds are dropped,
+    which is exact for comparisons against whole-minute thresholds like
+    deadlines.
+    """
+    if isinstance(value, int):
+        return value // 60
+    return value.hour * 60 + value.minute
+
+
+
+def to_seconds(value: Union[int, time, datetime]) -> int:
+    """Seconds since midnight for a time or datetime (ints are already seconds)"""
+    if isinstance(value, int):
+        return value
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def from_seconds(seconds: int, day: Optional[date] = None) -> datetime:
+    """
+    Convert a simulation clock value back to a datetime, for reporting.
+    Args:
+        seconds: Seconds since midnight
+        day: Service date (default: today)
+    """
+    return datetime.combine(day or date.today(), time()) + timedelta(seconds=seconds)
@@ -1,7 +1,13 @@
+import logging
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from .package import Package
 from .distance_table import DistanceTable
+from .local_search import improve_route
+from .route_problem import RouteProblem
+from .time_utils import from_seconds, to_seconds
+
+logger = logging.getLogger(__name__)
 
 class Truck:
     """
@@ -16,6 +22,7 @@ class Truck:
     STATUS_AT_HUB = "At Hub"
     STATUS_EN_ROUTE = "En Route"
     HUB_ADDRESS = "Western Governors University" 
+    HUB_LOCATION_ID = 0  # Hub is the first row of the distance table
 
 
     def __init__(self, truck_id: int, start_time: datetime):
@@ -27,9 +34,23 @@ class Truck:
         self.truck_id: int = truck_id
         self.packages: List[Package] = []
         self.current_address = self.HUB_ADDRESS
+        self.location_id = self.HUB_LOCATION_ID
         self.status = self.STATUS_AT_HUB
         self.mileage = 0.0
-        self.current_time = start_time
+        # Simulation clock: whole seconds since midnight on the service day
+        # (current_time converts it to a datetime for reporting)
+        self.day = start_time.date()
+        self.clock = to_seconds(start_time)
+
+    @property
+    def current_time(self) -> datetime:
+        """Truck's clock as a datetime"""
+        return from_seconds(self.clock, self.day)
+
+    @current_time.setter
+    def current_time(self, value: datetime) -> None:
+        self.day = value.date()
+        self.clock = to_seconds(value)
 
     def load_package(self, package: Package) -> bool:
         """
@@ -38,33 +59,35 @@ class Truck:
         """
         if len(self.packages) < self.MAX_CAPACITY:
             self.packages.append(package)
-            package.mark_en_route(self.current_time, self.truck_id)
+            package.mark_en_route(self.clock, self.truck_id, self.day)
             return True
         return False
     
+    @staticmethod
+    def _location_of(package: Package, distance_table: DistanceTable) -> int:
+        """
+        Get a package's location ID, interning it on first use for packages
+        that were not created through a loader
+        """
+        if package.location_id is None:
+            package.location_id = distance_table.locations.resolve(package.address)
+        return package.location_id
+
     def find_nearest_package(self, distance_table: DistanceTable) -> Optional[Package]:
         """Find nearest undelivered package"""
-        nearest_package = None
-        shortest_distance = float("inf")
-
-        print(f"\nFinding nearest package from: {self.current_address}")
-        
-        # Check each package on truck
-        for package in self.packages:
-            if package.status != "Delivered":
-                # Get distance to this package's delivery address
-                distance = distance_table.get_distance(
-                    self.current_address, 
-                    package.address
-                )
-                print(f"Distance to {package.address}: {distance} miles")
-                
-                # If this is closer than what we've found so far
-                if distance < shortest_distance:
-                    shortest_distance = distance
-                    nearest_package = package
-                    print(f"New nearest package: {package.package_id}")
-        
+        # Measure to every undelivered package in one batch
+        remaining = [p for p in self.packages if p.status != "Delivered"]
+        position, distance = distance_table.nearest(
+            self.location_id,
+            [self._location_of(package, distance_table) for package in remaining]
+        )
+        if position < 0:
+            return None
+
+        nearest_package = remaining[position]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Nearest package from %s: %s (%s miles)",
+                         self.current_address, nearest_package.package_id, distance)
         return nearest_package
     
     def deliver_package(self, package: Package, distance_table: DistanceTable) -> None:
@@ -74,44 +97,49 @@ class Truck:
             package: Package to deliver
             distance_table: Distance lookup table 
         """
-        print("\nDelivering package:")
-        print(f"From: {self.current_address}")
-        print(f"To: {package.address}")
-        
         # Get distance to delivery address
-        distance = distance_table.get_distance(
-            "Western Governors University", 
-            package.address
-        )
-        print(f"Got distance: {distance} miles")
+        location_id = self._location_of(package, distance_table)
+        distance = distance_table.get_distance_by_index(self.location_id, location_id)
 
         # update trucks mileage
         self.mileage += distance
-        print(f"Updated mileage to: {self.mileage}")
+
+        # update time from the precomputed travel times (distance / speed)
+        self.clock += distance_table.get_travel_time_by_index(
+            self.location_id, location_id, self.SPEED
+        )
 
         # update trucks location
         self.current_address = package.address
-        print(f"Updated location to: {self.current_address}")
-
-        # update time based on distance (hours = distance / speed)
-        time_hours = distance / self.SPEED
-        time_delta = timedelta(hours=time_hours)
-        self.current_time += time_delta
-        print(f"Updated time to: {self.current_time}")
+        self.location_id = location_id
 
         # mark package as delivered
-        package.mark_delivered(self.current_time)
-        print(f"Marked package {package.package_id} as {package.status}")
+        package.mark_delivered(self.clock, self.day)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Truck %s delivered package %s to %s: %s miles, "
+                         "mileage %s, time %s", self.truck_id, package.package_id,
+                         package.address, distance, self.mileage, self.current_time)
 
 
-    def run_delivery_route(self, distance_table: DistanceTable) -> None:
+    def run_delivery_route(self, distance_table: DistanceTable, improve: bool = False) -> None:
         """
         Run the delivery route using nearest neighbor algorithm
         Args:
             distance_table: Distance lookup table
+            improve: Shorten the nearest neighbor tour with 2-opt / Or-opt
+                moves (see improve_route) before driving it
         """
         self.status = self.STATUS_EN_ROUTE
 
+        if improve:
+            problem = RouteProblem.for_truck(
+                self, distance_table,
+                lambda package: self._location_of(package, distance_table)
+            )
+            order = improve_route(problem, problem.nearest_neighbor_order())
+            for package in problem.packages_in(order):
+                self.deliver_package(package, distance_table)
+
         while True:
             # Find nearest undelivered package
             next_package = self.find_nearest_package(distance_table)
@@ -122,15 +150,19 @@ class Truck:
             self.deliver_package(next_package, distance_table)
 
         # return to hub if delievered everything
-        if self.current_address != self.HUB_ADDRESS:
+        if self.location_id != self.HUB_LOCATION_ID:
             # get distance back to hub
-            distance = distance_table.get_distance(self.current_address, self.HUB_ADDRESS)
+            distance = distance_table.get_distance_by_index(
+                self.location_id, self.HUB_LOCATION_ID
+            )
             
             # update mileage and time
             self.mileage += distance
-            time_hours = distance / self.SPEED
-            self.current_time += timedelta(hours=time_hours)
+            self.clock += distance_table.get_travel_time_by_index(
+                self.location_id, self.HUB_LOCATION_ID, self.SPEED
+            )
 
             # update location and status
             self.current_address = self.HUB_ADDRESS
+            self.location_id = self.HUB_LOCATION_ID
             self.status = self.STATUS_AT_HUB
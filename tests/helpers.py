@@ -0,0 +1,20 @@
+# tests/helpers.py
+from src.models.package import Package
+
+
+def make_packages(locations, deadlines=None):
+    """
+    Build packages numbered from 1, one per location ID.
+    Args:
+        locations: Location ID for each package
+        deadlines: Deadline for each package (default: all EOD)
+    Returns:
+        List of packages, in the order of locations
+    """
+    packages = []
+    for i, location in enumerate(locations):
+        deadline = deadlines[i] if deadlines else "EOD"
+        package = Package(i + 1, "", deadline, "Salt Lake City", "84115", "5")
+        package.location_id = location
+        packages.append(package)
+    return packages
@@ -0,0 +1,105 @@
+# tests/test_alns.py
+import unittest
+from src.models.alns import AlnsSolver
+from src.models.delivery_service import DeliveryService
+
+class TestAlns(unittest.TestCase):
+    def setUp(self):
+        self.service = DeliveryService(route_strategy="alns")
+        self.service.load_data("src/data/distances.csv", "src/data/packages.csv")
+        self.solver = AlnsSolver(self.service.package_loader.get_all_packages(),
+                                 self.service.trucks, self.service.distance_table,
+                                 self.service._planned_location, seed=0)
+
+    def test_plan_constraints(self):
+        """Test that the best plan keeps every package constraint"""
+        plan = self.solver.solve(time_limit=None, iterations=300)
+        self.assertTrue(plan.feasible)
+        truck_of = {}
+        for truck in self.service.trucks:
+            route = plan.routes.get(truck.truck_id, [])
+            self.assertLessEqual(len(route), truck.MAX_CAPACITY)
+            for package in route:
+                truck_of[package.package_id] = truck.truck_id
+                if package.required_truck:
+                    self.assertEqual(truck.truck_id, package.required_truck)
+                if package.delayed_until:
+                    self.assertEqual(truck.truck_id, 3)
+        self.assertEqual(len(truck_of), 40)
+        for package in self.service.package_loader.get_all_packages():
+            for other in package.grouped_with:
+                self.assertEqual(truck_of[package.package_id], truck_of[other])
+
+    def test_simulation_matches_plan(self):
+        """Test that driving the plan gives the planned miles, on time"""
+        plan = self.service.optimize_plan(time_limit=None, seed=0,
+                                          stop=iter([False] * 200 + [True]).__next__)
+        self.service.load_plan(plan)
+        self.service._simulator(self.service.trucks, plan.routes).run()
+        self.assertAlmostEqual(sum(t.mileage for t in self.service.trucks), plan.distance)
+        for package in self.service.package_loader.get_all_packages():
+            self.assertEqual(package.status, "Delivered")
+            self.assertLessEqual(package.delivery_seconds, package.deadline_minutes * 60)
+
+    def test_shared_drivers(self):
+        """Test that a plan for two drivers and three trucks is driven on time"""
+        service = DeliveryService(route_strategy="alns", drivers=2)
+        service.load_data("src/data/distances.csv", "src/data/packages.csv")
+        plan = service.optimize_plan(time_limit=None, seed=0,
+                                     stop=iter([False] * 200 + [True]).__next__)
+        self.assertTrue(plan.feasible)
+        with self.assertNoLogs("src.models.delivery_service", "WARNING"):
+            service.run_plan(plan)
+        self.assertAlmostEqual(service.total_mileage, plan.distance)
+        for package in service.package_loader.get_all_packages():
+            self.assertEqual(package.status, "Delivered")
+            self.assertLessEqual(package.delivery_seconds, package.deadline_minutes * 60)
+
+        # The third truck only leaves once one of the others is back
+        first, second, third = sorted(service.trucks, key=lambda truck: min(
+            p.departure_seconds for p in truck.packages))
+        self.assertGreaterEqual(min(p.departure_seconds for p in third.packages),
+                                min(first.clock, second.clock))
+
+    def test_solver_copies_state(self):
+        """Test that changing trucks after the solver is built does not change its search"""
+        expected = self.solver.solve(time_limit=None, iterations=100)
+        solver = AlnsSolver(self.service.package_loader.get_all_packages(),
+                            self.service.trucks, self.service.distance_table,
+                            self.service._planned_location, seed=0)
+        self.service.load_plan(expected)
+        for truck in self.service.trucks:
+            truck.clock = 20 * 3600
+        plan = solver.solve(time_limit=None, iterations=100)
+        self.assertEqual(plan, expected)
+
+    def test_slack_matches_timing(self):
+        """Test that the O(1) insertion check agrees with re-timing the route"""
+        solver = self.solver
+        solution = solver._initial_solution()
+        for t, route in enumerate(solution.routes):
+            for node in solver.unit_nodes[0] + solver.unit_nodes[5]:
+                if node in route.nodes:
+                    continue
+                _, position = solver._cheapest_position(t, route, node)
+                on_time = [
+                    i for i in range(1, len(route.stops))
+                    if not solver._time(t, route.nodes[:i - 1] + [node] + route.nodes[i - 1:]).lateness
+                ]
+                if on_time:
+                    self.assertIn(position, on_time)
+                else:
+                    self.assertEqual(position, -1)
+
+    def test_improvements(self):
+        """Test that improvements are reported best first and limits are required"""
+        plans = []
+        self.solver.solve(time_limit=None, iterations=200, on_improvement=plans.append)
+        self.assertGreater(len(plans), 1)
+        costs = [(plan.lateness, plan.distance) for plan in plans]
+        self.assertEqual(costs, sorted(costs, reverse=True))
+        with self.assertRaises(ValueError):
+            self.solver.solve(time_limit=None)
+
+if __name__ == '__main__':
+    unittest.main()
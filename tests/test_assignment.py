@@ -0,0 +1,60 @@
+# tests/test_assignment.py
+import unittest
+from datetime import datetime
+from src.models.assignment import assign_packages
+from src.models.distance_table import DistanceTable
+from src.models.truck import Truck
+from tests.helpers import make_packages
+
+class TestAssignment(unittest.TestCase):
+    def setUp(self):
+        self.distance_table = DistanceTable()
+        self.distance_table.load_distance_data("src/data/distances.csv")
+
+    def make_packages(self, count, deadline="EOD"):
+        locations = [1 + i % (len(self.distance_table.addresses) - 1) for i in range(count)]
+        return make_packages(locations, [deadline] * count)
+
+    def make_trucks(self, count, hour=8, minute=0):
+        return [Truck(i + 1, datetime(2024, 1, 1, hour, minute)) for i in range(count)]
+
+    def test_constraints(self):
+        """Test required truck, groups and delayed packages"""
+        packages = self.make_packages(30)
+        packages[0].required_truck = 2
+        packages[4].grouped_with = (6,)
+        packages[5].grouped_with = (12,)
+        packages[8].delayed_until = datetime(2024, 1, 1, 9, 5)
+        trucks = self.make_trucks(2) + [Truck(3, datetime(2024, 1, 1, 9, 5))]
+
+        assignment = assign_packages(packages, trucks, self.distance_table)
+        truck_of = {p.package_id: truck_id
+                    for truck_id, load in assignment.loads.items() for p in load}
+        self.assertFalse(assignment.unassigned)
+        self.assertEqual(len(truck_of), 30)
+        self.assertEqual(truck_of[1], 2)
+        self.assertEqual(truck_of[9], 3)
+        # 5, 6 and 12 are grouped transitively
+        self.assertEqual(truck_of[5], truck_of[6])
+        self.assertEqual(truck_of[6], truck_of[12])
+
+    def test_capacity_and_scale(self):
+        """Test that a large fleet stays within capacity and leftovers are reported"""
+        packages = self.make_packages(1000)
+        trucks = self.make_trucks(60)
+        assignment = assign_packages(packages, trucks, self.distance_table)
+        for truck in trucks:
+            self.assertLessEqual(len(assignment.loads[truck.truck_id]), truck.MAX_CAPACITY)
+        self.assertEqual(len(assignment.unassigned), 1000 - 60 * 16)
+
+    def test_deadlines_and_loaded(self):
+        """Test that late trucks skip early deadlines and loaded packages are kept"""
+        packages = self.make_packages(4, deadline="9:00 AM")
+        early, late = self.make_trucks(1)[0], Truck(2, datetime(2024, 1, 1, 10, 0))
+        early.load_package(packages[0])
+        assignment = assign_packages(packages, [early, late], self.distance_table)
+        self.assertEqual(assignment.loads[2], [])
+        self.assertEqual([p.package_id for p in assignment.loads[1]], [2, 3, 4])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# tests/test_concurrent_hash_table.py
+import threading
+import unittest
+from datetime import datetime
+from src.models.concurrent_hash_table import ConcurrentHashTable
+from src.models.package import Package
+
+class TestConcurrentHashTable(unittest.TestCase):
+    def setUp(self):
+        self.table = ConcurrentHashTable(stripes=4)
+        for package_id in range(1, 201):
+            package = Package(package_id, f"Address {package_id}", "EOD", "SLC", "84111", "1")
+            self.table.insert(package_id, package)
+
+    def test_insert_and_lookup(self):
+        """Test basic storage across stripes"""
+        self.assertEqual(self.table.size, 200)
+        self.assertEqual(self.table.lookup(7).address, "Address 7")
+        self.assertIsNone(self.table.lookup(999))
+        self.assertIsNone(self.table.snapshot(999))
+        with self.assertRaises(KeyError):
+            self.table.mark_delivered(999, datetime(2024, 1, 1, 9, 0))
+
+    def test_parallel_updates(self):
+        """Test many threads marking packages while others read"""
+        departure = datetime(2024, 1, 1, 8, 0)
+        delivered = datetime(2024, 1, 1, 9, 0)
+        torn = []
+
+        def scanner(ids):
+            for package_id in ids:
+                self.table.mark_en_route(package_id, departure, 1)
+                self.table.mark_delivered(package_id, delivered)
+
+        def reader():
+            for _ in range(20):
+                for package_id in range(1, 201):
+                    snapshot = self.table.snapshot(package_id)
+                    # Delivered state always comes with its delivery time
+                    if (snapshot.status == "Delivered") != (snapshot.delivery_time is not None):
+                        torn.append(snapshot)
+
+        threads = [threading.Thread(target=scanner, args=(range(start, 201, 4),)) for start in range(1, 5)]
+        threads += [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(torn, [])
+        self.assertEqual(len(self.table.get_packages_by("status", "Delivered")), 200)
+        self.assertEqual(self.table.get_packages_by("status", "At Hub"), [])
+        self.assertEqual(len(self.table.get_packages_by("truck_id", 1)), 200)
+
+if __name__ == '__main__':
+    unittest.main()
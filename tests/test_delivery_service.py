@@ -96,5 +96,53 @@ class TestDeliveryService(unittest.TestCase):
             f"Wrong address package delivered too early!"
         )
 
+    def test_exact_routes(self):
+        """Test that exact routing meets deadlines in fewer miles"""
+        self.service.run_delivery_routes()
+
+        exact = DeliveryService(route_strategy="exact")
+        exact.load_data("src/data/distances.csv", "src/data/packages.csv")
+        exact.run_delivery_routes()
+
+        for package in exact.package_loader.get_all_packages():
+            self.assertEqual(package.status, "Delivered")
+            self.assertLessEqual(package.delivery_time.time(), package.deadline)
+        self.assertLessEqual(exact.total_mileage, self.service.total_mileage)
+
+    def test_route_strategies(self):
+        """Test that every route strategy delivers everything on time"""
+        for strategy in DeliveryService.ROUTE_STRATEGIES:
+            for improve in (False, True):
+                service = DeliveryService(route_strategy=strategy, improve_routes=improve)
+                service.load_data("src/data/distances.csv", "src/data/packages.csv")
+                service.run_delivery_routes()
+                for package in service.package_loader.get_all_packages():
+                    self.assertEqual(package.status, "Delivered")
+                    self.assertLessEqual(package.delivery_time.time(), package.deadline,
+                                         f"{strategy}: package {package.package_id} late")
+                self.assertLess(service.total_mileage, 140)
+
+        with self.assertRaises(ValueError):
+            DeliveryService(route_strategy="fastest")
+
+    def test_shared_drivers(self):
+        """Test that trucks are planned from when they get a driver, and late packages are reported"""
+        service = DeliveryService(drivers=2)
+        service.load_data("src/data/distances.csv", "src/data/packages.csv")
+        with self.assertLogs("src.models.delivery_service", "INFO") as logs:
+            service.run_delivery_routes()
+
+        first, second, third = service.trucks
+        self.assertEqual(min(p.departure_seconds for p in third.packages),
+                         min(first.clock, second.clock))
+        late = set()
+        for package in service.package_loader.get_all_packages():
+            self.assertEqual(package.status, "Delivered")
+            if package.delivery_seconds > package.deadline_minutes * 60:
+                late.add(package.package_id)
+        warned = {record.args[0] for record in logs.records
+                  if record.levelname == "WARNING" and "deadline" in record.msg}
+        self.assertEqual(warned, late)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,6 +1,8 @@
 # tests/test_distance_table.py
 import unittest
 import csv
+import os
+import tempfile
 from src.models.distance_table import DistanceTable
 
 class TestDistanceTable(unittest.TestCase):
@@ -51,5 +53,121 @@ class TestDistanceTable(unittest.TestCase):
         )
         self.assertEqual(distance, 0.0)
 
+    def test_index_lookup(self):
+        """Test that addresses map to matrix indexes"""
+        # Hub is the first location
+        self.assertEqual(self.distance_table.index_of("Western Governors University"), 0)
+
+        # Location name and street address share an index
+        by_name = self.distance_table.index_of("South Salt Lake Public Works")
+        by_address = self.distance_table.index_of("195 W Oakland Ave")
+        self.assertIsNotNone(by_name)
+        self.assertEqual(by_name, by_address)
+
+        # Index lookup agrees with address lookup
+        columbus = self.distance_table.index_of("Columbus Library")
+        self.assertEqual(self.distance_table.get_distance_by_index(columbus, by_name), 1.5)
+
+        # Unknown address has no index
+        self.assertIsNone(self.distance_table.index_of("Invalid Address"))
+
+    def test_symmetric_distances(self):
+        """Test that both directions of a pair give the same distance"""
+        # Upper-triangle lookups used to hit empty cells and return 0.0
+        self.assertEqual(
+            self.distance_table.get_distance("South Salt Lake Public Works", "Columbus Library"),
+            1.5
+        )
+        self.assertEqual(
+            self.distance_table.get_distance("Deker Lake", "Columbus Library"),
+            9.3
+        )
+
+        # Packed storage holds one triangle including the diagonal
+        size = self.distance_table.size
+        self.assertEqual(len(self.distance_table.matrix), size * (size + 1) // 2)
+        for i in range(size):
+            self.assertEqual(self.distance_table.get_distance_by_index(i, i), 0.0)
+            for j in range(i):
+                self.assertEqual(
+                    self.distance_table.get_distance_by_index(i, j),
+                    self.distance_table.get_distance_by_index(j, i)
+                )
+
+    def test_batch_distances(self):
+        """Test one-to-many distance queries"""
+        table = self.distance_table
+        hub = table.index_of("Western Governors University")
+        destinations = [
+            table.index_of("Sugar House Park"),
+            table.index_of("South Salt Lake Public Works"),
+            table.index_of("Columbus Library"),
+        ]
+
+        # Batch results match single lookups, in order
+        distances = table.distances_from(hub, destinations)
+        self.assertEqual(list(distances), [3.8, 3.5, 2.8])
+
+        # Nearest returns the position in the list and the distance
+        self.assertEqual(table.nearest(hub, destinations), (2, 2.8))
+
+        # Ties go to the first position, empty input finds nothing
+        self.assertEqual(table.nearest(hub, [destinations[0], destinations[0]])[0], 0)
+        self.assertEqual(table.nearest(hub, [])[0], -1)
+
+    def test_row_cache_is_bounded(self):
+        """Test that dense rows are kept for recent origins only"""
+        table = self.distance_table
+        for origin in range(table.size):
+            row = table.row(origin)
+            self.assertEqual(list(row), [table.get_distance_by_index(origin, j)
+                                         for j in range(table.size)])
+        self.assertEqual(len(table._rows), min(table.size, table.ROW_CACHE_SIZE))
+        self.assertIn(table.size - 1, table._rows)
+
+    def test_submatrix(self):
+        """Test the dense matrix over a few locations"""
+        table = self.distance_table
+        locations = [0, 5, 9]
+        matrix = table.submatrix(locations)
+        for a, origin in enumerate(locations):
+            for b, destination in enumerate(locations):
+                self.assertEqual(matrix[a][b], table.get_distance_by_index(origin, destination))
+        self.assertFalse(table._rows)
+
+    def test_travel_times(self):
+        """Test the precomputed travel-time matrix"""
+        table = self.distance_table
+        hub = table.index_of("Western Governors University")
+        park = table.index_of("Sugar House Park")
+
+        # 3.8 miles at 18 mph is 760 seconds, either direction
+        self.assertEqual(table.get_travel_time_by_index(hub, park, 18), 760)
+        self.assertEqual(table.get_travel_time_by_index(park, hub, 18), 760)
+        # Built once per speed
+        self.assertIs(table.travel_times(18), table.travel_times(18))
+
+    def test_compiled_table(self):
+        """Test compiling to the binary format and loading it back"""
+        with tempfile.TemporaryDirectory() as tmp:
+            compiled_file = os.path.join(tmp, "distances.bin")
+            DistanceTable.compile("src/data/distances.csv", compiled_file)
+
+            compiled = DistanceTable()
+            compiled.load(compiled_file)
+
+            # Same locations and matrix as the CSV
+            self.assertEqual(compiled.size, self.distance_table.size)
+            self.assertEqual(compiled.addresses, self.distance_table.addresses)
+            self.assertEqual(list(compiled.matrix), list(self.distance_table.matrix))
+
+            # Lookups work against the mapped pages
+            self.assertEqual(compiled.get_distance("Columbus Library", "Deker Lake"), 9.3)
+            self.assertEqual(
+                compiled.index_of("195 W Oakland Ave"),
+                self.distance_table.index_of("195 W Oakland Ave")
+            )
+            del compiled
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
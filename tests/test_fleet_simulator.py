@@ -0,0 +1,94 @@
+# tests/test_fleet_simulator.py
+import unittest
+from datetime import datetime, time
+from src.models.distance_table import DistanceTable
+from src.models.fleet_simulator import FleetSimulator
+from src.models.package import Package
+from src.models.truck import Truck
+
+class TestFleetSimulator(unittest.TestCase):
+    def setUp(self):
+        self.distance_table = DistanceTable()
+        self.distance_table.load_distance_data("src/data/distances.csv")
+
+    def make_truck(self, truck_id, *addresses, start=datetime(2024, 1, 1, 8, 0)):
+        truck = Truck(truck_id, start)
+        for offset, address in enumerate(addresses):
+            truck.load_package(Package(truck_id * 100 + offset, address, "EOD",
+                                       "Salt Lake City", "84115", "10"))
+        return truck
+
+    def test_waits_for_release(self):
+        """Test that a truck jumps straight to a delayed package's release"""
+        truck = self.make_truck(1, "Sugar House Park")
+        package = truck.packages[0]
+        package.delayed_until = time(9, 5)
+        self.assertEqual(package.available_at, 9 * 3600 + 5 * 60)
+
+        simulator = FleetSimulator([truck], self.distance_table)
+        simulator.run()
+
+        # 3.8 miles (760 seconds) after 9:05, then back to the hub
+        self.assertEqual(package.delivery_seconds, 9 * 3600 + 5 * 60 + 760)
+        self.assertEqual(truck.location_id, truck.HUB_LOCATION_ID)
+        self.assertEqual(truck.mileage, 7.6)
+        # READY, WAKE, ARRIVE, RETURN: no polling while idle
+        self.assertEqual(simulator.event_count, 4)
+
+    def test_shared_drivers(self):
+        """Test that a truck without a driver waits for another to return"""
+        first = self.make_truck(1, "Sugar House Park")
+        second = self.make_truck(2, "South Salt Lake Public Works")
+        third = self.make_truck(3, "Columbus Library")
+
+        FleetSimulator([first, second, third], self.distance_table, drivers=2).run()
+
+        # Truck 2 is back first (3.5 miles each way) and its driver takes truck 3
+        self.assertEqual(second.clock, 8 * 3600 + 1400)
+        self.assertEqual(third.packages[0].departure_seconds, second.clock)
+        for truck in (first, second, third):
+            self.assertTrue(all(p.status == "Delivered" for p in truck.packages))
+
+    def test_waiting_truck_goes_first(self):
+        """Test that a returning driver takes the longest-waiting truck"""
+        first = self.make_truck(1, "Sugar House Park")
+        second = self.make_truck(2, "Sugar House Park")
+        # Ready at the very moment truck 1 gets back (3.8 miles each way)
+        third = self.make_truck(3, "Sugar House Park",
+                                start=datetime(2024, 1, 1, 8, 25, 20))
+
+        FleetSimulator([first, second, third], self.distance_table, drivers=1).run()
+
+        self.assertEqual(second.packages[0].departure_seconds, first.clock)
+        self.assertEqual(third.packages[0].departure_seconds, second.clock)
+
+    def test_departures(self):
+        """Test that planned departures wait for a free driver in ready order"""
+        ready = [8 * 3600, 8 * 3600, 8 * 3600 + 600]
+        trips = [3600, 1800, 1200]
+
+        def finish(t, departure):
+            return departure + trips[t] if trips[t] else None
+
+        self.assertEqual(FleetSimulator.departures(ready, finish), ready)
+        self.assertEqual(FleetSimulator.departures(ready, finish, drivers=2),
+                         [8 * 3600, 8 * 3600, 8 * 3600 + 1800])
+        self.assertEqual(FleetSimulator.departures(ready, finish, drivers=1),
+                         [8 * 3600, 8 * 3600 + 3600, 8 * 3600 + 5400])
+        # A truck with nothing to deliver keeps its time and needs no driver
+        trips[0] = 0
+        self.assertEqual(FleetSimulator.departures(ready, finish, drivers=1),
+                         [8 * 3600, 8 * 3600, 8 * 3600 + 1800])
+
+    def test_callbacks_run_first(self):
+        """Test that scheduled callbacks fire before truck events at the same time"""
+        truck = self.make_truck(1, "Sugar House Park")
+        seen = []
+        simulator = FleetSimulator([truck], self.distance_table)
+        simulator.schedule(truck.clock, lambda clock: seen.append(truck.status))
+        simulator.run()
+        # The truck had not left yet when the callback ran
+        self.assertEqual(seen, [truck.STATUS_AT_HUB])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
-from models.hash_table import HashTable 
-from models.package import Package 
+from src.models.hash_table import HashTable, OpenAddressingHashTable
+from src.models.package import Package
 
 print("__name__ is", __name__)
 
@@ -73,8 +73,57 @@ class TestHashTable(unittest.TestCase):
         self.assertEqual(pkg.status, "Delivered")
 
 
+    def test_resize(self):
+        """Test that the table grows to keep chains short"""
+        for package_id in range(1, 1001):
+            package = Package(package_id, f"Address {package_id}", "EOD", "SLC", "84111", "1")
+            self.hash_table.insert(package_id, package)
+
+        # Capacity grew past the load factor limit
+        self.assertEqual(self.hash_table.size, 1000)
+        self.assertLessEqual(self.hash_table.size, self.hash_table.capacity * self.hash_table.max_load_factor)
+
+        # Every package is still found after rehashing
+        for package_id in range(1, 1001):
+            self.assertEqual(self.hash_table.lookup(package_id).address, f"Address {package_id}")
+        self.assertEqual(len(self.hash_table.get_all_packages()), 1000)
+
+
+class TestOpenAddressingHashTable(unittest.TestCase):
+    def setUp(self):
+        """Create a small table so tests exercise probing and resizing"""
+        self.hash_table = OpenAddressingHashTable(capacity=8)
+
+    def test_insert_lookup_and_replace(self):
+        """Test inserting, replacing and looking up packages"""
+        package1 = Package(1, "Address 1", "10:30 AM", "SLC", "84111", "5 lbs")
+        package9 = Package(9, "Address 9", "EOD", "SLC", "84111", "10 lbs")  # 9 & 7 = 1
+        self.hash_table.insert(1, package1)
+        self.hash_table.insert(9, package9)
+
+        self.assertIs(self.hash_table.lookup(1), package1)
+        self.assertIs(self.hash_table.lookup(9), package9)
+        self.assertIsNone(self.hash_table.lookup(17))
+
+        # Same key replaces the package without growing
+        replacement = Package(1, "New Address", "EOD", "SLC", "84111", "5 lbs")
+        self.hash_table.insert(1, replacement)
+        self.assertIs(self.hash_table.lookup(1), replacement)
+        self.assertEqual(self.hash_table.size, 2)
+
+    def test_resize(self):
+        """Test that the table grows and keeps every package"""
+        for package_id in range(1, 1001):
+            package = Package(package_id, f"Address {package_id}", "EOD", "SLC", "84111", "1")
+            self.hash_table.insert(package_id, package)
+
+        self.assertEqual(self.hash_table.size, 1000)
+        self.assertEqual(self.hash_table.capacity & (self.hash_table.capacity - 1), 0)
+        for package_id in range(1, 1001):
+            self.assertEqual(self.hash_table.lookup(package_id).package_id, package_id)
+        self.assertEqual(len(self.hash_table.get_all_packages()), 1000)
+
 
-    
 if __name__ == "__main__":
     unittest.main()
 
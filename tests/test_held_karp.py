@@ -0,0 +1,61 @@
+# tests/test_held_karp.py
+import itertools
+import time
+import unittest
+from datetime import datetime
+from src.models.distance_table import DistanceTable
+from src.models.held_karp import EXACT_ROUTE_LIMIT, held_karp
+from src.models.local_search import improve_route
+from src.models.route_problem import RouteProblem
+from src.models.truck import Truck
+from tests.helpers import make_packages
+
+class TestHeldKarp(unittest.TestCase):
+    def setUp(self):
+        self.distance_table = DistanceTable()
+        self.distance_table.load_distance_data("src/data/distances.csv")
+
+    def make_problem(self, locations, deadlines=None):
+        return RouteProblem(make_packages(locations, deadlines), self.distance_table, 8 * 3600, 18)
+
+    def test_matches_brute_force(self):
+        """Test that the DP finds the shortest tour"""
+        problem = self.make_problem([3, 7, 11, 14, 19, 22, 25])
+        best = min(
+            problem.evaluate(order).distance
+            for order in itertools.permutations(range(1, problem.size + 1))
+        )
+        order = held_karp(problem)
+        self.assertEqual(sorted(order), list(range(1, problem.size + 1)))
+        self.assertAlmostEqual(problem.evaluate(order).distance, best)
+
+    def test_shared_stops(self):
+        """Test that packages for the same location share one stop"""
+        problem = self.make_problem([5, 5, 9])
+        self.assertEqual(problem.size, 2)
+        self.assertEqual(len(problem.packages_in(held_karp(problem))), 3)
+
+    def test_deadlines(self):
+        """Test that deadlines are met, or None if they cannot be"""
+        locations = [3, 7, 11, 14, 19, 22]
+        problem = self.make_problem(locations, ["EOD"] * 5 + ["8:20 AM"])
+        order = held_karp(problem)
+        self.assertEqual(problem.evaluate(order).lateness, 0)
+
+        impossible = self.make_problem(locations, ["EOD"] * 5 + ["8:01 AM"])
+        self.assertIsNone(held_karp(impossible))
+
+    def test_full_truck(self):
+        """Test that a full truck is solved exactly, well under a second"""
+        self.assertEqual(EXACT_ROUTE_LIMIT, Truck(1, datetime(2024, 1, 1, 8, 0)).MAX_CAPACITY)
+        problem = self.make_problem([2, 4, 6, 8, 10, 12, 14, 16, 18, 20, 22, 24, 26, 3, 5, 7])
+        start = time.perf_counter()
+        order = held_karp(problem)
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+        self.assertEqual(sorted(order), list(range(1, problem.size + 1)))
+        heuristic = improve_route(problem, problem.nearest_neighbor_order(), time_limit=None)
+        self.assertLessEqual(problem.evaluate(order).distance, problem.evaluate(heuristic).distance)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+# tests/test_insertion.py
+import unittest
+from src.models.distance_table import DistanceTable
+from src.models.insertion import _Schedule, cheapest_insertion
+from src.models.route_problem import RouteProblem
+from tests.helpers import make_packages
+
+class TestInsertion(unittest.TestCase):
+    def setUp(self):
+        self.distance_table = DistanceTable()
+        self.distance_table.load_distance_data("src/data/distances.csv")
+        locations = [3, 7, 11, 14, 19, 22, 25, 9, 5]
+        deadlines = ["EOD", "9:00 AM", "EOD", "10:30 AM", "EOD", "EOD", "9:30 AM", "EOD", "EOD"]
+        packages = make_packages(locations, deadlines)
+        packages[2].delayed_until = packages[2].deadline.replace(hour=9, minute=5)
+        self.problem = RouteProblem(packages, self.distance_table, 8 * 3600, 18)
+
+    def test_meets_deadlines(self):
+        """Test that the constructed route visits every stop on time"""
+        order = cheapest_insertion(self.problem)
+        self.assertEqual(sorted(order), list(range(1, self.problem.size + 1)))
+        self.assertEqual(self.problem.evaluate(order).lateness, 0)
+
+    def test_slack_matches_simulation(self):
+        """Test that the O(1) slack check agrees with re-timing the route"""
+        problem = self.problem
+        route = [0, 1, 4, 6, 3, 0]
+        schedule = _Schedule(problem, route)
+        for stop in (2, 5, 7, 8, 9):
+            for i in range(len(route) - 1):
+                here, after = route[i], route[i + 1]
+                arrive = max(schedule.arrive[i], problem.release[stop]) + problem.travel[here][stop]
+                next_arrive = max(arrive, problem.release[after]) + problem.travel[stop][after]
+                fits = (arrive <= problem.deadline[stop]
+                        and next_arrive - schedule.arrive[i + 1] <= schedule.slack[i + 1])
+                candidate = route[:i + 1] + [stop] + route[i + 1:]
+                on_time = problem.evaluate(candidate[1:-1]).lateness == 0
+                self.assertEqual(fits, on_time, f"stop {stop} at {i + 1}")
+
+if __name__ == '__main__':
+    unittest.main()
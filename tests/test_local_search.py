@@ -0,0 +1,44 @@
+# tests/test_local_search.py
+import unittest
+from src.models.distance_table import DistanceTable
+from src.models.held_karp import held_karp
+from src.models.local_search import improve_route
+from src.models.route_problem import RouteProblem
+from tests.helpers import make_packages
+
+class TestLocalSearch(unittest.TestCase):
+    def setUp(self):
+        self.distance_table = DistanceTable()
+        self.distance_table.load_distance_data("src/data/distances.csv")
+
+    def make_problem(self, locations, deadlines=None):
+        return RouteProblem(make_packages(locations, deadlines), self.distance_table, 8 * 3600, 18)
+
+    def test_improves_nearest_neighbor(self):
+        """Test that local search never lengthens a route and keeps every stop"""
+        problem = self.make_problem([2, 4, 6, 8, 10, 12, 14, 16, 18, 20, 22, 24, 26])
+        start = problem.nearest_neighbor_order()
+        order = improve_route(problem, start, time_limit=None)
+
+        self.assertEqual(sorted(order), sorted(start))
+        self.assertLessEqual(problem.evaluate(order).distance, problem.evaluate(start).distance)
+        # Within a few percent of optimal on this instance
+        optimal = problem.evaluate(held_karp(problem)).distance
+        self.assertLessEqual(problem.evaluate(order).distance, optimal * 1.05)
+
+    def test_keeps_deadlines(self):
+        """Test that moves which would make a stop late are rejected"""
+        deadlines = ["EOD"] * 7 + ["8:20 AM"]
+        problem = self.make_problem([3, 7, 11, 14, 19, 22, 25, 9], deadlines)
+        start = held_karp(problem)
+        self.assertEqual(problem.evaluate(start).lateness, 0)
+
+        # Deliberately bad but on-time order: the deadline stop first
+        bad = [8] + [stop for stop in reversed(start) if stop != 8]
+        self.assertEqual(problem.evaluate(bad).lateness, 0)
+        order = improve_route(problem, bad, time_limit=None)
+        self.assertEqual(problem.evaluate(order).lateness, 0)
+        self.assertLessEqual(problem.evaluate(order).distance, problem.evaluate(bad).distance)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+# tests/test_location_registry.py
+import unittest
+from src.models.location_registry import LocationRegistry
+
+class TestLocationRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = LocationRegistry()
+        self.hub = self.registry.add("Western Governors University", "4001 South 700 East")
+        self.prosecutor = self.registry.add(
+            "West Valley Prosecutor",
+            "3575 W Valley Central Sta bus Loop",
+            "3575 W Valley Central Station bus Loop"
+        )
+
+    def test_ids_are_sequential(self):
+        """Test that locations get IDs in registration order"""
+        self.assertEqual(self.hub, 0)
+        self.assertEqual(self.prosecutor, 1)
+        self.assertEqual(len(self.registry), 2)
+
+    def test_normalized_lookup(self):
+        """Test that spelling variants resolve to the same location"""
+        self.assertEqual(self.registry.get_id("western governors university"), self.hub)
+        self.assertEqual(self.registry.get_id("4001 S 700 E"), self.hub)
+        self.assertEqual(self.registry.get_id("3575 W Valley Central Station Bus Loop"), self.prosecutor)
+        self.assertEqual(self.registry.get_id("  3575  w. valley central sta bus loop "), self.prosecutor)
+
+    def test_unknown_address(self):
+        """Test that unknown addresses are reported"""
+        self.assertIsNone(self.registry.get_id("123 Nowhere Ln"))
+        with self.assertRaises(ValueError):
+            self.registry.resolve("123 Nowhere Ln")
+
+if __name__ == '__main__':
+    unittest.main()
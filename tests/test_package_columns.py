@@ -0,0 +1,58 @@
+# tests/test_package_columns.py
+import unittest
+from datetime import datetime, time
+from src.models.package_loader import PackageLoader
+
+class TestPackageColumns(unittest.TestCase):
+    def setUp(self):
+        self.loader = PackageLoader()
+        self.loader.load_packages("src/data/packages.csv")
+        self.columns = self.loader.enable_columns()
+
+    def test_available_matches_can_be_loaded(self):
+        """Test the vectorized filter against the per-package check"""
+        for hour, minute in [(8, 0), (9, 5), (10, 0), (10, 20), (12, 0)]:
+            current_time = datetime(2024, 1, 1, hour, minute)
+            for truck_id in (1, 2, 3):
+                expected = [
+                    package for package in self.loader.get_all_packages()
+                    if package.can_be_loaded(current_time, truck_id)
+                ]
+                self.assertEqual(self.loader.get_available_packages(current_time, truck_id), expected)
+
+    def test_deadline_filter(self):
+        """Test filtering by deadline"""
+        early = self.columns.due_by(time(9, 0))
+        self.assertEqual([p.package_id for p in early], [15])
+        morning = self.columns.due_by(time(10, 30))
+        self.assertEqual(len(morning), len([p for p in self.loader.get_all_packages() if p.deadline <= time(10, 30)]))
+
+    def test_columns_follow_package_changes(self):
+        """Test that status updates on packages reach the columns"""
+        package = self.loader.get_package(1)
+        package.mark_en_route(datetime(2024, 1, 1, 8, 0), 1)
+        self.assertEqual(self.columns.with_status("En Route"), [package])
+
+        package.mark_delivered(datetime(2024, 1, 1, 8, 30))
+        self.assertEqual(self.columns.with_status("En Route"), [])
+        self.assertEqual(self.columns.with_status("Delivered"), [package])
+        self.assertEqual(len(self.columns.with_status("At Hub")), 39)
+
+    def test_columns_follow_constraint_changes(self):
+        """Test that release, truck and deadline changes reach the columns"""
+        package = self.loader.get_package(1)
+        package.delayed_until = time(11, 0)
+        package.required_truck = 3
+        package.deadline = time(9, 0)
+
+        current_time = datetime(2024, 1, 1, 10, 0)
+        self.assertFalse(package.can_be_loaded(current_time, 1))
+        self.assertNotIn(package, self.loader.get_available_packages(current_time, 1))
+        later = datetime(2024, 1, 1, 11, 0)
+        self.assertNotIn(package, self.loader.get_available_packages(later, 1))
+        self.assertIn(package, self.loader.get_available_packages(later, 3))
+        self.assertIn(package, self.columns.due_by(time(9, 0)))
+        self.test_available_matches_can_be_loaded()
+
+if __name__ == '__main__':
+    unittest.main()
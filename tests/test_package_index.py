@@ -0,0 +1,71 @@
+# tests/test_package_index.py
+import unittest
+from datetime import datetime, time
+from src.models.package import Package
+from src.models.package_index import PackageIndex
+from src.models.package_loader import PackageLoader
+
+class TestPackageIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = PackageIndex()
+        self.package1 = Package(1, "195 W Oakland Ave", "10:30 AM", "Salt Lake City", "84115", "21")
+        self.package2 = Package(2, "2530 S 500 E", "EOD", "Salt Lake City", "84106", "44")
+        self.index.add(self.package1)
+        self.index.add(self.package2)
+
+    def test_initial_indexes(self):
+        """Test that packages are indexed by their values when added"""
+        self.assertEqual(self.index.find("status", "At Hub"), [self.package1, self.package2])
+        self.assertEqual(self.index.find("deadline", time(10, 30)), [self.package1])
+        self.assertEqual(self.index.find("zip_code", "84106"), [self.package2])
+        self.assertEqual(self.index.find("truck_id", 2), [])
+
+    def test_status_changes_update_indexes(self):
+        """Test that marking packages moves them between buckets"""
+        self.package1.mark_en_route(datetime(2024, 1, 1, 8, 0), 2)
+        self.assertEqual(self.index.find("status", "En Route"), [self.package1])
+        self.assertEqual(self.index.find("status", "At Hub"), [self.package2])
+        self.assertEqual(self.index.find("truck_id", 2), [self.package1])
+
+        self.package1.mark_delivered(datetime(2024, 1, 1, 8, 30))
+        self.assertEqual(self.index.find("status", "En Route"), [])
+        self.assertEqual(self.index.count("status", "Delivered"), 1)
+
+    def test_address_changes_update_indexes(self):
+        """Test that address and zip corrections are reindexed"""
+        self.package1.location_id = 5
+        self.index.remove(self.package1)
+        self.index.add(self.package1)
+
+        # Correction before 10:20 is stored but not applied
+        self.package1.update_zip("84111", datetime(2024, 1, 1, 10, 0))
+        self.assertEqual(self.index.find("zip_code", "84115"), [self.package1])
+
+        # After 10:20 it moves to the new zip and location
+        self.package1.update_zip("84111", datetime(2024, 1, 1, 10, 20))
+        self.package1.update_address("410 S State St", datetime(2024, 1, 1, 10, 20), 19)
+        self.assertEqual(self.index.find("zip_code", "84111"), [self.package1])
+        self.assertEqual(self.index.find("zip_code", "84115"), [])
+        self.assertEqual(self.index.find("location_id", 19), [self.package1])
+        self.assertNotIn(5, self.index.values("location_id"))
+
+    def test_deadline_changes_update_indexes(self):
+        """Test that setting a deadline moves the package between buckets"""
+        self.package2.deadline = time(10, 30)
+        self.assertEqual(self.index.find("deadline", time(10, 30)), [self.package1, self.package2])
+        self.assertEqual(self.package2.deadline_minutes, 10 * 60 + 30)
+
+    def test_loader_queries(self):
+        """Test index queries on a loaded manifest"""
+        loader = PackageLoader()
+        loader.load_packages("src/data/packages.csv")
+
+        early = loader.get_packages_by("deadline", time(9, 0))
+        self.assertEqual([p.package_id for p in early], [15])
+
+        morning = loader.get_packages_by("deadline", time(10, 30))
+        expected = [p for p in loader.get_all_packages() if p.deadline == time(10, 30)]
+        self.assertEqual(morning, expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
+import os
+import tempfile
 import unittest
 from datetime import datetime, time
-from src.models.package_loader import PackageLoader
+from src.models.package_loader import PackageLoader, iter_package_batches
 from src.models.package import Package
+from src.models.distance_table import DistanceTable
 
 class TestPackageLoader(unittest.TestCase):
     def setUp(self):
@@ -49,6 +52,13 @@ class TestPackageLoader(unittest.TestCase):
         self.assertIn(15, package.grouped_with)
         self.assertIn(19, package.grouped_with)
     
+    def test_compact_representation(self):
+        """Test that packages are slotted and share the empty group"""
+        package = self.loader.get_package(1)
+        self.assertFalse(hasattr(package, "__dict__"))
+        self.assertIs(package.grouped_with, self.loader.get_package(2).grouped_with)
+        self.assertEqual(package.grouped_with, ())
+
     def test_wrong_address(self):
         """Test wrong address handling"""
         # Package 9 has wrong address
@@ -65,6 +75,64 @@ class TestPackageLoader(unittest.TestCase):
         package.update_address("410 S State St", later_time)
         self.assertEqual(package.address, "410 S State St")
 
+    def test_location_ids(self):
+        """Test that addresses are interned to location IDs at load time"""
+        distance_table = DistanceTable()
+        distance_table.load_distance_data("src/data/distances.csv")
+        loader = PackageLoader()
+        loader.load_packages("src/data/packages.csv", distance_table.locations)
+
+        # Every package resolves to a distance table location
+        for package in loader.get_all_packages():
+            self.assertIsNotNone(package.location_id)
+
+        # Packages at the same address share a location
+        self.assertEqual(loader.get_package(25).location_id, loader.get_package(26).location_id)
+        self.assertEqual(
+            loader.get_package(1).location_id,
+            distance_table.index_of("South Salt Lake Public Works")
+        )
+
+        # Loading without a registry leaves IDs unset
+        self.assertIsNone(self.loader.get_package(1).location_id)
+
+        # An interned package cannot lose its ID to an address correction
+        package = loader.get_package(9)
+        old_location = package.location_id
+        with self.assertRaises(ValueError):
+            package.update_address("410 S State St", datetime(2024, 1, 1, 10, 30))
+        self.assertEqual(package.location_id, old_location)
+        self.assertEqual(package.address, "300 State St")
+        corrected = distance_table.locations.resolve("410 S State St")
+        package.update_address("410 S State St", datetime(2024, 1, 1, 10, 30), corrected)
+        self.assertEqual(package.location_id, corrected)
+
+    def test_streaming_batches(self):
+        """Test that the manifest streams in bounded batches"""
+        batches = list(iter_package_batches("src/data/packages.csv", chunk_size=16))
+        self.assertEqual([len(batch) for batch in batches], [16, 16, 8])
+        ids = [package.package_id for batch in batches for package in batch]
+        self.assertEqual(ids, list(range(1, 41)))
+
+    def test_header_detection(self):
+        """Test that the header row is found rather than counted"""
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "manifest.csv")
+            with open(filename, "w") as file:
+                file.write("Manifest\n\n")
+                file.write("Package ID,Address,City,State,Zip,Delivery Deadline,Weight,Special Notes\n")
+                file.write("7,1330 2100 S,Salt Lake City,UT,84106,9:00 AM,8,Can only be on truck 2\n")
+                file.write(",,,,,,,\n")
+
+            loader = PackageLoader()
+            loader.load_packages(filename)
+
+        self.assertEqual(list(loader.packages), [7])
+        package = loader.get_package(7)
+        self.assertEqual(package.address, "1330 2100 S")
+        self.assertEqual(package.deadline, time(9, 0))
+        self.assertEqual(package.required_truck, 2)
+
     def test_special_notes_handling(self):
         """Test that special notes are handled correctly"""
         # Create package with truck 2 requirement
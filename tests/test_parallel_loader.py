@@ -0,0 +1,47 @@
+# tests/test_parallel_loader.py
+import unittest
+from src.models.hash_table import HashTable
+from src.models.package_loader import PackageLoader
+from src.models.parallel_loader import load_packages_parallel, split_ranges
+
+class TestParallelLoader(unittest.TestCase):
+    def setUp(self):
+        self.loader = PackageLoader()
+        self.loader.load_packages("src/data/packages.csv")
+
+    def assertSamePackages(self, hash_table):
+        """Check a parallel load against the sequential loader"""
+        self.assertEqual(hash_table.size, len(self.loader.packages))
+        for package in self.loader.get_all_packages():
+            loaded = hash_table.lookup(package.package_id)
+            self.assertEqual(loaded.address, package.address)
+            self.assertEqual(loaded.deadline, package.deadline)
+            self.assertEqual(loaded.delayed_until, package.delayed_until)
+            self.assertEqual(loaded.required_truck, package.required_truck)
+            self.assertEqual(loaded.grouped_with, package.grouped_with)
+            self.assertEqual(loaded.wrong_address, package.wrong_address)
+
+    def test_split_ranges(self):
+        """Test that ranges cover the data exactly once"""
+        ranges = split_ranges(100, 1000, 4)
+        self.assertEqual(ranges[0][0], 100)
+        self.assertEqual(ranges[-1][1], 1000)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+
+    def test_parallel_matches_sequential(self):
+        """Test parsing byte ranges in worker processes"""
+        hash_table = HashTable()
+        # Tiny ranges force a split across every worker
+        count = load_packages_parallel("src/data/packages.csv", hash_table, workers=3, min_range_bytes=1)
+        self.assertEqual(count, 40)
+        self.assertSamePackages(hash_table)
+
+    def test_in_process_for_small_files(self):
+        """Test that small files skip the process pool"""
+        hash_table = HashTable()
+        load_packages_parallel("src/data/packages.csv", hash_table, workers=4)
+        self.assertSamePackages(hash_table)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+# tests/test_release_queue.py
+import unittest
+from datetime import time
+from src.models.package import Package
+from src.models.release_queue import ReleaseQueue
+
+class TestReleaseQueue(unittest.TestCase):
+    def setUp(self):
+        self.packages = [
+            Package(i, "195 W Oakland Ave", "EOD", "Salt Lake City", "84115", "21")
+            for i in range(1, 5)
+        ]
+        self.packages[1].delayed_until = time(9, 5)
+        self.packages[2].wrong_address = True
+        self.queue = ReleaseQueue(self.packages)
+
+    def test_available_at(self):
+        """Test that available_at follows the special handling attributes"""
+        self.assertEqual(self.packages[0].available_at, 0)
+        self.assertEqual(self.packages[1].available_at, 9 * 3600 + 5 * 60)
+        self.assertEqual(self.packages[2].available_at, 10 * 3600 + 20 * 60)
+
+        # Delayed past the correction, then not delayed at all
+        self.packages[2].delayed_until = time(10, 45)
+        self.assertEqual(self.packages[2].available_at, 10 * 3600 + 45 * 60)
+        self.packages[2].delayed_until = None
+        self.assertEqual(self.packages[2].available_at, 10 * 3600 + 20 * 60)
+
+    def test_available_at_reindexes(self):
+        """Test that release changes are reported to subscribed indexes"""
+        changes = []
+
+        class Recorder:
+            def update(self, package, field, old_value):
+                changes.append((field, old_value, getattr(package, field)))
+
+        package = self.packages[0]
+        package.indexes += (Recorder(),)
+        package.delayed_until = time(9, 5)
+        package.wrong_address = True
+        package.wrong_address = True  # unchanged, not reported
+        self.assertEqual(changes, [
+            ("available_at", 0, 9 * 3600 + 5 * 60),
+            ("available_at", 9 * 3600 + 5 * 60, 10 * 3600 + 20 * 60),
+        ])
+
+    def test_release_order(self):
+        """Test that packages move to the available set as the clock passes"""
+        self.assertEqual(self.queue.advance(8 * 3600), [self.packages[0], self.packages[3]])
+        self.assertEqual(self.queue.next_release(), 9 * 3600 + 5 * 60)
+
+        self.assertEqual(self.queue.advance(9 * 3600 + 5 * 60), [self.packages[1]])
+        self.assertEqual(self.queue.advance(10 * 3600), [])
+        self.assertEqual(self.queue.advance(11 * 3600), [self.packages[2]])
+        self.assertIsNone(self.queue.next_release())
+        self.assertEqual(len(self.queue.available), 4)
+
+    def test_discard(self):
+        """Test removing delivered packages"""
+        self.queue.advance(8 * 3600)
+        self.queue.discard(self.packages[0])
+        self.assertEqual(list(self.queue.available.values()), [self.packages[3]])
+        self.assertEqual(len(self.queue), 3)
+
+        # Pending packages can be discarded before they are released
+        self.queue.discard(self.packages[1])
+        self.assertEqual(self.queue.next_release(), 10 * 3600 + 20 * 60)
+        self.assertEqual(self.queue.advance(11 * 3600), [self.packages[2]])
+        self.assertEqual(len(self.queue), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+# tests/test_snapshot.py
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from src.models.delivery_service import DeliveryService
+from src.models.distance_table import DistanceTable
+from src.models.snapshot import SnapshotCache, input_key
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp, "cache")
+        self.distance_file = "src/data/distances.csv"
+        self.package_file = os.path.join(self.tmp, "packages.csv")
+        shutil.copy("src/data/packages.csv", self.package_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_key_tracks_content(self):
+        """Test that the key changes only when file contents change"""
+        key = input_key(self.distance_file, self.package_file)
+        self.assertEqual(key, input_key(self.distance_file, self.package_file))
+
+        with open(self.package_file, "a") as file:
+            file.write("\n")
+        self.assertNotEqual(key, input_key(self.distance_file, self.package_file))
+
+    def test_restart_restores_solved_state(self):
+        """Test that a second start reuses the snapshot"""
+        first = DeliveryService()
+        self.assertTrue(first.load_or_solve(self.distance_file, self.package_file, self.cache_dir))
+
+        key = first.snapshot_key(self.distance_file, self.package_file)
+        self.assertTrue(os.path.exists(SnapshotCache(self.cache_dir).path(key)))
+
+        second = DeliveryService()
+        # Loading and routing must not run on a snapshot hit
+        second.load_data = second.run_delivery_routes = None
+        self.assertTrue(second.load_or_solve(self.distance_file, self.package_file, self.cache_dir))
+
+        self.assertEqual(second.total_mileage, first.total_mileage)
+        for package in first.package_loader.get_all_packages():
+            restored = second.package_loader.get_package(package.package_id)
+            self.assertEqual(restored.status, package.status)
+            self.assertEqual(restored.delivery_time, package.delivery_time)
+            self.assertEqual(restored.truck_id, package.truck_id)
+
+        # Restored indexes still follow the restored packages
+        self.assertEqual(len(second.package_loader.get_packages_by("status", "Delivered")), 40)
+        self.assertEqual(second.distance_table.get_distance("Columbus Library", "Deker Lake"), 9.3)
+
+    def test_settings_change_key(self):
+        """Test that solver settings are part of the snapshot key"""
+        nearest = DeliveryService().snapshot_key(self.distance_file, self.package_file)
+        exact = DeliveryService(route_strategy="exact").snapshot_key(self.distance_file, self.package_file)
+        self.assertNotEqual(nearest, exact)
+
+    def test_service_date_changes_key(self):
+        """Test that a snapshot from another service date is not restored"""
+        first = DeliveryService(service_date=date(2030, 4, 30))
+        self.assertTrue(first.load_or_solve(self.distance_file, self.package_file, self.cache_dir))
+
+        service = DeliveryService(service_date=date(2030, 5, 1))
+        self.assertTrue(service.load_or_solve(self.distance_file, self.package_file, self.cache_dir))
+        for truck in service.trucks:
+            self.assertEqual(truck.day, date(2030, 5, 1))
+        for package in service.package_loader.get_all_packages():
+            self.assertEqual(package.delivery_time.date(), date(2030, 5, 1))
+
+    def test_compiled_index_changes_key(self):
+        """Test that a compiled table's index sidecar is part of the key"""
+        compiled_file = os.path.join(self.tmp, "distances.bin")
+        DistanceTable.compile(self.distance_file, compiled_file)
+        key = DeliveryService().snapshot_key(compiled_file, self.package_file)
+
+        with open(compiled_file + DistanceTable.INDEX_SUFFIX, "a") as file:
+            file.write("\n")
+        self.assertNotEqual(key, DeliveryService().snapshot_key(compiled_file, self.package_file))
+
+    def test_save_prunes_old_snapshots(self):
+        """Test that saving keeps only the most recently used snapshots"""
+        cache = SnapshotCache(self.cache_dir, keep=2)
+        for index, key in enumerate(("a", "b", "c")):
+            cache.save(key, index)
+            os.utime(cache.path(key), (index, index))
+        self.assertEqual(cache.load("a"), None)
+        self.assertEqual(cache.load("b"), 1)  # now the most recent
+
+        cache.save("d", 3)
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ["b.snapshot", "d.snapshot"])
+
+    def test_corrupt_snapshot_is_ignored(self):
+        """Test that an unreadable snapshot falls back to solving"""
+        service = DeliveryService()
+        cache = SnapshotCache(self.cache_dir)
+        key = service.snapshot_key(self.distance_file, self.package_file)
+        os.makedirs(self.cache_dir)
+        with open(cache.path(key), "wb") as file:
+            file.write(b"not a snapshot")
+
+        with self.assertLogs("src.models.snapshot", "WARNING"):
+            self.assertTrue(service.load_or_solve(self.distance_file, self.package_file, self.cache_dir))
+        self.assertIsNotNone(cache.load(key))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# tests/test_solve_job.py
+import threading
+import unittest
+from src.models.delivery_service import DeliveryService
+
+class TestSolveJob(unittest.TestCase):
+    def setUp(self):
+        self.service = DeliveryService()
+        self.service.load_data("src/data/distances.csv", "src/data/packages.csv")
+
+    def test_streams_improvements(self):
+        """Test that improvements stream in, get better and leave the trucks alone"""
+        improvements = []
+        job = self.service.solve(time_limit=0.5, on_improvement=improvements.append, seed=0)
+        first = job.best(timeout=1)
+        self.assertIsNotNone(first)
+        self.assertLess(first.elapsed, 1)
+        plan = job.result(timeout=5)
+
+        self.assertTrue(job.done())
+        self.assertTrue(plan.feasible)
+        self.assertEqual(improvements[-1].plan, plan)
+        mileage = [improvement.mileage for improvement in improvements]
+        self.assertEqual(mileage, sorted(mileage, reverse=True))
+        self.assertEqual(sorted(i for route in improvements[-1].routes.values() for i in route),
+                         list(range(1, 41)))
+        for truck in self.service.trucks:
+            self.assertFalse(truck.packages)
+
+        self.service.run_plan(plan)
+        self.assertAlmostEqual(self.service.total_mileage, plan.distance)
+        for package in self.service.package_loader.get_all_packages():
+            self.assertEqual(package.status, "Delivered")
+
+    def test_cancel(self):
+        """Test that a search without a time limit stops when cancelled"""
+        job = self.service.solve(time_limit=None)
+        self.assertIsNotNone(job.best(timeout=1))
+        self.assertFalse(job.done())
+        job.cancel()
+        plan = job.result(timeout=5)
+        self.assertTrue(job.cancelled)
+        self.assertTrue(plan.feasible)
+
+    def test_callback_error(self):
+        """Test that a failing callback ends the job and is raised by result()"""
+        called = threading.Event()
+
+        def fail(improvement):
+            called.set()
+            raise RuntimeError("dispatcher offline")
+
+        job = self.service.solve(time_limit=None, on_improvement=fail)
+        with self.assertRaises(RuntimeError):
+            job.result(timeout=5)
+        self.assertTrue(called.is_set())
+        self.assertTrue(job.done())
+
+if __name__ == '__main__':
+    unittest.main()
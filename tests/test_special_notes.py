@@ -0,0 +1,68 @@
+# tests/test_special_notes.py
+import pickle
+import unittest
+from datetime import time
+from src.models.package import Package
+from src.models.special_notes import DEFAULT_RULES, NoteRule, NoteRules
+
+def _priority(match):
+    return [("special_notes", match.group("level").lower())]
+
+class TestSpecialNotes(unittest.TestCase):
+    def setUp(self):
+        self.rules = NoteRules(DEFAULT_RULES)
+        self.package = Package(1, "195 W Oakland Ave", "EOD", "Salt Lake City", "84115", "21")
+
+    def test_values_come_from_the_note(self):
+        """Test that times and truck numbers are read from the text"""
+        self.rules.apply(self.package, "Delayed on flight---will not arrive to depot until 10:45 am")
+        self.assertEqual(self.package.delayed_until, time(10, 45))
+
+        self.rules.apply(self.package, "Can only be on truck 3")
+        self.assertEqual(self.package.required_truck, 3)
+
+        self.rules.apply(self.package, "Must be delivered with 13, 15 and 19")
+        self.assertEqual(self.package.grouped_with, (13, 15, 19))
+
+        self.rules.apply(self.package, "Wrong address listed")
+        self.assertTrue(self.package.wrong_address)
+
+    def test_empty_and_unknown_notes(self):
+        """Test that notes without a rule change nothing"""
+        self.rules.apply(self.package, "")
+        self.rules.apply(self.package, "Fragile")
+        self.assertIsNone(self.package.delayed_until)
+        self.assertIsNone(self.package.required_truck)
+        self.assertEqual(self.package.grouped_with, ())
+        self.assertFalse(self.package.wrong_address)
+
+    def test_notes_are_parsed_once(self):
+        """Test that repeated notes reuse the cached parse"""
+        first = self.rules.parse("Can only be on truck 2")
+        self.assertIs(self.rules.parse("Can only be on truck 2"), first)
+
+    def test_cache_is_bounded(self):
+        """Test that distinct notes do not grow the cache past its size"""
+        rules = NoteRules(DEFAULT_RULES, cache_size=8)
+        for i in range(100):
+            rules.parse(f"Must be delivered with {i}, {i + 1}")
+        self.assertEqual(rules._parsed.cache_info().currsize, 8)
+
+        copy = pickle.loads(pickle.dumps(rules))
+        self.assertEqual(copy._parsed.cache_info().currsize, 0)
+        self.assertEqual(copy.parse("Can only be on truck 2"), (("required_truck", 2),))
+
+    def test_delay_without_time(self):
+        """Test that a delay note without a time falls back to 9:05 with a warning"""
+        with self.assertLogs("src.models.special_notes", "WARNING"):
+            self.rules.apply(self.package, "Delayed on flight")
+        self.assertEqual(self.package.delayed_until, time(9, 5))
+
+    def test_extension(self):
+        """Test adding a rule without touching the loader"""
+        self.rules.add(NoteRule("priority", r"priority:\s*(?P<level>\w+)", _priority))
+        self.rules.apply(self.package, "Priority: HIGH")
+        self.assertEqual(self.package.special_notes, "high")
+
+if __name__ == '__main__':
+    unittest.main()
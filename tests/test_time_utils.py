@@ -0,0 +1,48 @@
+# tests/test_time_utils.py
+import unittest
+from datetime import datetime, time
+from src.models.package import Package
+from src.models.time_utils import END_OF_DAY, parse_deadline, to_minutes
+
+class TestTimeUtils(unittest.TestCase):
+    def test_parse_deadline(self):
+        """Test deadline strings, including EOD and bad values"""
+        self.assertEqual(parse_deadline("10:30 AM"), time(10, 30))
+        self.assertEqual(parse_deadline("9:00 AM"), time(9, 0))
+        self.assertEqual(parse_deadline("EOD"), END_OF_DAY)
+        self.assertEqual(parse_deadline("soon"), END_OF_DAY)
+
+    def test_deadlines_are_shared(self):
+        """Test that packages with the same deadline share one parsed value"""
+        first = Package(1, "195 W Oakland Ave", "10:30 AM", "Salt Lake City", "84115", "21")
+        second = Package(2, "2530 S 500 E", "10:30 AM", "Salt Lake City", "84106", "44")
+        self.assertIs(first.deadline, second.deadline)
+        self.assertEqual(first.deadline_minutes, 10 * 60 + 30)
+
+    def test_to_minutes(self):
+        """Test minutes since midnight from times, datetimes and ints"""
+        self.assertEqual(to_minutes(time(9, 5)), 545)
+        self.assertEqual(to_minutes(datetime(2024, 1, 1, 10, 20, 59)), 620)
+        self.assertEqual(to_minutes(620 * 60 + 59), 620)
+
+    def test_can_be_loaded_with_seconds(self):
+        """Test that can_be_loaded gives the same answer for clock seconds and datetimes"""
+        package = Package(1, "195 W Oakland Ave", "EOD", "Salt Lake City", "84115", "21")
+        package.delayed_until = time(9, 5)
+        for hour, minute in ((9, 4), (9, 5), (10, 0)):
+            expected = package.can_be_loaded(datetime(2024, 1, 1, hour, minute), 1)
+            self.assertEqual(package.can_be_loaded(hour * 3600 + minute * 60, 1), expected)
+        self.assertFalse(package.can_be_loaded(8 * 3600, 1))
+        self.assertFalse(package.can_be_loaded(545 * 60 - 1, 1))
+        self.assertTrue(package.can_be_loaded(545 * 60, 1))
+
+    def test_address_correction_with_seconds(self):
+        """Test that clock seconds pick the corrected address from 10:20"""
+        package = Package(9, "300 State St", "EOD", "Salt Lake City", "84103", "2")
+        package.wrong_address = True
+        package.update_address("410 S State St", 10 * 3600)
+        self.assertEqual(package.get_current_address(10 * 3600 + 19 * 60), "300 State St")
+        self.assertEqual(package.get_current_address(10 * 3600 + 20 * 60), "410 S State St")
+
+if __name__ == '__main__':
+    unittest.main()
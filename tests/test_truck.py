@@ -88,5 +88,26 @@ class TestTruck(unittest.TestCase):
         # Should have driven some distance
         self.assertGreater(self.truck.mileage, 0.0)
 
+    def test_improved_route(self):
+        """Test running the route with local search"""
+        self.truck.load_package(self.package1)
+        self.truck.load_package(self.package2)
+        self.truck.run_delivery_route(self.distance_table, improve=True)
+
+        self.assertEqual(self.package1.status, "Delivered")
+        self.assertEqual(self.package2.status, "Delivered")
+        self.assertEqual(self.truck.location_id, self.truck.HUB_LOCATION_ID)
+
+    def test_clock(self):
+        """Test that the truck clock advances in whole seconds"""
+        self.assertEqual(self.truck.clock, 8 * 3600)
+        self.truck.load_package(self.package1)
+        self.truck.deliver_package(self.package1, self.distance_table)
+
+        # 3.5 miles at 18 mph is 700 seconds
+        self.assertEqual(self.truck.clock, 8 * 3600 + 700)
+        self.assertEqual(self.package1.delivery_time, datetime(2024, 1, 1, 8, 11, 40))
+        self.assertEqual(self.truck.current_time, self.package1.delivery_time)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file